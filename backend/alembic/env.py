@@ -19,7 +19,7 @@ if config.config_file_name is not None:
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 from app.database import Base
-from app.models import request  # noqa
+from app.models import request, notification, analytics, idempotency  # noqa
 target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
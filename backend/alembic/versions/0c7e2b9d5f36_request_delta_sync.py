@@ -0,0 +1,36 @@
+"""Add delta sync index and request_tombstones
+
+Revision ID: 0c7e2b9d5f36
+Revises: f5a8c3d07b14
+Create Date: 2026-10-19 16:31:02.557190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c7e2b9d5f36'
+down_revision: Union[str, None] = 'f5a8c3d07b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_requests_updated_at_id', 'requests', ['updated_at', 'id'], unique=False)
+    op.create_table('request_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('request_id', sa.Integer(), nullable=False),
+    sa.Column('reference', sa.String(length=20), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_request_tombstones_deleted_at'), 'request_tombstones', ['deleted_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_request_tombstones_deleted_at'), table_name='request_tombstones')
+    op.drop_table('request_tombstones')
+    op.drop_index('ix_requests_updated_at_id', table_name='requests')
@@ -0,0 +1,54 @@
+"""Add requests_archive for closed requests
+
+Revision ID: 3e9a6f1c8d27
+Revises: 0c7e2b9d5f36
+Create Date: 2026-10-19 17:12:44.203918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e9a6f1c8d27'
+down_revision: Union[str, None] = '0c7e2b9d5f36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUSES = ('submitted', 'reviewing', 'approved', 'completed', 'rejected')
+
+
+def upgrade() -> None:
+    # Reuses the requeststatus type created with the requests table
+    status_type = sa.Enum(*STATUSES, name='requeststatus').with_variant(
+        postgresql.ENUM(*STATUSES, name='requeststatus', create_type=False), 'postgresql'
+    )
+    op.create_table('requests_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('reference', sa.String(length=20), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', status_type, nullable=False),
+    sa.Column('submitted_by', sa.String(length=100), nullable=False),
+    sa.Column('submitted_at', sa.DateTime(), nullable=False),
+    sa.Column('status_changed_at', sa.DateTime(), nullable=True),
+    sa.Column('reviewed_by', sa.String(length=100), nullable=True),
+    sa.Column('reviewed_at', sa.DateTime(), nullable=True),
+    sa.Column('public_notes', sa.Text(), nullable=True),
+    sa.Column('internal_notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_requests_archive_id'), 'requests_archive', ['id'], unique=False)
+    op.create_index(op.f('ix_requests_archive_reference'), 'requests_archive', ['reference'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_requests_archive_reference'), table_name='requests_archive')
+    op.drop_index(op.f('ix_requests_archive_id'), table_name='requests_archive')
+    op.drop_table('requests_archive')
@@ -0,0 +1,28 @@
+"""Add version column to requests for optimistic concurrency control
+
+Revision ID: 4c8e1a7d3f62
+Revises: d1f6a3b8e245
+Create Date: 2026-10-19 19:31:08.915472
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8e1a7d3f62'
+down_revision: Union[str, None] = 'd1f6a3b8e245'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ('requests', 'requests_archive'):
+        op.add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    for table in ('requests_archive', 'requests'):
+        op.drop_column(table, 'version')
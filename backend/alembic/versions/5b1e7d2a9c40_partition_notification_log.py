@@ -0,0 +1,164 @@
+"""Partition notification_log by month and index (notification_type, created_at)
+
+Revision ID: 5b1e7d2a9c40
+Revises: c94c1fd50cfd
+Create Date: 2026-10-19 09:12:44.102311
+
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7d2a9c40'
+down_revision: Union[str, None] = 'c94c1fd50cfd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 2
+
+
+def _month_start(value):
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(value):
+    return (_month_start(value) + timedelta(days=32)).replace(day=1)
+
+
+def _create_indexes():
+    op.create_index('ix_notification_log_id', 'notification_log', ['id'], unique=False)
+    op.create_index('ix_notification_log_created_at', 'notification_log', ['created_at'], unique=False)
+    op.create_index(
+        'ix_notification_log_type_created', 'notification_log',
+        ['notification_type', 'created_at'], unique=False
+    )
+
+
+def _upgrade_postgresql(exists: bool) -> None:
+    bind = op.get_bind()
+    columns = "id, notification_type, recipient, subject, message, trigger_entity_type, trigger_entity_id, status, created_at"
+
+    if exists:
+        op.rename_table('notification_log', 'notification_log_legacy')
+        for index in sa.inspect(bind).get_indexes('notification_log_legacy'):
+            op.drop_index(index['name'], table_name='notification_log_legacy')
+
+    # The partition key must be part of the primary key
+    op.execute("""
+        CREATE TABLE notification_log (
+            id SERIAL NOT NULL,
+            notification_type VARCHAR(50) NOT NULL,
+            recipient VARCHAR(200) NOT NULL,
+            subject VARCHAR(200),
+            message TEXT NOT NULL,
+            trigger_entity_type VARCHAR(50),
+            trigger_entity_id INTEGER,
+            status VARCHAR(20),
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("CREATE TABLE notification_log_default PARTITION OF notification_log DEFAULT")
+
+    oldest = None
+    if exists:
+        oldest = bind.execute(sa.text("SELECT min(created_at) FROM notification_log_legacy")).scalar()
+
+    month = _month_start(oldest or datetime.utcnow())
+    last = _month_start(datetime.utcnow())
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        end = _next_month(month)
+        op.execute(
+            f"CREATE TABLE notification_log_p{month:%Y_%m} PARTITION OF notification_log "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+        )
+        month = end
+
+    _create_indexes()
+
+    if exists:
+        op.execute(f"INSERT INTO notification_log ({columns}) SELECT {columns} FROM notification_log_legacy")
+        op.execute(
+            "SELECT setval(pg_get_serial_sequence('notification_log', 'id'), "
+            "COALESCE((SELECT max(id) FROM notification_log), 0) + 1, false)"
+        )
+        op.drop_table('notification_log_legacy')
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    exists = sa.inspect(bind).has_table('notification_log')
+
+    if bind.dialect.name == 'postgresql':
+        _upgrade_postgresql(exists)
+        return
+
+    # SQLite: plain live table; monthly tables are rolled off by the maintenance job
+    if not exists:
+        op.create_table('notification_log',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('notification_type', sa.String(length=50), nullable=False),
+        sa.Column('recipient', sa.String(length=200), nullable=False),
+        sa.Column('subject', sa.String(length=200), nullable=True),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('trigger_entity_type', sa.String(length=50), nullable=True),
+        sa.Column('trigger_entity_id', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sqlite_autoincrement=True
+        )
+        _create_indexes()
+        return
+
+    existing = {index['name'] for index in sa.inspect(bind).get_indexes('notification_log')}
+    if 'ix_notification_log_notification_type' in existing:
+        op.drop_index('ix_notification_log_notification_type', table_name='notification_log')
+    if 'ix_notification_log_created_at' not in existing:
+        op.create_index('ix_notification_log_created_at', 'notification_log', ['created_at'], unique=False)
+    op.create_index(
+        'ix_notification_log_type_created', 'notification_log',
+        ['notification_type', 'created_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        # Collapse the partitions back into a plain table
+        columns = "id, notification_type, recipient, subject, message, trigger_entity_type, trigger_entity_id, status, created_at"
+        op.execute("ALTER TABLE notification_log RENAME TO notification_log_partitioned")
+        for index in ('ix_notification_log_id', 'ix_notification_log_created_at', 'ix_notification_log_type_created'):
+            op.execute(f"ALTER INDEX IF EXISTS {index} RENAME TO {index}_partitioned")
+        op.create_table('notification_log',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('notification_type', sa.String(length=50), nullable=False),
+        sa.Column('recipient', sa.String(length=200), nullable=False),
+        sa.Column('subject', sa.String(length=200), nullable=True),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('trigger_entity_type', sa.String(length=50), nullable=True),
+        sa.Column('trigger_entity_id', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.execute(f"INSERT INTO notification_log ({columns}) SELECT {columns} FROM notification_log_partitioned")
+        op.execute(
+            "SELECT setval(pg_get_serial_sequence('notification_log', 'id'), "
+            "COALESCE((SELECT max(id) FROM notification_log), 0) + 1, false)"
+        )
+        op.execute("DROP TABLE notification_log_partitioned CASCADE")
+        op.create_index('ix_notification_log_id', 'notification_log', ['id'], unique=False)
+        op.create_index('ix_notification_log_notification_type', 'notification_log', ['notification_type'], unique=False)
+        return
+
+    op.drop_index('ix_notification_log_type_created', table_name='notification_log')
+    op.drop_index('ix_notification_log_created_at', table_name='notification_log')
+    op.create_index('ix_notification_log_notification_type', 'notification_log', ['notification_type'], unique=False)
@@ -0,0 +1,59 @@
+"""Add request priority and SLA due date with HR queue sort indexes
+
+Revision ID: 7e3b9d5a2c18
+Revises: 4c8e1a7d3f62
+Create Date: 2026-10-19 19:58:22.407316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e3b9d5a2c18'
+down_revision: Union[str, None] = '4c8e1a7d3f62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_PREDICATE = sa.text("status IN ('submitted', 'reviewing', 'approved')")
+
+# SLA hours per status when this revision was written (SLA_HOURS default)
+SLA_HOURS = {'submitted': 24, 'reviewing': 72, 'approved': 48}
+
+
+def upgrade() -> None:
+    for table in ('requests', 'requests_archive'):
+        op.add_column(table, sa.Column('priority', sa.Integer(), server_default='1', nullable=False))
+        op.add_column(table, sa.Column('due_at', sa.DateTime(), nullable=True))
+
+    # Due dates of open requests, from when their current status began
+    entered_at = 'COALESCE(status_changed_at, submitted_at)'
+    if op.get_bind().dialect.name == 'postgresql':
+        due = f"{entered_at} + make_interval(hours => {{hours}})"
+    else:
+        due = f"datetime({entered_at}, '+{{hours}} hours')"
+    cases = ' '.join(
+        f"WHEN '{status}' THEN {due.format(hours=hours)}" for status, hours in SLA_HOURS.items()
+    )
+    op.execute(f"UPDATE requests SET due_at = CASE status {cases} END WHERE {OPEN_PREDICATE.text}")
+
+    op.create_index('ix_requests_created_at_id', 'requests', ['created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_requests_open_priority', 'requests', [sa.text('priority DESC'), 'due_at', 'id'], unique=False,
+        postgresql_where=OPEN_PREDICATE, sqlite_where=OPEN_PREDICATE
+    )
+    op.create_index(
+        'ix_requests_open_due', 'requests', ['due_at', 'id'], unique=False,
+        postgresql_where=OPEN_PREDICATE, sqlite_where=OPEN_PREDICATE
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_requests_open_due', table_name='requests')
+    op.drop_index('ix_requests_open_priority', table_name='requests')
+    op.drop_index('ix_requests_created_at_id', table_name='requests')
+    for table in ('requests_archive', 'requests'):
+        op.drop_column(table, 'due_at')
+        op.drop_column(table, 'priority')
@@ -0,0 +1,35 @@
+"""Add recipient and trigger entity indexes to notification_log
+
+Revision ID: 8d3f0a6c2e51
+Revises: 5b1e7d2a9c40
+Create Date: 2026-10-19 11:40:02.518734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3f0a6c2e51'
+down_revision: Union[str, None] = '5b1e7d2a9c40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # On PostgreSQL, indexes on the partitioned parent cascade to every partition
+    op.create_index(
+        'ix_notification_log_recipient_created', 'notification_log',
+        ['recipient', 'created_at'], unique=False
+    )
+    op.create_index(
+        'ix_notification_log_entity_created', 'notification_log',
+        ['trigger_entity_type', 'trigger_entity_id', 'created_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notification_log_entity_created', table_name='notification_log')
+    op.drop_index('ix_notification_log_recipient_created', table_name='notification_log')
@@ -0,0 +1,29 @@
+"""Add (submitted_by, created_at) indexes for employee request listing
+
+Revision ID: 9a4f7c2e6b03
+Revises: 6b2d8e4a1f59
+Create Date: 2026-10-19 18:40:51.118327
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f7c2e6b03'
+down_revision: Union[str, None] = '6b2d8e4a1f59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_requests_submitted_by_created', 'requests', ['submitted_by', 'created_at'], unique=False)
+    op.create_index(
+        'ix_requests_archive_submitted_by_created', 'requests_archive', ['submitted_by', 'created_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_requests_archive_submitted_by_created', table_name='requests_archive')
+    op.drop_index('ix_requests_submitted_by_created', table_name='requests')
@@ -0,0 +1,38 @@
+"""Add request aging rollups and requests.status_changed_at
+
+Revision ID: a7c4e9f13b28
+Revises: 8d3f0a6c2e51
+Create Date: 2026-10-19 13:05:27.661094
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e9f13b28'
+down_revision: Union[str, None] = '8d3f0a6c2e51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NULL marks rows that predate rollups; `python -m app.cli backfill-aging` fills them in
+    op.add_column('requests', sa.Column('status_changed_at', sa.DateTime(), nullable=True))
+    op.create_table('request_aging_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('reviewer', sa.String(length=100), nullable=False),
+    sa.Column('bucket', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('total_seconds', sa.Float(), nullable=False),
+    sa.Column('sla_breaches', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'status', 'reviewer', 'bucket')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('request_aging_rollups')
+    op.drop_column('requests', 'status_changed_at')
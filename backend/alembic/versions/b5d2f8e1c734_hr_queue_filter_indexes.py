@@ -0,0 +1,29 @@
+"""Add indexes for HR queue filters
+
+Revision ID: b5d2f8e1c734
+Revises: 7e3b9d5a2c18
+Create Date: 2026-10-19 20:41:13.582904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d2f8e1c734'
+down_revision: Union[str, None] = '7e3b9d5a2c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_requests_status_created', 'requests', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_requests_reviewed_by_updated', 'requests', ['reviewed_by', 'updated_at'], unique=False)
+    op.create_index('ix_requests_submitted_at', 'requests', ['submitted_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_requests_submitted_at', table_name='requests')
+    op.drop_index('ix_requests_reviewed_by_updated', table_name='requests')
+    op.drop_index('ix_requests_status_created', table_name='requests')
@@ -0,0 +1,42 @@
+"""Add status_detail to notification_log for delivery failure reasons
+
+Revision ID: c3a7e5f2d981
+Revises: b5d2f8e1c734
+Create Date: 2026-10-19 23:12:48.305127
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a7e5f2d981'
+down_revision: Union[str, None] = 'b5d2f8e1c734'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLLED_TABLE = re.compile(r'^notification_log_p\d{4}_\d{2}$')
+
+
+def _tables() -> list:
+    # On PostgreSQL the column cascades from the partitioned parent; SQLite's
+    # rolled month tables are separate tables and need it too
+    tables = ['notification_log']
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        tables += [name for name in sa.inspect(bind).get_table_names() if ROLLED_TABLE.match(name)]
+    return tables
+
+
+def upgrade() -> None:
+    for table in _tables():
+        op.add_column(table, sa.Column('status_detail', sa.String(length=500), nullable=True))
+
+
+def downgrade() -> None:
+    for table in _tables():
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('status_detail')
@@ -0,0 +1,37 @@
+"""Add previous_status columns so status updates need no prior SELECT
+
+Revision ID: d1f6a3b8e245
+Revises: 9a4f7c2e6b03
+Create Date: 2026-10-19 19:05:37.640215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1f6a3b8e245'
+down_revision: Union[str, None] = '9a4f7c2e6b03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUSES = ('submitted', 'reviewing', 'approved', 'completed', 'rejected')
+
+
+def upgrade() -> None:
+    # Reuses the requeststatus type created with the requests table
+    status_type = sa.Enum(*STATUSES, name='requeststatus').with_variant(
+        postgresql.ENUM(*STATUSES, name='requeststatus', create_type=False), 'postgresql'
+    )
+    for table in ('requests', 'requests_archive'):
+        op.add_column(table, sa.Column('previous_status', status_type, nullable=True))
+        op.add_column(table, sa.Column('previous_status_changed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    for table in ('requests_archive', 'requests'):
+        op.drop_column(table, 'previous_status_changed_at')
+        op.drop_column(table, 'previous_status')
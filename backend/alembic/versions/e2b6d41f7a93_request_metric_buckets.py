@@ -0,0 +1,33 @@
+"""Add request time-series metric buckets
+
+Revision ID: e2b6d41f7a93
+Revises: a7c4e9f13b28
+Create Date: 2026-10-19 14:22:10.318472
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b6d41f7a93'
+down_revision: Union[str, None] = 'a7c4e9f13b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Populate history with `python -m app.cli rebuild-timeseries`
+    op.create_table('request_metric_buckets',
+    sa.Column('granularity', sa.String(length=5), nullable=False),
+    sa.Column('metric', sa.String(length=20), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('granularity', 'metric', 'bucket_start')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('request_metric_buckets')
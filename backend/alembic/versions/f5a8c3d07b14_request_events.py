@@ -0,0 +1,36 @@
+"""Add request_events change feed
+
+Revision ID: f5a8c3d07b14
+Revises: e2b6d41f7a93
+Create Date: 2026-10-19 15:48:36.904215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a8c3d07b14'
+down_revision: Union[str, None] = 'e2b6d41f7a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('request_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=30), nullable=False),
+    sa.Column('reference', sa.String(length=20), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sqlite_autoincrement=True
+    )
+    op.create_index(op.f('ix_request_events_created_at'), 'request_events', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_request_events_created_at'), table_name='request_events')
+    op.drop_table('request_events')
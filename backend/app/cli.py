@@ -0,0 +1,131 @@
+"""
+Maintenance commands.
+
+Usage (from the backend directory):
+    python -m app.cli backfill-aging [--batch-size N]
+    python -m app.cli rebuild-timeseries
+    python -m app.cli archive-requests [--batch-size N]
+    python -m app.cli bench-encoding [--rows N] [--repeat N]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+
+from app.database import SessionLocal, Base, engine
+from app.models import request, notification, analytics, idempotency  # noqa: F401 - register models
+from app.core.encoding import packb, to_columnar
+from app.schemas.hr import HRRequestResponse
+from app.services import analytics_service, archive_service, timeseries_service
+
+logger = logging.getLogger("app.cli")
+
+
+def backfill_aging(args: argparse.Namespace) -> int:
+    """Build aging rollups for requests that predate them."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        processed = analytics_service.backfill_aging_rollups(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+    logger.info("Backfilled aging rollups for %d requests", processed)
+    return 0
+
+
+def rebuild_timeseries(args: argparse.Namespace) -> int:
+    """Recompute submission/resolution time-series buckets from the requests table."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        scanned = timeseries_service.rebuild_metric_buckets(db)
+    finally:
+        db.close()
+    logger.info("Rebuilt time-series buckets from %d requests", scanned)
+    return 0
+
+
+def archive_requests(args: argparse.Namespace) -> int:
+    """Move closed requests past the retention period to the archive."""
+    Base.metadata.create_all(bind=engine)
+    archived = archive_service.archive_closed_requests(batch_size=args.batch_size)
+    logger.info("Archived %d closed requests", archived)
+    return 0
+
+
+def bench_encoding(args: argparse.Namespace) -> int:
+    """Compare HR queue payload sizes and encode times: JSON vs MessagePack."""
+    now = datetime(2026, 1, 1)
+    items = [
+        HRRequestResponse(
+            id=i,
+            reference=f"REF-2026-{i % 1000:03d}",
+            title=f"Salary certificate for visa application {i}",
+            description="Employment certificate addressed to the embassy, including salary details.",
+            status="reviewing",
+            submitted_by=f"employee{i}@company.ae",
+            submitted_at=now + timedelta(minutes=i),
+            reviewed_by="hr.anna",
+            reviewed_at=now + timedelta(minutes=i, hours=2),
+            public_notes="Under review",
+            internal_notes="Check salary band with payroll",
+            priority=1,
+            due_at=now + timedelta(minutes=i, hours=72),
+            created_at=now + timedelta(minutes=i),
+            updated_at=now + timedelta(minutes=i, hours=2),
+            version=2
+        ).model_dump()
+        for i in range(args.rows)
+    ]
+    columns = list(HRRequestResponse.model_fields)
+
+    encoders = {
+        # What a JSON response does (FastAPI's encoder, then json.dumps)
+        "json": lambda: json.dumps(jsonable_encoder(items)).encode(),
+        "msgpack": lambda: packb(items),
+        "msgpack columnar": lambda: packb(to_columnar(items, columns)),
+    }
+    print(f"{args.rows} requests, best of {args.repeat}")
+    print(f"{'encoding':<18}{'bytes':>12}{'ms':>10}")
+    for name, encode in encoders.items():
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            body = encode()
+            timings.append(time.perf_counter() - started)
+        print(f"{name:<18}{len(body):>12}{min(timings) * 1000:>10.2f}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="HR Portal maintenance commands")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = subcommands.add_parser("backfill-aging", help="Backfill request aging rollups from history")
+    backfill.add_argument("--batch-size", type=int, default=1000)
+    backfill.set_defaults(func=backfill_aging)
+
+    rebuild = subcommands.add_parser("rebuild-timeseries", help="Rebuild submission/resolution time series")
+    rebuild.set_defaults(func=rebuild_timeseries)
+
+    archive = subcommands.add_parser("archive-requests", help="Archive closed requests past retention")
+    archive.add_argument("--batch-size", type=int, default=None)
+    archive.set_defaults(func=archive_requests)
+
+    bench = subcommands.add_parser("bench-encoding", help="Benchmark JSON vs MessagePack HR queue payloads")
+    bench.add_argument("--rows", type=int, default=1000)
+    bench.add_argument("--repeat", type=int, default=5)
+    bench.set_defaults(func=bench_encoding)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,6 +25,9 @@ class Settings(BaseSettings):
     
     # Database configuration
     database_url: str = "sqlite:///./hr_portal.db"
+    database_read_replica_urls: Optional[str] = None  # Comma-separated read replica URLs
+    read_replica_retry_seconds: float = 30.0  # How long a failed replica is skipped
+    read_your_writes_seconds: float = 5.0  # After a client's write: reads use the primary, uncached, this long
     
     # Azure configuration (for future Azure integrations)
     azure_secret_key: Optional[str] = None
@@ -35,6 +38,7 @@ class Settings(BaseSettings):
     twilio_account_sid: Optional[str] = None
     twilio_auth_token: Optional[str] = None
     twilio_phone_number: Optional[str] = None
+    twilio_api_base_url: str = "https://api.twilio.com"
     
     # Email configuration (for email notifications)
     smtp_host: Optional[str] = None
@@ -42,6 +46,57 @@ class Settings(BaseSettings):
     smtp_user: Optional[str] = None
     smtp_password: Optional[str] = None
     smtp_from_email: Optional[str] = None
+    smtp_use_tls: bool = True  # Require STARTTLS (implicit TLS on port 465)
+    smtp_pool_size: int = 4
+    
+    # Notification delivery engine
+    notification_concurrency: int = 20
+    notification_queue_size: int = 10000
+    notification_max_attempts: int = 5
+    notification_retry_base_delay: float = 1.0  # Seconds, doubled per attempt
+    notification_retry_max_delay: float = 60.0
+    notification_circuit_failure_threshold: int = 5
+    notification_circuit_reset_seconds: float = 30.0
+    notification_requeue_after_seconds: int = 900  # Queued this long at startup: left by a stopped worker
+    notification_coalesce_window_seconds: float = 0  # 0 disables coalescing
+    
+    # Notification log retention (monthly partitions; expired ones are archived).
+    # Off by default: expired rows leave the database, so enabling it also
+    # requires an archive directory on durable storage (not the app's
+    # deployment directory, which is replaced on every deploy)
+    notification_retention_days: int = 0  # 0 keeps everything in the database
+    notification_archive_dir: Optional[str] = None
+    notification_maintenance_interval_minutes: int = 60  # 0 disables the background job
+    
+    # HR notifications
+    hr_notification_email: str = "hr.team@company.ae"
+    hr_digest_interval_minutes: int = 0  # 0 sends a per-request HR email instead
+    
+    # SLA targets per status, in hours (e.g. "submitted:24,reviewing:72")
+    sla_hours: str = "submitted:24,reviewing:72,approved:48"
+    
+    # Hourly trend buckets older than this are pruned (daily buckets are kept)
+    metrics_hourly_retention_days: int = 31
+    
+    # Request change feed (SSE stream and long-poll tracking)
+    request_events_poll_seconds: float = 1.0  # Cross-worker poll interval without LISTEN/NOTIFY
+    request_events_retention_hours: int = 24
+    sse_heartbeat_seconds: float = 15.0
+    
+    # Archival of closed (completed/rejected) requests out of the live table
+    request_archive_after_days: int = 365  # 0 keeps closed requests live
+    request_archive_batch_size: int = 500
+    request_archive_interval_minutes: int = 60  # 0 disables the background job
+    request_tombstone_retention_days: int = 30  # Older delta sync cursors must resync
+    
+    # Idempotency-Key replay for request submission
+    idempotency_key_ttl_hours: int = 24
+    idempotency_max_keys: int = 100000
+    idempotency_lock_timeout_seconds: float = 30.0  # In-flight keys older than this are taken over
+    idempotency_wait_seconds: float = 10.0  # How long a duplicate waits for the first request
+    
+    # Versioned cache of serialized HR queue pages, dashboards and counts
+    result_cache_max_bytes: int = 32 * 1024 * 1024  # 0 disables
     
     # Application settings
     app_name: str = "UAE HR Portal API"
@@ -58,6 +113,23 @@ class Settings(BaseSettings):
         """Convert CORS origins string to list."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
     
+    @property
+    def read_replica_urls_list(self) -> list[str]:
+        """Convert read replica URLs string to list."""
+        if not self.database_read_replica_urls:
+            return []
+        return [url.strip() for url in self.database_read_replica_urls.split(",") if url.strip()]
+    
+    @property
+    def sla_hours_map(self) -> dict[str, float]:
+        """Convert SLA targets string to a {status: hours} mapping."""
+        targets = {}
+        for item in self.sla_hours.split(","):
+            if ":" in item:
+                status, hours = item.split(":", 1)
+                targets[status.strip().lower()] = float(hours)
+        return targets
+    
     @property
     def trusted_hosts_list(self) -> list[str]:
         """Convert trusted hosts string to list."""
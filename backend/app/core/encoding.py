@@ -0,0 +1,88 @@
+"""
+MessagePack response negotiation.
+
+HR clients that send `Accept: application/msgpack` get list and stats
+responses as MessagePack instead of JSON: smaller, and cheaper to encode
+and parse. Lists use a columnar layout ({"columns": [...], "rows": [...]})
+so field names are sent once instead of once per row. Datetimes are
+MessagePack timestamps (UTC).
+"""
+
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional
+
+import msgpack
+from fastapi import Request
+from fastapi.responses import Response
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# Negotiated URLs have a different representation per Accept header, so
+# shared caches must key on it whichever one is served
+VARY_ACCEPT = {"Vary": "Accept"}
+
+
+def _quality(media_range: str) -> float:
+    for param in media_range.split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def wants_msgpack(request: Request) -> bool:
+    """True if the Accept header prefers MessagePack over JSON."""
+    accept = request.headers.get("accept", "")
+    msgpack_quality, other_quality = 0.0, 0.0
+    for media_range in accept.split(","):
+        media_type = media_range.split(";")[0].strip().lower()
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_quality = max(msgpack_quality, _quality(media_range))
+        elif media_type in ("application/json", "*/*", "application/*"):
+            other_quality = max(other_quality, _quality(media_range))
+    return msgpack_quality > 0 and msgpack_quality >= other_quality
+
+
+def vary_on_accept(response: Response) -> None:
+    """Route dependency adding Vary: Accept to responses built from return values."""
+    response.headers.update(VARY_ACCEPT)
+
+
+def to_columnar(items: Iterable[Dict[str, Any]], columns: Optional[List[str]] = None) -> Dict[str, List]:
+    """Rows + schema layout for a list of same-shaped dicts (columns default to the first item's keys)."""
+    items = list(items)
+    if columns is None:
+        columns = list(items[0]) if items else []
+    return {"columns": columns, "rows": [[item[name] for name in columns] for item in items]}
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        # Stored datetimes are naive UTC
+        return msgpack.Timestamp.from_datetime(value if value.tzinfo else value.replace(tzinfo=timezone.utc))
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value).__name__} to MessagePack")
+
+
+def packb(content: Any) -> bytes:
+    """Encode content as MessagePack."""
+    return msgpack.packb(content, default=_default, use_bin_type=True)
+
+
+class MsgPackResponse(Response):
+    """MessagePack-encoded response."""
+
+    media_type = MSGPACK_MEDIA_TYPES[0]
+
+    def __init__(self, content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None):
+        super().__init__(content, status_code=status_code, headers={**VARY_ACCEPT, **(headers or {})})
+
+    def render(self, content: Any) -> bytes:
+        return packb(content)
@@ -0,0 +1,62 @@
+"""
+Keyset pagination helpers.
+
+Cursors are opaque, URL-safe tokens encoding the sort key of the last row
+of a page, so the next page is an index range scan instead of an OFFSET.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+SyncKey = Tuple[datetime, int]
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode a (created_at, id) sort key as an opaque cursor."""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError, UnicodeError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+def encode_sync_cursor(changes_key: SyncKey, deleted_key: SyncKey) -> str:
+    """Encode the positions of a delta sync in its changes and removals."""
+    payload = json.dumps(
+        [changes_key[0].isoformat(), changes_key[1], deleted_key[0].isoformat(), deleted_key[1]],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_sync_cursor(cursor: str) -> Tuple[SyncKey, SyncKey]:
+    """
+    Decode a cursor produced by encode_sync_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        changed_at, changed_id, deleted_at, deleted_id = values
+        return (
+            (datetime.fromisoformat(changed_at), int(changed_id)),
+            (datetime.fromisoformat(deleted_at), int(deleted_id))
+        )
+    except (TypeError, ValueError, UnicodeError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
@@ -0,0 +1,95 @@
+"""
+Periodic background jobs.
+
+Runs a blocking callable in a worker thread at a fixed interval on the
+app's event loop (used for digests and database maintenance). Every worker
+schedules the same jobs, so each job takes a cross-worker lock and only
+one worker runs it at a time.
+"""
+
+import asyncio
+import fcntl
+import logging
+import tempfile
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Run `func` every `interval` seconds until stopped."""
+
+    def __init__(self, name: str, interval: float, func: Callable[[], object]):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.func)
+            except Exception as e:
+                logger.error("Periodic task %s failed: %s", self.name, e, exc_info=True)
+
+
+@contextmanager
+def job_lock(db_engine: Engine, name: str) -> Iterator[bool]:
+    """
+    Hold the cross-worker lock of job `name`; yields whether it was acquired.
+
+    Never waits: a worker that does not get the lock should skip the run.
+    On PostgreSQL this is a session advisory lock on its own connection.
+    Otherwise it is an exclusive lock on a file next to the SQLite database
+    (or in the temp directory for in-memory databases).
+    """
+    if db_engine.dialect.name == "postgresql":
+        key = zlib.crc32(name.encode())
+        with db_engine.connect() as conn:
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar()
+            conn.commit()
+            try:
+                yield bool(acquired)
+            finally:
+                if acquired:
+                    conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                    conn.commit()
+        return
+
+    database = db_engine.url.database
+    if database and database != ":memory:":
+        path = Path(f"{database}.{name}.lock")
+    else:
+        path = Path(tempfile.gettempdir()) / f"hr_portal.{name}.lock"
+    with open(path, "a") as handle:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
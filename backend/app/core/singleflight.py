@@ -0,0 +1,104 @@
+"""
+Single-flight coalescing of identical concurrent reads.
+
+When many callers ask for the same thing at once (dashboards polling on
+the same tick), the first caller computes the result and the others wait
+for it and share it, so database load follows the number of distinct
+queries rather than the number of callers. Only in-flight work is
+shared; nothing is cached after it completes.
+
+Results are handed to several requests at once and must not be mutated.
+
+Callers include the data version (bumped after every write) in their
+keys, so a read issued after a write never joins a computation that
+started before it.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, List, TypeVar
+
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+# Every group, for metrics
+_groups: List["SingleFlight"] = []
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """A namespace of keys whose concurrent computations are shared."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stats = {"calls": 0, "executions": 0}
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        _groups.append(self)
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        """
+        Return func(), or the result of an identical call already running.
+
+        Exceptions are shared the same way as results.
+        """
+        with self._lock:
+            self.stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats["executions"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def metrics(self) -> dict:
+        """Calls, executions and the share of calls served by another's execution."""
+        calls, executions = self.stats["calls"], self.stats["executions"]
+        return {
+            "calls": calls,
+            "executions": executions,
+            "coalesced": calls - executions,
+            "coalescing_ratio": round((calls - executions) / calls, 4) if calls else 0.0,
+        }
+
+
+def bind_key(db: Session) -> str:
+    """
+    Key part identifying the database a session reads from.
+
+    Callers pinned to the primary (read-your-writes) never share a
+    replica-backed computation. Clients that wrote recently get a key of
+    their own: their write may have gone through another worker whose
+    version bump has not reached this one yet.
+    """
+    url = str(db.get_bind().url)
+    if db.info.get("read_your_writes"):
+        return f"{url}#{id(db)}"
+    return url
+
+
+def single_flight_metrics() -> Dict[str, dict]:
+    """Metrics of every single-flight group, by name."""
+    return {group.name: group.metrics() for group in _groups}
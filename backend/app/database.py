@@ -1,21 +1,47 @@
 """
 Database configuration and session management.
+
+Writes always use the primary database (`get_db`). Read-only endpoints use
+`get_read_db`, which routes to a healthy read replica when replicas are
+configured, and falls back to the primary when none is reachable or the
+client has just written (read-your-writes).
 """
 
+import hashlib
+import hmac
+import itertools
+import logging
+import secrets
+import time
+from typing import List, Optional
+
+from fastapi import Request, Response
 from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Database URL from settings
 DATABASE_URL = settings.database_url
 
+# Cookie marking a client's recent write, so any worker routes its reads to the primary
+READ_YOUR_WRITES_COOKIE = "hr_portal_rw"
+
+
+def _create_engine(url: str, **kwargs):
+    return create_engine(
+        url,
+        connect_args={"check_same_thread": False} if "sqlite" in url else {},
+        echo=False,  # Set to True for SQL logging
+        **kwargs
+    )
+
+
 # Create engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
-    echo=False  # Set to True for SQL logging
-)
+engine = _create_engine(DATABASE_URL)
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -24,10 +50,108 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+class ReplicaSet:
+    """
+    Read replicas with health-aware round-robin selection.
+
+    A replica whose connection fails is skipped for `retry_after` seconds,
+    after which it is tried again on the next read.
+    """
+
+    def __init__(self, urls: List[str], retry_after: float = 30.0):
+        self.retry_after = retry_after
+        self._factories = [
+            sessionmaker(
+                autocommit=False,
+                autoflush=False,
+                bind=_create_engine(url, pool_pre_ping=True)
+            )
+            for url in urls
+        ]
+        self._unhealthy_until = [0.0] * len(urls)
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def session(self) -> Optional[Session]:
+        """Return a connected session on a healthy replica, or None if none is available."""
+        if not self._factories:
+            return None
+
+        start = next(self._counter)
+        now = time.monotonic()
+        for offset in range(len(self._factories)):
+            index = (start + offset) % len(self._factories)
+            if self._unhealthy_until[index] > now:
+                continue
+
+            db = self._factories[index]()
+            try:
+                # Check out a connection now so a dead replica fails over here
+                db.connection()
+                # Replica reads may lag, so they are never cached
+                db.info["replica"] = True
+                return db
+            except OperationalError as e:
+                db.close()
+                self._unhealthy_until[index] = now + self.retry_after
+                logger.warning("Read replica %d unavailable, failing over: %s", index, e)
+
+        return None
+
+
+replicas = ReplicaSet(settings.read_replica_urls_list, settings.read_replica_retry_seconds)
+
+# Signs the read-your-writes cookie; without SECRET_KEY the cookie is only
+# honoured by the worker that set it
+_cookie_key = (settings.secret_key or secrets.token_hex(32)).encode()
+
+
+def _sign_expiry(expires: int) -> str:
+    return hmac.new(_cookie_key, str(expires).encode(), hashlib.sha256).hexdigest()
+
+
+def mark_recent_write(request: Request, response: Response) -> None:
+    """
+    Pin a client's reads to the primary for `read_your_writes_seconds`.
+
+    Called after a successful write so that, for example, tracking a request
+    right after submitting it never hits a replica that has not caught up.
+    Recorded even without replicas: those reads also bypass shared and
+    cached results that other workers may not have invalidated yet.
+    The cookie carries a signed expiry, so clients cannot forge or extend it.
+    """
+    window = settings.read_your_writes_seconds
+    if window <= 0:
+        return
+
+    expires = int(time.time() + window)
+    response.set_cookie(
+        READ_YOUR_WRITES_COOKIE,
+        f"{expires}.{_sign_expiry(expires)}",
+        max_age=int(window) + 1,
+        httponly=True,
+        samesite="lax"
+    )
+
+
+def has_recent_write(request: Request) -> bool:
+    """Return True if the client's signed cookie shows a write within the window."""
+    window = settings.read_your_writes_seconds
+    if window <= 0:
+        return False
+    expires, _, signature = request.cookies.get(READ_YOUR_WRITES_COOKIE, "").partition(".")
+    if not expires.isdigit() or not hmac.compare_digest(signature, _sign_expiry(int(expires))):
+        return False
+    now = time.time()
+    return now <= int(expires) <= now + window
+
+
 def get_db():
     """
     Dependency for getting database sessions.
-    
+
     Yields a database session and ensures it's closed after use.
     """
     db = SessionLocal()
@@ -35,3 +159,25 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db(request: Request):
+    """
+    Dependency for read-only database sessions.
+
+    Yields a replica session when one is healthy and the client has not
+    written recently; otherwise a primary session.
+    """
+    db = None
+    recent_write = has_recent_write(request)
+    if len(replicas) and not recent_write:
+        db = replicas.session()
+    if db is None:
+        db = SessionLocal()
+    if recent_write:
+        # Never handed results computed or cached before the client's write
+        db.info["read_your_writes"] = True
+    try:
+        yield db
+    finally:
+        db.close()
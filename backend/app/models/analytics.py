@@ -0,0 +1,52 @@
+"""
+Analytics rollup models.
+
+Pre-aggregated tables maintained incrementally by the request write paths,
+so dashboard statistics never scan the requests table.
+"""
+
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime
+from app.database import Base
+
+
+class RequestAgingRollup(Base):
+    """
+    Time-in-status histogram per day x status x reviewer.
+    
+    Each row counts status stints (time a request spent in `status` before
+    moving on) that ended on `day`, falling into one log-scale duration
+    `bucket`. Percentiles are read from the summed bucket counts.
+    """
+    __tablename__ = "request_aging_rollups"
+    
+    day = Column(Date, primary_key=True)
+    status = Column(String(20), primary_key=True)
+    reviewer = Column(String(100), primary_key=True, default="")  # "" when unknown
+    bucket = Column(Integer, primary_key=True)
+    
+    count = Column(Integer, nullable=False, default=0)
+    total_seconds = Column(Float, nullable=False, default=0.0)
+    sla_breaches = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<RequestAgingRollup {self.day} {self.status} bucket={self.bucket}: {self.count}>"
+
+
+class RequestMetricBucket(Base):
+    """
+    Event counts per time bucket for trend charts.
+    
+    Hourly and daily buckets are both incremented on write; hourly buckets
+    are pruned after a retention period, leaving the daily series.
+    Metrics: submitted, resolved (moved to completed or rejected).
+    """
+    __tablename__ = "request_metric_buckets"
+    
+    granularity = Column(String(5), primary_key=True)  # hour, day
+    metric = Column(String(20), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    
+    count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<RequestMetricBucket {self.metric} {self.granularity} {self.bucket_start}: {self.count}>"
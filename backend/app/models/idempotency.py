@@ -0,0 +1,34 @@
+"""
+Idempotency key model.
+
+Stores the first response to a write made with an Idempotency-Key header,
+so client retries replay it instead of repeating the write.
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Idempotency key record.
+    
+    A row without a status_code is in flight: its request is still running
+    and holds the key (until locked_at + the lock timeout). Rows expire after
+    the configured TTL.
+    """
+    __tablename__ = "idempotency_keys"
+    
+    key = Column(String(100), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)  # SHA-256 of method, path and body
+    
+    # Stored response (NULL while in flight)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    locked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<IdempotencyKey {self.key}: {self.status_code or 'in flight'}>"
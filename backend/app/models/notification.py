@@ -1,11 +1,11 @@
 """
 Notification Model.
 
-Track notification logs (stub implementation - no real API calls).
+Track notification logs and their delivery status.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from app.database import Base
 
 
@@ -13,15 +13,29 @@ class NotificationLog(Base):
     """
     Notification log table.
     
-    Logs all notifications that would be sent.
-    No actual API calls to SMS/email services at this stage.
+    Logs all notifications. Rows for deliverable recipients move from
+    "queued" to "sent" or "failed" as the delivery engine reports back.
+    Coalesced notifications start "held"; superseded ones end "merged".
+    
+    Partitioned by month on created_at (see notification_retention);
+    expired partitions are archived and dropped.
     """
     __tablename__ = "notification_log"
+    __table_args__ = (
+        Index("ix_notification_log_type_created", "notification_type", "created_at"),
+        Index("ix_notification_log_recipient_created", "recipient", "created_at"),
+        Index(
+            "ix_notification_log_entity_created",
+            "trigger_entity_type", "trigger_entity_id", "created_at"
+        ),
+        # Never reuse ids on SQLite, where old rows move to rolled tables
+        {"sqlite_autoincrement": True},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
     # Notification details
-    notification_type = Column(String(50), nullable=False, index=True)
+    notification_type = Column(String(50), nullable=False)
     # Types: request_created, status_updated, compliance_alert
     
     recipient = Column(String(200), nullable=False)  # Email or phone
@@ -33,10 +47,11 @@ class NotificationLog(Base):
     trigger_entity_id = Column(Integer, nullable=True)
     
     # Status
-    status = Column(String(20), default="logged")  # logged, would_send
+    status = Column(String(20), default="logged")  # held, merged, logged, queued, sent, failed
+    status_detail = Column(String(500), nullable=True)  # Why delivery failed
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     
     def __repr__(self):
         return f"<NotificationLog {self.notification_type} to {self.recipient}>"
@@ -4,9 +4,9 @@ Request Model (SQLAlchemy).
 Database model for request management.
 """
 
-from enum import Enum
+from enum import Enum, IntEnum
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, Enum as SQLEnum, text
 from app.database import Base
 
 
@@ -23,13 +23,25 @@ class RequestStatus(Enum):
     REJECTED = "rejected"
 
 
-class Request(Base):
+class RequestPriority(IntEnum):
     """
-    Request database model.
+    Request priority set by HR.
     
-    Represents an employee request in the HR system.
+    Stored as its integer value so the HR queue can be ordered by it.
     """
-    __tablename__ = "requests"
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+    URGENT = 3
+
+
+# Open-request (submitted, reviewing, approved) filter as literal SQL: the planner (SQLite in particular) only
+# uses the partial triage indexes when the query repeats their predicate
+OPEN_STATUS_PREDICATE = text("status IN ('submitted', 'reviewing', 'approved')")
+
+
+class RequestColumns:
+    """Columns shared by live and archived requests."""
     
     id = Column(Integer, primary_key=True, index=True)
     reference = Column(String(20), unique=True, index=True, nullable=False)
@@ -45,6 +57,25 @@ class Request(Base):
     submitted_by = Column(String(100), nullable=False)
     submitted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
+    # When the current status was entered (NULL for rows predating aging rollups)
+    status_changed_at = Column(DateTime, nullable=True)
+    
+    # Status before the last change and when it was entered (set by the
+    # status UPDATE itself, so the change needs no prior SELECT)
+    previous_status = Column(
+        SQLEnum(RequestStatus, values_callable=lambda obj: [e.value for e in obj]),
+        nullable=True
+    )
+    previous_status_changed_at = Column(DateTime, nullable=True)
+    
+    # Triage: HR-set priority and the SLA deadline of the current status
+    # (NULL when the status has no SLA), maintained by every status change
+    priority = Column(Integer, nullable=False, default=RequestPriority.NORMAL, server_default="1")
+    due_at = Column(DateTime, nullable=True)
+    
+    # Bumped by every update; clients send it back (If-Match) to detect lost updates
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    
     # HR review information
     reviewed_by = Column(String(100), nullable=True)
     reviewed_at = Column(DateTime, nullable=True)
@@ -56,6 +87,98 @@ class Request(Base):
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class Request(RequestColumns, Base):
+    """
+    Request database model.
+    
+    Represents an employee request in the HR system.
+    """
+    __tablename__ = "requests"
+    __table_args__ = (
+        # Delta sync scans changes in (updated_at, id) order
+        Index("ix_requests_updated_at_id", "updated_at", "id"),
+        # An employee's requests, newest first
+        Index("ix_requests_submitted_by_created", "submitted_by", "created_at"),
+        # HR queue filters (see hr_service.build_hr_queue_query)
+        Index("ix_requests_status_created", "status", "created_at", "id"),
+        Index("ix_requests_reviewed_by_updated", "reviewed_by", "updated_at"),
+        Index("ix_requests_submitted_at", "submitted_at"),
+        # HR queue orderings (sort=created|priority|due); the triage orders
+        # only cover open requests, so their indexes are partial
+        Index("ix_requests_created_at_id", "created_at", "id"),
+        Index(
+            "ix_requests_open_priority",
+            text("priority DESC"), "due_at", "id",
+            postgresql_where=OPEN_STATUS_PREDICATE,
+            sqlite_where=OPEN_STATUS_PREDICATE
+        ),
+        Index(
+            "ix_requests_open_due",
+            "due_at", "id",
+            postgresql_where=OPEN_STATUS_PREDICATE,
+            sqlite_where=OPEN_STATUS_PREDICATE
+        ),
+    )
     
     def __repr__(self):
         return f"<Request {self.reference}: {self.title}>"
+
+
+class ArchivedRequest(RequestColumns, Base):
+    """
+    Closed request moved out of the live table.
+    
+    Completed and rejected requests are archived after a retention period
+    (see archive_service) so queue queries only cover open and recent work.
+    Archived requests keep their id and reference and stay trackable.
+    """
+    __tablename__ = "requests_archive"
+    __table_args__ = (
+        Index("ix_requests_archive_submitted_by_created", "submitted_by", "created_at"),
+    )
+    
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<ArchivedRequest {self.reference}: {self.title}>"
+
+
+class RequestTombstone(Base):
+    """
+    Marker for a request removed from the live table.
+    
+    Lets delta sync clients drop the request from their local copy.
+    """
+    __tablename__ = "request_tombstones"
+    
+    id = Column(Integer, primary_key=True)
+    request_id = Column(Integer, nullable=False)
+    reference = Column(String(20), nullable=False)
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<RequestTombstone {self.reference}>"
+
+
+class RequestEvent(Base):
+    """
+    Request change feed.
+    
+    One row per request creation or update, written in the same transaction
+    as the change. Ids are increasing, so a client resumes a stream with the
+    last id it saw. Rows are pruned after a short retention period.
+    """
+    __tablename__ = "request_events"
+    # Never reuse ids on SQLite, where they double as SSE event ids
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    id = Column(Integer, primary_key=True)
+    event_type = Column(String(30), nullable=False)  # request_created, status_changed, request_updated, request_archived
+    reference = Column(String(20), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<RequestEvent {self.id} {self.event_type} {self.reference}>"
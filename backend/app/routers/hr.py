@@ -5,13 +5,31 @@ Supplementary endpoints for HR dashboard.
 """
 
 import logging
-from typing import List
-from fastapi import APIRouter, Depends, Query, Request, HTTPException, status
+from datetime import datetime
+from typing import Any, Callable, List, Union
+from fastapi import APIRouter, Depends, Header, Query, Request, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.schemas.hr import HRRequestResponse
-from app.services import hr_service
+from app.database import get_read_db, has_recent_write
+from app.schemas.hr import (
+    HRDashboardResponse,
+    HRRequestChanges,
+    HRRequestFilter,
+    HRRequestQueuePage,
+    HRRequestResponse,
+)
+from app.schemas.notification import NotificationLogPage
+from app.config import settings
+from app.services import (
+    hr_service,
+    notification_log_search,
+    request_events,
+    request_sync_service,
+)
+from app.services.result_cache import result_cache
 from app.dependencies.security import require_hr_api_key
+from app.core.encoding import VARY_ACCEPT, MsgPackResponse, to_columnar, vary_on_accept, wants_msgpack
 from app.core.rate_limit import apply_rate_limit
 from app.models.request import RequestStatus
 
@@ -19,39 +37,142 @@ router = APIRouter(prefix="/hr", tags=["hr"])
 logger = logging.getLogger(__name__)
 
 
+def _cached_response(http_request: Request, db: Session, name: str, render: Callable[[], Any]) -> Any:
+    """
+    Serve a response from the result cache, or render and cache it.
+
+    Keyed by endpoint, query parameters and representation; any request
+    write invalidates every entry. Replica-backed reads, and reads by
+    clients that just wrote (possibly through a worker whose invalidation
+    has not reached this one), are rendered uncached.
+    """
+    if not result_cache.enabled_for(db) or has_recent_write(http_request):
+        return render()
+
+    msgpack_wanted = wants_msgpack(http_request)
+    key = (name, tuple(sorted(http_request.query_params.multi_items())), msgpack_wanted)
+    # Read before rendering, so a write landing meanwhile invalidates the entry
+    version = result_cache.version
+    cached = result_cache.get(key, version)
+    if cached is not None:
+        body, media_type = cached
+        return Response(body, media_type=media_type, headers=VARY_ACCEPT)
+
+    response = render()
+    if not isinstance(response, Response):
+        response = JSONResponse(jsonable_encoder(response), headers=VARY_ACCEPT)
+    result_cache.put(key, version, response.body, response.media_type)
+    return response
+
+
 @router.get(
     "/requests",
-    response_model=List[HRRequestResponse],
-    dependencies=[Depends(require_hr_api_key)]
+    response_model=Union[List[HRRequestResponse], HRRequestQueuePage],
+    dependencies=[Depends(require_hr_api_key), Depends(vary_on_accept)]
 )
 def get_hr_queue(
     http_request: Request,
-    status: str | None = Query(None, description="Filter by status"),
+    status_filter: str | None = Query(None, alias="status", description="Filter by status"),
+    submitted_by: str | None = Query(None, max_length=100, description="Filter by employee"),
+    reviewed_by: str | None = Query(None, max_length=100, description="Filter by reviewing HR staff"),
+    submitted_from: datetime | None = Query(None, description="Submitted at or after (UTC)"),
+    submitted_to: datetime | None = Query(None, description="Submitted before (UTC)"),
+    updated_from: datetime | None = Query(None, description="Updated at or after (UTC)"),
+    updated_to: datetime | None = Query(None, description="Updated before (UTC)"),
+    sort: str = Query(
+        "created",
+        description="created (newest first), priority (most urgent open requests first) or due (earliest SLA deadline first)"
+    ),
+    fields: str | None = Query(
+        None,
+        max_length=300,
+        description="Comma-separated response fields to return (id and reference are always included)"
+    ),
+    facets: str | None = Query(
+        None,
+        max_length=100,
+        description="Comma-separated facets to count (status, reviewed_by, priority)"
+    ),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Return the full HR request queue (requires API key).
     
     Rate limited to 100 requests per minute for authenticated users.
+    Filters can be combined; every combination is served by an index.
+    sort=priority and sort=due are triage views over open requests.
+    
+    With `facets` the response is {"items": [...], "facets": {...}}, where
+    the facet counts cover every request matching the filters (not just
+    the page), computed in one grouped query.
+    
+    With `fields` (e.g. fields=reference,title,status,created_at) only
+    those columns are queried and returned, which keeps list payloads free
+    of descriptions and notes.
+    
+    With `Accept: application/msgpack` the items are MessagePack in
+    columnar form: {"columns": [...], "rows": [[...], ...]}.
     """
     # Apply rate limiting
     apply_rate_limit(http_request, "hr.get_hr_queue", "100/minute")
 
-    if status:
-        status = status.lower().strip()
+    if status_filter:
+        status_filter = status_filter.lower().strip()
         valid_statuses = [s.value for s in RequestStatus]
-        if status not in valid_statuses:
-            logger.warning("Invalid status filter attempted: %s", status)
+        if status_filter not in valid_statuses:
+            logger.warning("Invalid status filter attempted: %s", status_filter)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
             )
 
-    try:
-        requests = hr_service.get_hr_queue(db, status=status, limit=limit, offset=offset)
+    filters = HRRequestFilter(
+        status=status_filter,
+        submitted_by=submitted_by,
+        reviewed_by=reviewed_by,
+        submitted_from=submitted_from,
+        submitted_to=submitted_to,
+        updated_from=updated_from,
+        updated_to=updated_to,
+        sort=sort,
+        limit=limit,
+        offset=offset
+    )
+
+    def render():
+        selected = hr_service.parse_fields(fields) if fields else None
+        requests = hr_service.get_hr_queue(db, filters, selected)
+        facet_counts = None
+        if facets is not None:
+            facet_names = [name.strip() for name in facets.split(",") if name.strip()]
+            facet_counts = hr_service.get_hr_queue_facets(db, filters, facet_names)
+
+        if wants_msgpack(http_request):
+            items = requests if selected else [request.model_dump() for request in requests]
+            payload = to_columnar(items, selected or list(HRRequestResponse.model_fields))
+            if facet_counts is not None:
+                payload = {"items": payload, "facets": facet_counts}
+            return MsgPackResponse(payload)
+
+        if facet_counts is not None:
+            requests = {"items": requests, "facets": facet_counts}
+        if selected:
+            # Partial items bypass the full response model
+            return JSONResponse(jsonable_encoder(requests), headers=VARY_ACCEPT)
         return requests
+
+    try:
+        # Later pages are rarely polled; caching them would only evict first pages
+        if offset:
+            return render()
+        return _cached_response(http_request, db, "hr_queue", render)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error("Failed to retrieve HR queue: %s", e, exc_info=True)
         raise HTTPException(
@@ -60,26 +181,216 @@ def get_hr_queue(
         )
 
 
-@router.get("/stats", dependencies=[Depends(require_hr_api_key)])
-def get_request_stats(http_request: Request, db: Session = Depends(get_db)):
+@router.get(
+    "/requests/changes",
+    response_model=HRRequestChanges,
+    dependencies=[Depends(require_hr_api_key)]
+)
+def get_request_changes(
+    http_request: Request,
+    since: str | None = Query(None, max_length=200, description="Cursor from the previous sync"),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Delta sync for the HR queue (requires API key).
+    
+    Rate limited to 100 requests per minute.
+    Returns requests created or updated since the cursor and tombstones for
+    removed ones; omit `since` for the initial full sync. Changes may repeat
+    across syncs, so clients should apply them as upserts. A cursor older
+    than the tombstone retention gets `resync: true` and nothing else.
+    """
+    # Apply rate limiting
+    apply_rate_limit(http_request, "hr.get_request_changes", "100/minute")
+
+    try:
+        changes, deleted, next_cursor, has_more = request_sync_service.get_request_changes(
+            db, cursor=since, limit=limit
+        )
+        return {
+            "changes": changes,
+            "deleted": deleted,
+            "next_cursor": next_cursor,
+            "has_more": has_more
+        }
+    except request_sync_service.ResyncRequired:
+        return {"changes": [], "deleted": [], "next_cursor": None, "has_more": False, "resync": True}
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error("Failed to retrieve request changes: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve request changes. Please try again later."
+        )
+
+
+@router.get("/events", dependencies=[Depends(require_hr_api_key)])
+async def stream_request_events(
+    http_request: Request,
+    last_event_id: str | None = Header(None, alias="Last-Event-ID", max_length=20)
+):
+    """
+    Stream request changes as Server-Sent Events (requires API key).
+    
+    Rate limited to 30 connections per minute.
+    Events: request_created, status_changed, request_updated,
+    request_archived; a "reset" event means events were missed and the
+    queue should be refetched.
+    Reconnecting with Last-Event-ID resumes after the last event seen.
+    """
+    # Apply rate limiting
+    apply_rate_limit(http_request, "hr.stream_request_events", "30/minute")
+
+    bus = request_events.get_event_bus()
+    if bus is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Event stream is not available. Please try again later."
+        )
+
+    resume_from = None
+    if last_event_id:
+        if not last_event_id.isdigit():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid Last-Event-ID."
+            )
+        resume_from = int(last_event_id)
+
+    return StreamingResponse(
+        request_events.stream_events(bus, resume_from, heartbeat=settings.sse_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get(
+    "/dashboard",
+    response_model=HRDashboardResponse,
+    dependencies=[Depends(require_hr_api_key), Depends(vary_on_accept)]
+)
+def get_dashboard(
+    http_request: Request,
+    limit: int = Query(20, ge=1, le=50, description="Requests per status tab"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Bootstrap the HR dashboard in one call (requires API key).
+    
+    Rate limited to 60 requests per minute.
+    Returns the first page of every status tab (most recent first) and the
+    status counts; replaces one queue call per tab plus /hr/stats.
+    MessagePack with `Accept: application/msgpack` (tabs in columnar form).
+    """
+    # Apply rate limiting
+    apply_rate_limit(http_request, "hr.get_dashboard", "60/minute")
+
+    def render():
+        dashboard = hr_service.get_dashboard(db, limit=limit)
+        if wants_msgpack(http_request):
+            columns = list(HRRequestResponse.model_fields)
+            tabs = {
+                tab: to_columnar([request.model_dump() for request in requests], columns)
+                for tab, requests in dashboard["tabs"].items()
+            }
+            # The dashboard may be shared with concurrent callers; copy it
+            return MsgPackResponse({**dashboard, "tabs": tabs})
+        return dashboard
+
+    try:
+        return _cached_response(http_request, db, "hr_dashboard", render)
+    except Exception as e:
+        logger.error("Failed to load HR dashboard: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to load dashboard. Please try again later."
+        )
+
+
+@router.get("/stats", dependencies=[Depends(require_hr_api_key), Depends(vary_on_accept)])
+def get_request_stats(http_request: Request, db: Session = Depends(get_read_db)):
     """
     Get request statistics by status.
     
     Rate limited to 60 requests per minute.
-    Returns count of requests in each status for dashboard display.
+    Returns count of requests in each status for dashboard display
+    (MessagePack with `Accept: application/msgpack`).
     """
     # Apply rate limiting
     apply_rate_limit(http_request, "hr.get_request_stats", "60/minute")
 
-    try:
+    def render_stats():
         counts = hr_service.get_request_count_by_status(db)
-        return {
+        stats = {
             "status_counts": counts,
             "total": sum(counts.values())
         }
+        if wants_msgpack(http_request):
+            return MsgPackResponse(stats)
+        return stats
+
+    try:
+        return _cached_response(http_request, db, "hr_stats", render_stats)
     except Exception as e:
         logger.error("Failed to retrieve request stats: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve statistics. Please try again later."
         )
+
+
+@router.get(
+    "/notifications",
+    response_model=NotificationLogPage,
+    dependencies=[Depends(require_hr_api_key)]
+)
+def get_notification_logs(
+    http_request: Request,
+    notification_type: str | None = Query(None, max_length=50, description="Filter by notification type"),
+    recipient: str | None = Query(None, max_length=200, description="Filter by recipient (email/phone)"),
+    trigger_entity_type: str | None = Query(None, max_length=50, description="Filter by trigger entity type"),
+    trigger_entity_id: int | None = Query(None, description="Filter by trigger entity id"),
+    since: datetime | None = Query(None, description="Only entries created at or after this time (UTC)"),
+    until: datetime | None = Query(None, description="Only entries created before this time (UTC)"),
+    cursor: str | None = Query(None, max_length=200, description="Cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Inspect notification delivery history (requires API key).
+    
+    Rate limited to 60 requests per minute.
+    Results are newest first and paginated with an opaque cursor.
+    """
+    # Apply rate limiting
+    apply_rate_limit(http_request, "hr.get_notification_logs", "60/minute")
+
+    try:
+        logs, next_cursor = notification_log_search.search_notification_logs(
+            db,
+            notification_type=notification_type,
+            recipient=recipient,
+            trigger_entity_type=trigger_entity_type,
+            trigger_entity_id=trigger_entity_id,
+            since=since,
+            until=until,
+            cursor=cursor,
+            limit=limit
+        )
+        return {"items": logs, "next_cursor": next_cursor}
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error("Failed to retrieve notification logs: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve notification logs. Please try again later."
+        )
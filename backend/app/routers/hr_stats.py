@@ -0,0 +1,102 @@
+"""
+HR statistics endpoints.
+
+Request aging and submission/resolution time series for the HR dashboard,
+served from rollups maintained on the request write paths.
+"""
+
+import logging
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, Query, Request, HTTPException, status
+from sqlalchemy.orm import Session
+from app.database import get_read_db
+from app.schemas.analytics import AgingStatsResponse, TimeseriesResponse
+from app.services import analytics_service, timeseries_service
+from app.dependencies.security import require_hr_api_key
+from app.core.rate_limit import apply_rate_limit
+from app.models.request import RequestStatus
+
+router = APIRouter(prefix="/hr", tags=["hr"])
+logger = logging.getLogger(__name__)
+
+
+@router.get(
+    "/stats/aging",
+    response_model=AgingStatsResponse,
+    dependencies=[Depends(require_hr_api_key)]
+)
+def get_aging_stats(
+    http_request: Request,
+    since: date | None = Query(None, description="First day (UTC) of status changes to include"),
+    until: date | None = Query(None, description="Last day (UTC) of status changes to include"),
+    status_filter: str | None = Query(None, alias="status", description="Only this status"),
+    reviewer: str | None = Query(None, max_length=100, description="Only stints closed by this reviewer"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get time-in-status percentiles and SLA breach counts (requires API key).
+    
+    Rate limited to 60 requests per minute.
+    Served from the aging rollup, so cost does not grow with request history.
+    """
+    # Apply rate limiting
+    apply_rate_limit(http_request, "hr.get_aging_stats", "60/minute")
+
+    if status_filter:
+        status_filter = status_filter.lower().strip()
+        valid_statuses = [s.value for s in RequestStatus]
+        if status_filter not in valid_statuses:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
+            )
+
+    try:
+        stats = analytics_service.get_aging_stats(
+            db, since=since, until=until, status=status_filter, reviewer=reviewer
+        )
+        return {"since": since, "until": until, "statuses": stats}
+    except Exception as e:
+        logger.error("Failed to retrieve aging stats: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve aging statistics. Please try again later."
+        )
+
+
+@router.get(
+    "/stats/timeseries",
+    response_model=TimeseriesResponse,
+    response_model_by_alias=True,
+    dependencies=[Depends(require_hr_api_key)]
+)
+def get_timeseries(
+    http_request: Request,
+    from_: datetime = Query(..., alias="from", description="Start of the range (UTC, inclusive)"),
+    to: datetime = Query(..., description="End of the range (UTC, exclusive)"),
+    granularity: str = Query("day", description="Bucket size: hour or day"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get submission and resolution counts over time (requires API key).
+    
+    Rate limited to 60 requests per minute.
+    Hourly series cover up to 31 days; longer ranges must use daily buckets.
+    """
+    # Apply rate limiting
+    apply_rate_limit(http_request, "hr.get_timeseries", "60/minute")
+
+    try:
+        series = timeseries_service.get_timeseries(db, from_, to, granularity=granularity)
+        return {"from_": from_, "to": to, "granularity": granularity, **series}
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error("Failed to retrieve time series: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve time series. Please try again later."
+        )
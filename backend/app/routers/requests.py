@@ -5,12 +5,21 @@ Unified request system for the UAE HR Portal.
 """
 
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Path
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Request, Response, Path, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.schemas.request import RequestCreate, RequestUpdate, RequestResponse
-from app.schemas.tracking import RequestTrackingResponse
-from app.services import request_service, tracking_service
+from app.schemas.tracking import (
+    RequestTrackingPage,
+    RequestTrackingResponse,
+    TrackingBatchRequest,
+    TrackingBatchResponse,
+)
+from app.services import idempotency_service, request_service, request_waiters, tracking_service
+from app.services.reference_filter import reference_filter
 from app.dependencies.security import require_hr_api_key
 from app.core.rate_limit import apply_rate_limit
 from app.core.validation import validate_reference_format, sanitize_text
@@ -18,11 +27,39 @@ from app.core.validation import validate_reference_format, sanitize_text
 router = APIRouter(prefix="/requests", tags=["requests"])
 logger = logging.getLogger(__name__)
 
+# Longest long-poll wait on request tracking
+MAX_TRACKING_WAIT_SECONDS = 60
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Timestamps are stored as naive UTC."""
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _parse_if_match(value: str) -> int | None:
+    """Request version from an If-Match header ("3", W/"3" or 3; * matches any)."""
+    value = value.strip()
+    if value == "*":
+        return None
+    if value.startswith("W/"):
+        value = value[2:]
+    value = value.strip('"')
+    if not value.isdigit() or int(value) < 1:
+        raise ValueError("If-Match must be a request version ETag")
+    return int(value)
+
 
 @router.post("", response_model=RequestResponse, status_code=status.HTTP_201_CREATED)
 def create_request(
     http_request: Request,
     request_data: RequestCreate,
+    idempotency_key: str | None = Header(
+        None,
+        alias="Idempotency-Key",
+        min_length=1,
+        max_length=100,
+        description="Client-generated key; retries with the same key replay the first response"
+    ),
     db: Session = Depends(get_db)
 ):
     """
@@ -31,32 +68,174 @@ def create_request(
     Rate limited to 10 requests per hour per IP to prevent spam.
     The system automatically generates a unique reference (REF-YYYY-NNN)
     and sets status to 'submitted'.
+    
+    With an Idempotency-Key header, a retry returns the original response
+    (marked with Idempotent-Replayed: true) instead of creating a duplicate.
     """
     # Apply rate limiting
     apply_rate_limit(http_request, "requests.create_request", "10/hour")
     
+    if idempotency_key:
+        try:
+            stored = idempotency_service.begin(
+                db,
+                idempotency_key,
+                idempotency_service.fingerprint("POST", http_request.url.path, request_data.model_dump_json().encode())
+            )
+        except idempotency_service.IdempotencyMismatch:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request."
+            )
+        except idempotency_service.IdempotencyConflict:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still being processed."
+            )
+        if stored is not None:
+            status_code, body = stored
+            return JSONResponse(body, status_code=status_code, headers={"Idempotent-Replayed": "true"})
+    
     try:
-        db_request = request_service.create_request(db, request_data)
-        return db_request
+        return request_service.create_request(db, request_data, idempotency_key)
     except ValueError as e:
         logger.info("Validation error creating request: %s", e)
+        if idempotency_key:
+            idempotency_service.release(db, idempotency_key)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except Exception as e:
         logger.error("Failed to create request: %s", e, exc_info=True)
+        if idempotency_key:
+            # Only frees a key whose request was never committed; after the
+            # commit, retries replay the stored response
+            idempotency_service.release(db, idempotency_key)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create request. Please try again later."
         )
 
 
-@router.get("/{reference}", response_model=RequestTrackingResponse)
-def track_request(
+@router.post("/track", response_model=TrackingBatchResponse)
+def track_requests(
+    http_request: Request,
+    batch: TrackingBatchRequest,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Track up to 50 requests by reference in one call (public access).
+    
+    Rate limited to 30 requests per minute per IP.
+    Unknown references map to null and are listed in `not_found`.
+    Returns the same sanitized projection as tracking by reference.
+    """
+    # Apply rate limiting
+    apply_rate_limit(http_request, "requests.track_requests", "30/minute")
+    
+    references = []
+    invalid = []
+    for raw in batch.references:
+        reference = sanitize_text(raw, max_length=20)
+        reference = reference.upper() if reference else reference
+        if not reference or not validate_reference_format(reference):
+            invalid.append(raw)
+        elif reference not in references:
+            references.append(reference)
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid reference format (expected REF-YYYY-NNN): {', '.join(invalid[:5])}"
+        )
+    
+    try:
+        known = [reference for reference in references if reference_filter.might_exist(reference)]
+        results = dict.fromkeys(references)
+        if known:
+            results.update(tracking_service.get_request_tracking_batch(db, known))
+        return {
+            "results": results,
+            "not_found": [reference for reference, info in results.items() if info is None]
+        }
+    except Exception as e:
+        logger.error("Failed to retrieve batch tracking information: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve tracking information. Please try again later."
+        )
+
+
+@router.get("/mine", response_model=RequestTrackingPage)
+def list_my_requests(
+    http_request: Request,
+    submitted_by: str = Query(..., min_length=1, max_length=100, description="Employee identifier used when submitting"),
+    reference: str = Query(..., max_length=20, description="Reference of one of the employee's requests (proof of ownership)"),
+    cursor: str | None = Query(None, max_length=200, description="Cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """
+    List an employee's requests, newest first (public access, no login required).
+    
+    Rate limited to 30 requests per minute per IP.
+    The employee proves ownership with the reference of one of their
+    requests; an email alone lists nothing. Returns the tracking projection
+    without descriptions. Declared before /{reference} so "mine" is not
+    taken for a reference.
+    """
+    # Apply rate limiting
+    apply_rate_limit(http_request, "requests.list_my_requests", "30/minute")
+    
+    submitted_by = sanitize_text(submitted_by, max_length=100)
+    if not submitted_by:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="submitted_by is required."
+        )
+    
+    reference = (sanitize_text(reference, max_length=20) or "").upper()
+    not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="No matching request found."
+    )
+    # Unknown references and other employees' ones look the same
+    if not validate_reference_format(reference) or not reference_filter.might_exist(reference):
+        raise not_found
+    
+    try:
+        if not tracking_service.owns_request(db, submitted_by, reference):
+            raise not_found
+        items, next_cursor = tracking_service.get_requests_by_employee(
+            db, submitted_by, cursor=cursor, limit=limit
+        )
+        return {"items": items, "next_cursor": next_cursor}
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error("Failed to list requests for employee: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve requests. Please try again later."
+        )
+
+
+@router.get(
+    "/{reference}",
+    response_model=RequestTrackingResponse,
+    responses={304: {"description": "No change within the wait period"}}
+)
+async def track_request(
     http_request: Request,
     reference: str = Path(..., description="Request reference (REF-YYYY-NNN)"),
-    db: Session = Depends(get_db)
+    wait: int = Query(0, ge=0, le=MAX_TRACKING_WAIT_SECONDS, description="Seconds to wait for a change"),
+    since: datetime | None = Query(None, description="last_updated value already seen (required with wait)"),
+    db: Session = Depends(get_read_db)
 ):
     """
     Track a request by reference (public access, no login required).
@@ -64,21 +243,47 @@ def track_request(
     Rate limited to 30 requests per minute per IP.
     Returns sanitized information suitable for employee viewing.
     Internal HR notes are NOT included in the response.
+    
+    Long-poll: with `wait` and `since`, the response is held until the
+    request changes after `since` (returned immediately if it already has),
+    or 304 Not Modified once `wait` seconds pass.
     """
     # Apply rate limiting
     apply_rate_limit(http_request, "requests.track_request", "30/minute")
     
+    if wait and since is None:
+        # Otherwise the poll would answer at once and clients would spin
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="`since` is required with `wait`."
+        )
+    
+    reference = sanitize_text(reference, max_length=20)
+    reference = reference.upper() if reference else reference
+    if (
+        not reference
+        or not validate_reference_format(reference)
+        or not reference_filter.might_exist(reference)
+    ):
+        # Invalid or definitely unknown references are answered without a query
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Request not found."
+        )
+    
+    waiters = request_waiters.get_waiters()
+    waiter = waiters.register(reference) if wait and waiters is not None else None
     try:
-        reference = sanitize_text(reference, max_length=20)
-        reference = reference.upper() if reference else reference
-        if not reference or not validate_reference_format(reference):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid reference format. Expected format: REF-YYYY-NNN"
-            )
-
-        tracking_info = tracking_service.get_request_tracking(db, reference)
-        return tracking_info
+        tracking_info = await run_in_threadpool(tracking_service.get_request_tracking, db, reference)
+        if waiter is None or tracking_info.last_updated > _naive_utc(since):
+            return tracking_info
+        
+        # Release the database connection while waiting
+        await run_in_threadpool(db.close)
+        if not await waiters.wait(reference, waiter, wait):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+        waiter = None
+        return await run_in_threadpool(tracking_service.get_request_tracking, db, reference)
     except ValueError as e:
         logger.info("Request not found for reference: %s", reference)
         raise HTTPException(
@@ -91,6 +296,9 @@ def track_request(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve tracking information. Please try again later."
         )
+    finally:
+        if waiter is not None:
+            waiters.discard(reference, waiter)
 
 
 @router.patch(
@@ -100,8 +308,15 @@ def track_request(
 )
 def update_request_status(
     http_request: Request,
+    response: Response,
     update_data: RequestUpdate,
     reference: str = Path(..., description="Request reference (REF-YYYY-NNN)"),
+    if_match: str | None = Header(
+        None,
+        alias="If-Match",
+        max_length=20,
+        description="ETag (version) of the request the change is based on"
+    ),
     db: Session = Depends(get_db)
 ):
     """
@@ -110,6 +325,10 @@ def update_request_status(
     Rate limited to 100 requests per minute (authenticated endpoint).
     Valid status values: submitted, reviewing, approved, completed, rejected
     Requires HR API key authentication.
+    
+    Send the version last read as If-Match (or expected_version in the body)
+    to get 412 Precondition Failed instead of overwriting someone else's
+    change. The new version is returned in the body and as the ETag.
     """
     # Apply rate limiting
     apply_rate_limit(http_request, "requests.update_request_status", "100/minute")
@@ -123,8 +342,33 @@ def update_request_status(
                 detail="Invalid reference format. Expected format: REF-YYYY-NNN"
             )
 
-        db_request = request_service.update_request_status(db, reference, update_data)
+        expected_version = update_data.expected_version
+        if if_match is not None:
+            header_version = _parse_if_match(if_match)
+            if (
+                header_version is not None
+                and expected_version is not None
+                and header_version != expected_version
+            ):
+                raise ValueError("If-Match and expected_version disagree")
+            expected_version = header_version or expected_version
+
+        db_request = request_service.update_request_status(db, reference, update_data, expected_version)
+        response.headers["ETag"] = f'"{db_request.version}"'
         return db_request
+    except request_service.VersionConflict as e:
+        logger.info("Stale update rejected for request %s: %s", reference, e)
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Request was modified by someone else. Reload it and try again.",
+            headers={"ETag": f'"{e.current_version}"'}
+        )
+    except request_service.ConcurrentUpdate as e:
+        logger.info("Concurrent update of request %s: %s", reference, e)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Request is being changed by someone else. Try again."
+        )
     except ValueError as e:
         logger.info("Validation error updating request %s: %s", reference, e)
         if "not found" in str(e).lower():
@@ -0,0 +1,43 @@
+"""
+Analytics schemas.
+
+Response models for HR dashboard statistics served from rollup tables.
+"""
+
+from datetime import date, datetime
+from typing import List, Literal, Optional, Dict
+from pydantic import BaseModel, Field
+
+
+class StatusAgingStats(BaseModel):
+    """Time-in-status statistics for one status."""
+    count: int = Field(description="Number of completed stints in this status")
+    mean_hours: float
+    p50_hours: float
+    p90_hours: float
+    p95_hours: float
+    p99_hours: float
+    sla_hours: Optional[float] = Field(None, description="SLA target for this status, if any")
+    sla_breaches: int = Field(description="Stints that exceeded the SLA target")
+
+
+class AgingStatsResponse(BaseModel):
+    """Request aging statistics per status."""
+    since: Optional[date] = None
+    until: Optional[date] = None
+    statuses: Dict[str, StatusAgingStats] = Field(default_factory=dict)
+
+
+class TimeseriesPoint(BaseModel):
+    """Event count in one time bucket."""
+    bucket_start: datetime
+    count: int
+
+
+class TimeseriesResponse(BaseModel):
+    """Submission and resolution counts per hour or day."""
+    from_: datetime = Field(serialization_alias="from")
+    to: datetime
+    granularity: Literal["hour", "day"]
+    submitted: List[TimeseriesPoint] = Field(default_factory=list)
+    resolved: List[TimeseriesPoint] = Field(default_factory=list)
@@ -5,8 +5,9 @@ Schemas for HR staff operations (includes internal data).
 """
 
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from typing import Dict, Optional, List
+from pydantic import BaseModel, Field, field_validator
+from app.schemas.request import priority_name
 
 
 class HRRequestResponse(BaseModel):
@@ -27,15 +28,68 @@ class HRRequestResponse(BaseModel):
     reviewed_at: Optional[datetime] = None
     public_notes: Optional[str] = None
     internal_notes: Optional[str] = None  # HR-only field
+    priority: str
+    due_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
+    version: int
+    
+    _priority_name = field_validator('priority', mode='before')(priority_name)
     
     class Config:
         from_attributes = True
 
 
 class HRRequestFilter(BaseModel):
-    """Filter parameters for HR request queue."""
+    """Filter parameters for HR request queue (any combination)."""
     status: Optional[str] = Field(None, description="Filter by status")
+    submitted_by: Optional[str] = Field(None, max_length=100, description="Employee identifier")
+    reviewed_by: Optional[str] = Field(None, max_length=100, description="HR staff identifier")
+    submitted_from: Optional[datetime] = Field(None, description="Submitted at or after (UTC)")
+    submitted_to: Optional[datetime] = Field(None, description="Submitted before (UTC)")
+    updated_from: Optional[datetime] = Field(None, description="Updated at or after (UTC)")
+    updated_to: Optional[datetime] = Field(None, description="Updated before (UTC)")
+    sort: str = Field("created", description="created, priority or due")
     limit: int = Field(50, ge=1, le=100, description="Number of results")
     offset: int = Field(0, ge=0, description="Offset for pagination")
+
+
+class FacetCount(BaseModel):
+    """Number of queue requests with one facet value."""
+    value: Optional[str] = Field(description="Facet value (null: not set, e.g. not yet reviewed)")
+    count: int
+
+
+class HRRequestQueuePage(BaseModel):
+    """HR queue page with facet counts over all requests matching its filters."""
+    items: List[HRRequestResponse] = Field(default_factory=list)
+    facets: Dict[str, List[FacetCount]] = Field(default_factory=dict)
+
+
+class HRDashboardResponse(BaseModel):
+    """Everything the HR dashboard needs for its first paint."""
+    tabs: Dict[str, List[HRRequestResponse]] = Field(description="Most recent requests per status")
+    status_counts: Dict[str, int]
+    total: int
+
+
+class RequestTombstoneResponse(BaseModel):
+    """A request removed from the live queue since the last sync."""
+    id: int = Field(validation_alias="request_id")
+    reference: str
+    deleted_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class HRRequestChanges(BaseModel):
+    """Delta sync page: changed requests and removals since the cursor."""
+    changes: List[HRRequestResponse] = Field(default_factory=list)
+    deleted: List[RequestTombstoneResponse] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(description="Pass as `since` on the next sync")
+    has_more: bool = Field(description="More changes are available right away")
+    resync: bool = Field(
+        False,
+        description="Removals since the cursor are no longer known: discard the local copy and sync again without `since`"
+    )
@@ -0,0 +1,31 @@
+"""
+Notification log schemas.
+
+Schemas for HR inspection of notification delivery history.
+"""
+
+from datetime import datetime
+from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class NotificationLogResponse(BaseModel):
+    """A single notification_log entry."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    notification_type: str
+    recipient: str
+    subject: Optional[str] = None
+    message: str
+    trigger_entity_type: Optional[str] = None
+    trigger_entity_id: Optional[int] = None
+    status: Optional[str] = None
+    status_detail: Optional[str] = None
+    created_at: datetime
+
+
+class NotificationLogPage(BaseModel):
+    """A page of notification logs, newest first."""
+    items: List[NotificationLogResponse] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page")
@@ -8,7 +8,14 @@ from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, Field, ConfigDict, field_validator
 from app.core.validation import sanitize_text
-from app.models.request import RequestStatus
+from app.models.request import RequestPriority, RequestStatus
+
+
+def priority_name(v):
+    """Serialize a stored priority (integer) as its name."""
+    if isinstance(v, int):
+        return RequestPriority(v).name.lower()
+    return v
 
 
 class RequestBase(BaseModel):
@@ -65,6 +72,10 @@ class RequestUpdate(BaseModel):
     public_notes: Optional[str] = Field(None, max_length=1000, description="Notes visible to employee")
     internal_notes: Optional[str] = Field(None, max_length=2000, description="HR-only notes")
     reviewed_by: Optional[str] = Field(None, max_length=100, description="HR staff identifier")
+    priority: Optional[str] = Field(None, description="Priority (low, normal, high, urgent)")
+    expected_version: Optional[int] = Field(
+        None, ge=1, description="Version the change is based on (alternative to If-Match)"
+    )
     
     @field_validator('status')
     @classmethod
@@ -79,6 +90,18 @@ class RequestUpdate(BaseModel):
             raise ValueError(f"Status must be one of: {', '.join(allowed_statuses)}")
         return v_lower
     
+    @field_validator('priority')
+    @classmethod
+    def validate_priority(cls, v: Optional[str]) -> Optional[str]:
+        """Validate priority is one of the allowed names."""
+        if v is None:
+            return None
+        allowed_priorities = [priority.name.lower() for priority in RequestPriority]
+        v_lower = v.lower().strip()
+        if v_lower not in allowed_priorities:
+            raise ValueError(f"Priority must be one of: {', '.join(allowed_priorities)}")
+        return v_lower
+    
     @field_validator('public_notes', 'internal_notes')
     @classmethod
     def sanitize_notes(cls, v: Optional[str]) -> Optional[str]:
@@ -114,5 +137,10 @@ class RequestResponse(RequestBase):
     reviewed_by: Optional[str] = None
     reviewed_at: Optional[datetime] = None
     public_notes: Optional[str] = None
+    priority: str
+    due_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
+    version: int
+    
+    _priority_name = field_validator('priority', mode='before')(priority_name)
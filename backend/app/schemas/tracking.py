@@ -5,7 +5,7 @@ Schemas for employee-safe request tracking (no internal data).
 """
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseModel, Field
 
 
@@ -34,3 +34,20 @@ class RequestTrackingResponse(BaseModel):
     # Friendly status messages
     status_label: str = Field(description="Human-friendly status description")
     next_steps: Optional[str] = Field(None, description="What happens next")
+
+
+class TrackingBatchRequest(BaseModel):
+    """References to look up in one call."""
+    references: List[str] = Field(..., min_length=1, max_length=50, description="Request references (REF-YYYY-NNN)")
+
+
+class TrackingBatchResponse(BaseModel):
+    """Tracking results keyed by reference; null marks a reference that was not found."""
+    results: Dict[str, Optional[RequestTrackingResponse]] = Field(default_factory=dict)
+    not_found: List[str] = Field(default_factory=list)
+
+
+class RequestTrackingPage(BaseModel):
+    """One page of an employee's requests, newest first."""
+    items: List[RequestTrackingResponse] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` for the next page")
@@ -0,0 +1,220 @@
+"""
+Analytics service layer.
+
+Maintains request aging rollups from the request write paths: time-in-status
+histograms per day x status x reviewer, from which percentiles and SLA
+breach counts are computed. Hourly and daily submission/resolution counts
+live in timeseries_service.
+"""
+
+import math
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.analytics import RequestAgingRollup
+from app.models.request import Request, RequestStatus
+
+# Log-scale duration buckets: bucket 0 is under a minute, then four buckets
+# per doubling (each ~19% wide), so estimates stay within ~10% of the truth.
+BUCKET_BASE_SECONDS = 60
+BUCKETS_PER_DOUBLING = 4
+
+AGING_PERCENTILES = (50, 90, 95, 99)
+
+TERMINAL_STATUSES = {RequestStatus.COMPLETED.value, RequestStatus.REJECTED.value}
+
+
+def duration_bucket(seconds: float) -> int:
+    """Map a duration in seconds to its histogram bucket."""
+    if seconds < BUCKET_BASE_SECONDS:
+        return 0
+    return 1 + int(math.log2(seconds / BUCKET_BASE_SECONDS) * BUCKETS_PER_DOUBLING)
+
+
+def bucket_midpoint(bucket: int) -> float:
+    """Representative duration (geometric midpoint, in seconds) of a bucket."""
+    if bucket == 0:
+        return BUCKET_BASE_SECONDS / 2
+    lower = BUCKET_BASE_SECONDS * 2 ** ((bucket - 1) / BUCKETS_PER_DOUBLING)
+    upper = BUCKET_BASE_SECONDS * 2 ** (bucket / BUCKETS_PER_DOUBLING)
+    return math.sqrt(lower * upper)
+
+
+def upsert_increment(db: Session, model, keys: dict, increments: dict) -> None:
+    """
+    Insert a rollup row or add to its counters in one statement.
+
+    Uses INSERT ... ON CONFLICT DO UPDATE (PostgreSQL and SQLite 3.24+), so
+    concurrent writers never lose increments.
+    """
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    table = model.__table__
+    stmt = insert(table).values(**keys, **increments)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={name: table.c[name] + stmt.excluded[name] for name in increments}
+    )
+    db.execute(stmt)
+
+
+def record_status_stint(
+    db: Session,
+    status: str,
+    started_at: datetime,
+    ended_at: datetime,
+    reviewer: Optional[str] = None
+) -> None:
+    """
+    Add one completed status stint to the aging rollup.
+
+    Runs in the caller's transaction so the rollup commits with the write.
+    """
+    seconds = max(0.0, (ended_at - started_at).total_seconds())
+    sla = settings.sla_hours_map.get(status)
+    breached = sla is not None and seconds > sla * 3600
+
+    upsert_increment(
+        db,
+        RequestAgingRollup,
+        keys={
+            "day": ended_at.date(),
+            "status": status,
+            "reviewer": reviewer or "",
+            "bucket": duration_bucket(seconds),
+        },
+        increments={
+            "count": 1,
+            "total_seconds": seconds,
+            "sla_breaches": 1 if breached else 0,
+        }
+    )
+
+
+def backfill_request_history(db: Session, request: Request) -> None:
+    """
+    Record the history of a request that predates aging rollups.
+
+    Only the submitted -> first review stint can be reconstructed from the
+    stored timestamps. Marks the request as tracked by setting
+    status_changed_at to when its current status began.
+    """
+    if request.status != RequestStatus.SUBMITTED and request.reviewed_at:
+        record_status_stint(
+            db,
+            RequestStatus.SUBMITTED.value,
+            request.submitted_at,
+            request.reviewed_at,
+            request.reviewed_by
+        )
+        request.status_changed_at = request.reviewed_at
+    else:
+        request.status_changed_at = request.submitted_at
+
+
+def backfill_aging_rollups(db: Session, batch_size: int = 1000) -> int:
+    """
+    Backfill aging rollups for every request that predates them.
+
+    Idempotent: processed requests get status_changed_at set and are skipped
+    on later runs. Commits per batch to keep transactions short.
+
+    Returns:
+        Number of requests processed
+    """
+    processed = 0
+    while True:
+        batch = (
+            db.query(Request)
+            .filter(Request.status_changed_at.is_(None))
+            .order_by(Request.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            return processed
+        for request in batch:
+            backfill_request_history(db, request)
+        db.commit()
+        processed += len(batch)
+
+
+def _percentile(buckets: List[tuple], total: int, percentile: float) -> float:
+    """Estimate a percentile (in seconds) from sorted (bucket, count) pairs."""
+    threshold = total * percentile / 100
+    cumulative = 0
+    for bucket, count in buckets:
+        cumulative += count
+        if cumulative >= threshold:
+            return bucket_midpoint(bucket)
+    return bucket_midpoint(buckets[-1][0])
+
+
+def get_aging_stats(
+    db: Session,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    status: Optional[str] = None,
+    reviewer: Optional[str] = None
+) -> Dict[str, dict]:
+    """
+    Time-in-status percentiles and SLA breaches from the aging rollup.
+
+    Reads one grouped aggregate over the rollup rows in range; cost depends
+    on the number of days and buckets, not on the number of requests.
+
+    Args:
+        db: Database session
+        since: First day (inclusive) of stints to include
+        until: Last day (inclusive) of stints to include
+        status: Optional status filter
+        reviewer: Optional reviewer filter
+
+    Returns:
+        {status: {"count", "mean_hours", "p50_hours", ..., "sla_hours", "sla_breaches"}}
+    """
+    R = RequestAgingRollup
+    query = db.query(
+        R.status,
+        R.bucket,
+        func.sum(R.count),
+        func.sum(R.total_seconds),
+        func.sum(R.sla_breaches)
+    )
+    if since:
+        query = query.filter(R.day >= since)
+    if until:
+        query = query.filter(R.day <= until)
+    if status:
+        query = query.filter(R.status == status)
+    if reviewer is not None:
+        query = query.filter(R.reviewer == reviewer)
+
+    by_status: Dict[str, dict] = {}
+    for row_status, bucket, count, seconds, breaches in query.group_by(R.status, R.bucket):
+        entry = by_status.setdefault(row_status, {"buckets": [], "count": 0, "seconds": 0.0, "breaches": 0})
+        entry["buckets"].append((bucket, count))
+        entry["count"] += count
+        entry["seconds"] += seconds
+        entry["breaches"] += breaches
+
+    sla = settings.sla_hours_map
+    stats = {}
+    for row_status, entry in by_status.items():
+        buckets = sorted(entry["buckets"])
+        result = {
+            "count": entry["count"],
+            "mean_hours": round(entry["seconds"] / entry["count"] / 3600, 2),
+        }
+        for p in AGING_PERCENTILES:
+            result[f"p{p}_hours"] = round(_percentile(buckets, entry["count"], p) / 3600, 2)
+        result["sla_hours"] = sla.get(row_status)
+        result["sla_breaches"] = entry["breaches"]
+        stats[row_status] = result
+
+    return stats
@@ -0,0 +1,169 @@
+"""
+Request archival.
+
+Completed and rejected requests that have not changed for
+`request_archive_after_days` move from `requests` to `requests_archive`,
+keeping the live table (and its indexes) down to open and recent work.
+Archived requests keep their id and reference; tracking falls back to the
+archive when the live lookup misses.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, func, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.periodic import PeriodicTask, job_lock
+from app.database import engine
+from app.models.request import ArchivedRequest, Request, RequestStatus, RequestTombstone
+from app.services import request_events
+from app.services.request_sync_service import record_tombstone
+from app.services.result_cache import result_cache
+
+logger = logging.getLogger(__name__)
+
+CLOSED_STATUSES = (RequestStatus.COMPLETED, RequestStatus.REJECTED)
+
+# Archived columns copied from the live row
+_COLUMNS = [column.name for column in Request.__table__.columns]
+
+
+def _archive_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """Move one batch of closed requests to the archive; returns its size."""
+    # The newest request always stays live, since SQLite would otherwise
+    # reuse its id for the next request
+    max_id = db.query(func.max(Request.id)).scalar() or 0
+    query = (
+        db.query(Request)
+        .filter(Request.status.in_(CLOSED_STATUSES))
+        .filter(Request.updated_at < cutoff)
+        .filter(Request.id < max_id)
+        .order_by(Request.id)
+        .limit(batch_size)
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        # Rows being edited by HR right now are skipped until the next run
+        query = query.with_for_update(skip_locked=True)
+    batch = query.all()
+    if not batch:
+        return 0
+
+    now = datetime.utcnow()
+    db.execute(insert(ArchivedRequest), [
+        {**{name: getattr(row, name) for name in _COLUMNS}, "archived_at": now}
+        for row in batch
+    ])
+    messages = []
+    for row in batch:
+        record_tombstone(db, row)
+        # Lets HR event streams and other workers' caches see the removal
+        messages.append(request_events.record_request_event(db, "request_archived", row))
+    db.execute(
+        delete(Request)
+        .where(Request.id.in_([row.id for row in batch]))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    result_cache.bump()
+    for message in messages:
+        request_events.announce(message)
+    return len(batch)
+
+
+def archive_closed_requests(
+    db_engine: Optional[Engine] = None,
+    now: Optional[datetime] = None,
+    batch_size: Optional[int] = None
+) -> int:
+    """
+    Archive closed requests past the retention period.
+
+    Works in short per-batch transactions so live writes are never blocked
+    for long. Only one worker (or CLI run) archives at a time; the others
+    return 0 at once.
+
+    Returns:
+        Number of archived requests
+    """
+    if settings.request_archive_after_days <= 0:
+        return 0
+    db_engine = db_engine or engine
+    cutoff = (now or datetime.utcnow()) - timedelta(days=settings.request_archive_after_days)
+    batch_size = batch_size or settings.request_archive_batch_size
+
+    archived = 0
+    with job_lock(db_engine, "request_archival") as acquired:
+        while acquired:
+            with Session(db_engine) as db:
+                moved = _archive_batch(db, cutoff, batch_size)
+            archived += moved
+            if moved < batch_size:
+                break
+
+    if archived:
+        logger.info("Archived %d closed requests", archived)
+    return archived
+
+
+def prune_tombstones(db_engine: Optional[Engine] = None, now: Optional[datetime] = None) -> int:
+    """
+    Delete tombstones past the retention period.
+
+    Delta sync cursors older than that are told to resync instead.
+
+    Returns:
+        Number of deleted tombstones
+    """
+    if settings.request_tombstone_retention_days <= 0:
+        return 0
+    db_engine = db_engine or engine
+    cutoff = (now or datetime.utcnow()) - timedelta(days=settings.request_tombstone_retention_days)
+    with job_lock(db_engine, "tombstone_pruning") as acquired:
+        if not acquired:
+            return 0
+        with db_engine.begin() as conn:
+            return conn.execute(delete(RequestTombstone).where(RequestTombstone.deleted_at < cutoff)).rowcount
+
+
+def run_request_archival() -> None:
+    """Archival job: move closed requests out, then prune old tombstones."""
+    archive_closed_requests()
+    pruned = prune_tombstones()
+    if pruned:
+        logger.info("Pruned %d request tombstones", pruned)
+
+
+def get_archived_request(db: Session, reference: str) -> Optional[ArchivedRequest]:
+    """Look up an archived request by reference."""
+    return db.query(ArchivedRequest).filter(ArchivedRequest.reference == reference).first()
+
+
+# Global archival job (None unless enabled in settings)
+_archival: Optional[PeriodicTask] = None
+
+
+async def start_request_archival() -> None:
+    """Schedule archival of closed requests according to settings."""
+    global _archival
+    if (
+        settings.request_archive_after_days > 0
+        and settings.request_archive_interval_minutes > 0
+        and _archival is None
+    ):
+        _archival = PeriodicTask(
+            "request_archival",
+            settings.request_archive_interval_minutes * 60,
+            run_request_archival
+        )
+        await _archival.start()
+
+
+async def stop_request_archival() -> None:
+    global _archival
+    if _archival is not None:
+        await _archival.stop()
+        _archival = None
@@ -4,48 +4,258 @@ HR service layer.
 Business logic for HR staff operations.
 """
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from app.models.request import Request, RequestStatus
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Union
+from sqlalchemy.orm import Query, Session
+from sqlalchemy import desc, func, select, union_all
+from app.core.singleflight import SingleFlight, bind_key
+from app.models.request import (
+    OPEN_STATUS_PREDICATE,
+    ArchivedRequest,
+    Request,
+    RequestPriority,
+    RequestStatus,
+)
+from app.schemas.hr import HRRequestFilter, HRRequestResponse
+from app.schemas.request import priority_name
+from app.services.result_cache import result_cache
+
+# Identical concurrent reads share one computation
+_flights = SingleFlight("hr")
+
+# HR queue orderings; priority and due list open requests only
+HR_QUEUE_SORTS = ("created", "priority", "due")
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps are stored as naive UTC."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def build_hr_queue_query(db: Session, filters: HRRequestFilter) -> Query:
+    """
+    Compose the HR queue query from any combination of filters.
+    
+    Each filter is written as an equality or half-open range on the leading
+    column of one of the request indexes, so every combination has an
+    indexed access path and the planner picks the most selective one:
+    
+        status          (status, created_at, id)
+        submitted_by    (submitted_by, created_at)
+        reviewed_by     (reviewed_by, updated_at)
+        submitted_from/to   (submitted_at)
+        updated_from/to     (updated_at, id)
+    
+    Triage sorts add the open-status predicate of their partial indexes.
+    
+    Raises:
+        ValueError: If the sort is unknown, a triage sort is combined with a
+            closed status, or a range is empty
+    """
+    if filters.sort not in HR_QUEUE_SORTS:
+        raise ValueError(f"Invalid sort. Must be one of: {', '.join(HR_QUEUE_SORTS)}")
+    if filters.sort != "created" and filters.status in (
+        RequestStatus.COMPLETED.value, RequestStatus.REJECTED.value
+    ):
+        raise ValueError(f"Sort '{filters.sort}' only applies to open requests; use sort=created for {filters.status}")
+    
+    query = db.query(Request)
+    
+    # Filter by status if provided
+    if filters.status:
+        status_enum = RequestStatus(filters.status)
+        query = query.filter(Request.status == status_enum)
+    
+    if filters.submitted_by:
+        query = query.filter(Request.submitted_by == filters.submitted_by)
+    
+    if filters.reviewed_by:
+        query = query.filter(Request.reviewed_by == filters.reviewed_by)
+    
+    for column, start, end, name in (
+        (Request.submitted_at, filters.submitted_from, filters.submitted_to, "submitted"),
+        (Request.updated_at, filters.updated_from, filters.updated_to, "updated"),
+    ):
+        start, end = _naive_utc(start), _naive_utc(end)
+        if start is not None and end is not None and end <= start:
+            raise ValueError(f"'{name}_to' must be after '{name}_from'")
+        if start is not None:
+            query = query.filter(column >= start)
+        if end is not None:
+            query = query.filter(column < end)
+    
+    if filters.sort == "priority":
+        query = query.filter(OPEN_STATUS_PREDICATE).order_by(
+            desc(Request.priority), Request.due_at.asc().nulls_last(), Request.id
+        )
+    elif filters.sort == "due":
+        query = query.filter(OPEN_STATUS_PREDICATE).order_by(
+            Request.due_at.asc().nulls_last(), Request.id
+        )
+    else:
+        # Order by most recent first
+        query = query.order_by(desc(Request.created_at), desc(Request.id))
+    
+    return query
+
+
+# Fields a sparse HR queue page can select (all HR response fields); the
+# identifying ones are always included
+HR_QUEUE_FIELDS = tuple(HRRequestResponse.model_fields)
+HR_QUEUE_KEY_FIELDS = ("id", "reference")
+
+
+def parse_fields(fields: str) -> List[str]:
+    """
+    Validate a comma-separated sparse fieldset.
+    
+    Raises:
+        ValueError: If a field is not in HR_QUEUE_FIELDS
+    """
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in HR_QUEUE_FIELDS]
+    if unknown:
+        raise ValueError(f"Invalid fields: {', '.join(unknown)}. Must be among: {', '.join(HR_QUEUE_FIELDS)}")
+    return list(HR_QUEUE_KEY_FIELDS) + [name for name in requested if name not in HR_QUEUE_KEY_FIELDS]
+
+
+def _sparse_value(value):
+    if isinstance(value, RequestStatus):
+        return value.value
+    return value
 
 
 def get_hr_queue(
     db: Session,
-    status: Optional[str] = None,
-    limit: int = 50,
-    offset: int = 0
-) -> List[Request]:
+    filters: HRRequestFilter,
+    fields: Optional[List[str]] = None
+) -> Union[List[HRRequestResponse], List[dict]]:
     """
     Get HR request queue with filtering.
     
+    Every ordering is served by an index (the triage ones by partial
+    indexes over open requests), so a page never sorts the whole table.
+    Identical concurrent calls share one query (single-flight).
+    
     Args:
         db: Database session
-        status: Optional status filter
-        limit: Maximum number of results
-        offset: Offset for pagination
+        filters: Filters, sort (created: most recent first, priority: most
+            urgent then earliest due, due: earliest due first) and page
+        fields: Sparse fieldset from parse_fields; only these columns are
+            selected (list views skip the large Text columns)
         
     Returns:
-        List of requests (most recent first)
+        List of requests, or of {field: value} dicts with a fieldset
+        (shared between callers: do not modify)
+        
+    Raises:
+        ValueError: If the sort is unknown or a range is empty
     """
-    query = db.query(Request)
-    
-    # Filter by status if provided
-    if status:
-        try:
-            status_enum = RequestStatus(status)
-            query = query.filter(Request.status == status_enum)
-        except ValueError:
-            # Invalid status, return empty
-            return []
+    key = (bind_key(db), result_cache.version, "queue", filters.model_dump_json(), tuple(fields or ()))
+    return _flights.do(key, lambda: _load_hr_queue(db, filters, fields))
+
+
+def _load_hr_queue(
+    db: Session,
+    filters: HRRequestFilter,
+    fields: Optional[List[str]]
+) -> Union[List[HRRequestResponse], List[dict]]:
+    query = build_hr_queue_query(db, filters)
     
-    # Order by most recent first
-    query = query.order_by(desc(Request.created_at))
+    if fields:
+        query = query.with_entities(*(Request.__table__.c[name] for name in fields))
     
     # Apply pagination
-    query = query.limit(limit).offset(offset)
+    query = query.limit(filters.limit).offset(filters.offset)
+    
+    if not fields:
+        # Plain data rather than session-bound rows, since callers share it
+        return [HRRequestResponse.model_validate(request) for request in query]
+    return [
+        {
+            name: priority_name(value) if name == "priority" else _sparse_value(value)
+            for name, value in zip(fields, row)
+        }
+        for row in query
+    ]
+
+
+# Columns the HR queue can be faceted by
+HR_QUEUE_FACETS = {
+    "status": Request.status,
+    "reviewed_by": Request.reviewed_by,
+    "priority": Request.priority,
+}
+
+
+def _facet_value(facet: str, value) -> Optional[str]:
+    if value is None:
+        return None
+    if facet == "status":
+        return value.value
+    if facet == "priority":
+        return RequestPriority(value).name.lower()
+    return value
+
+
+def get_hr_queue_facets(db: Session, filters: HRRequestFilter, facets: List[str]) -> Dict[str, List[dict]]:
+    """
+    Count the requests matching the queue filters per facet value.
+    
+    One grouped query over all requested facet columns; each facet's counts
+    are then summed from the combinations. Status and priority list every
+    value, including zeros.
+    
+    Args:
+        db: Database session
+        filters: Queue filters (sort and page do not apply)
+        facets: Facet names from HR_QUEUE_FACETS
+        
+    Returns:
+        {facet: [{"value": ..., "count": ...}]}, most frequent first (ties
+        by value, unset last)
+        
+    Raises:
+        ValueError: If a facet is unknown, or the filters are invalid
+    """
+    unknown = [facet for facet in facets if facet not in HR_QUEUE_FACETS]
+    if unknown:
+        raise ValueError(f"Invalid facet. Must be one of: {', '.join(HR_QUEUE_FACETS)}")
+    
+    key = (bind_key(db), result_cache.version, "facets", filters.model_dump_json(), tuple(facets))
+    return _flights.do(key, lambda: _count_facets(db, filters, facets))
+
+
+def _count_facets(db: Session, filters: HRRequestFilter, facets: List[str]) -> Dict[str, List[dict]]:
+    columns = [HR_QUEUE_FACETS[facet] for facet in facets]
+    rows = (
+        build_hr_queue_query(db, filters)
+        .order_by(None)
+        .with_entities(*columns, func.count(Request.id))
+        .group_by(*columns)
+        .all()
+    )
     
-    return query.all()
+    result = {}
+    for position, facet in enumerate(facets):
+        if facet == "status":
+            counts = {status.value: 0 for status in RequestStatus}
+        elif facet == "priority":
+            counts = {priority.name.lower(): 0 for priority in RequestPriority}
+        else:
+            counts = {}
+        for row in rows:
+            value = _facet_value(facet, row[position])
+            counts[value] = counts.get(value, 0) + row[-1]
+        result[facet] = [
+            {"value": value, "count": count}
+            for value, count in sorted(
+                counts.items(), key=lambda item: (-item[1], item[0] is None, item[0] or "")
+            )
+        ]
+    return result
 
 
 def get_request_count_by_status(db: Session) -> dict:
@@ -56,12 +266,58 @@ def get_request_count_by_status(db: Session) -> dict:
         db: Database session
         
     Returns:
-        Dictionary with status counts
+        Dictionary with status counts (shared between concurrent callers)
     """
-    counts = {}
+    return _flights.do((bind_key(db), result_cache.version, "status_counts"), lambda: _count_by_status(db))
+
+
+def _count_by_status(db: Session) -> dict:
+    counts = {status.value: 0 for status in RequestStatus}
     
-    for status in RequestStatus:
-        count = db.query(Request).filter(Request.status == status).count()
-        counts[status.value] = count
+    # One grouped query per table (archived requests are all closed)
+    for model in (Request, ArchivedRequest):
+        for status, count in db.query(model.status, func.count(model.id)).group_by(model.status):
+            counts[status.value] += count
     
     return counts
+
+
+def get_dashboard(db: Session, limit: int = 20) -> dict:
+    """
+    First page of every status tab plus status counts, for the dashboard.
+    
+    The tabs are one UNION ALL of per-status pages, each a range scan of
+    (status, created_at, id) stopping at `limit`, so the cost does not grow
+    with the queue.
+    
+    Args:
+        db: Database session
+        limit: Requests per tab (most recent first)
+        
+    Returns:
+        {"tabs": {status: [request]}, "status_counts": {...}, "total": int}
+        (shared between concurrent callers: do not modify)
+    """
+    return _flights.do((bind_key(db), result_cache.version, "dashboard", limit), lambda: _load_dashboard(db, limit))
+
+
+def _load_dashboard(db: Session, limit: int) -> dict:
+    pages = [
+        select(*Request.__table__.columns)
+        .where(Request.status == status)
+        .order_by(desc(Request.created_at), desc(Request.id))
+        .limit(limit)
+        .subquery()
+        for status in RequestStatus
+    ]
+    statement = union_all(*(select(*page.columns) for page in pages))
+    
+    tabs = {status.value: [] for status in RequestStatus}
+    for request in db.query(Request).from_statement(statement):
+        tabs[request.status.value].append(HRRequestResponse.model_validate(request))
+    # UNION ALL does not keep the per-page order
+    for requests in tabs.values():
+        requests.sort(key=lambda request: (request.created_at, request.id), reverse=True)
+    
+    counts = get_request_count_by_status(db)
+    return {"tabs": tabs, "status_counts": counts, "total": sum(counts.values())}
@@ -0,0 +1,202 @@
+"""
+Idempotency-Key handling for write endpoints.
+
+The first request with a key claims it by inserting an in-flight row; the
+primary key makes the claim atomic across workers. Its response is then
+stored and replayed to retries. A concurrent duplicate waits for the first
+request to finish instead of repeating the write. Keys expire after a TTL
+and storage is capped.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.periodic import PeriodicTask, job_lock
+from app.database import SessionLocal
+from app.models.idempotency import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+# Wait between checks while a duplicate request is in flight
+POLL_INTERVAL_SECONDS = 0.1
+
+
+class IdempotencyConflict(Exception):
+    """The key is still held by an in-flight request."""
+
+
+class IdempotencyMismatch(Exception):
+    """The key was already used for a different request."""
+
+
+def fingerprint(method: str, path: str, body: bytes) -> str:
+    """Hash identifying the request a key was first used for."""
+    digest = hashlib.sha256()
+    for part in (method.encode(), path.encode(), body):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _claim(db: Session, key: str, request_fingerprint: str, now: datetime) -> Optional[IdempotencyKey]:
+    """
+    Try to take the key.
+
+    Returns:
+        None if the key is now held by the caller, else the existing record
+    """
+    db.add(IdempotencyKey(key=key, fingerprint=request_fingerprint, created_at=now, locked_at=now))
+    try:
+        db.commit()
+        return None
+    except IntegrityError:
+        db.rollback()
+
+    record = db.query(IdempotencyKey).filter(IdempotencyKey.key == key).populate_existing().first()
+    if record is None:
+        # Expired and pruned in the meantime
+        return _claim(db, key, request_fingerprint, now)
+
+    if record.created_at < now - timedelta(hours=settings.idempotency_key_ttl_hours):
+        db.delete(record)
+        db.commit()
+        return _claim(db, key, request_fingerprint, now)
+
+    if record.fingerprint != request_fingerprint:
+        raise IdempotencyMismatch(key)
+
+    lock_expired = record.locked_at < now - timedelta(seconds=settings.idempotency_lock_timeout_seconds)
+    if record.status_code is None and lock_expired:
+        # The holder died without finishing; take the key over
+        taken = db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key)
+            .where(IdempotencyKey.locked_at == record.locked_at)
+            .where(IdempotencyKey.status_code.is_(None))
+            .values(locked_at=now)
+        ).rowcount
+        db.commit()
+        if taken:
+            return None
+    return record
+
+
+def begin(db: Session, key: str, request_fingerprint: str) -> Optional[Tuple[int, dict]]:
+    """
+    Claim a key, or wait for and return the response stored under it.
+
+    Returns:
+        None if the caller holds the key and should perform the write,
+        else the stored (status_code, body) to replay
+
+    Raises:
+        IdempotencyMismatch: If the key was used for a different request
+        IdempotencyConflict: If a duplicate is still in flight after the wait
+    """
+    deadline = time.monotonic() + settings.idempotency_wait_seconds
+    while True:
+        record = _claim(db, key, request_fingerprint, datetime.utcnow())
+        if record is None:
+            return None
+        if record.status_code is not None:
+            return record.status_code, json.loads(record.response_body)
+        if time.monotonic() >= deadline:
+            raise IdempotencyConflict(key)
+        time.sleep(POLL_INTERVAL_SECONDS)
+
+
+def record_response(db: Session, key: str, status_code: int, body: dict) -> None:
+    """
+    Store the response for a key held by the caller, in the caller's transaction.
+
+    Committing it together with the write makes the key complete exactly
+    when the write is.
+    """
+    db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.key == key)
+        .values(status_code=status_code, response_body=json.dumps(body))
+    )
+
+
+def release(db: Session, key: str) -> None:
+    """
+    Give up a held key after a failed write, so a retry can run it again.
+
+    A key whose response was committed with the write is kept, and retries
+    replay that response.
+    """
+    db.rollback()
+    db.execute(
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.key == key)
+        .where(IdempotencyKey.status_code.is_(None))
+    )
+    db.commit()
+
+
+def prune_idempotency_keys(db: Session, now: Optional[datetime] = None) -> int:
+    """
+    Delete expired keys, then the oldest ones beyond the storage cap.
+
+    Returns:
+        Number of deleted keys
+    """
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(hours=settings.idempotency_key_ttl_hours)
+    deleted = db.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff)).rowcount
+
+    # Oldest created_at still within the cap
+    boundary = (
+        db.query(IdempotencyKey.created_at)
+        .order_by(IdempotencyKey.created_at.desc())
+        .offset(settings.idempotency_max_keys)
+        .limit(1)
+        .scalar()
+    )
+    if boundary is not None:
+        deleted += db.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.created_at <= boundary)
+            .where(IdempotencyKey.status_code.isnot(None))
+        ).rowcount
+    db.commit()
+    return deleted
+
+
+def run_idempotency_cleanup() -> int:
+    """Prune idempotency keys in a fresh session (periodic job entry point)."""
+    db = SessionLocal()
+    try:
+        with job_lock(db.get_bind(), "idempotency_cleanup") as acquired:
+            return prune_idempotency_keys(db) if acquired else 0
+    finally:
+        db.close()
+
+
+# Global cleanup job
+_cleanup: Optional[PeriodicTask] = None
+
+
+async def start_idempotency_cleanup() -> None:
+    """Schedule pruning of expired idempotency keys every ten minutes."""
+    global _cleanup
+    if _cleanup is None:
+        _cleanup = PeriodicTask("idempotency_cleanup", 600, run_idempotency_cleanup)
+        await _cleanup.start()
+
+
+async def stop_idempotency_cleanup() -> None:
+    global _cleanup
+    if _cleanup is not None:
+        await _cleanup.stop()
+        _cleanup = None
@@ -0,0 +1,161 @@
+"""
+Notification coalescing and HR digest scheduling.
+
+- NotificationCoalescer holds notifications for a short window and merges
+  those for the same type, recipient and entity, so a request moved through
+  several states in a minute produces one provider call. Held notifications
+  are already in notification_log (status "held"); the coalescer only keeps
+  their ids, so a worker that stops or crashes mid-window loses nothing.
+- A periodic HR digest job sends one HR summary in place of a per-request
+  HR email.
+
+Both run as tasks on the app's event loop and write through callbacks
+supplied by the notification service.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.core.periodic import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+CoalesceKey = Tuple[str, str, Optional[str], Optional[int]]
+
+
+class NotificationCoalescer:
+    """
+    Merge notifications for the same (type, recipient, entity) within a window.
+
+    The window is fixed from the first notification for a key, so latency is
+    bounded by `window` seconds even under a steady stream of updates. When
+    the window closes, `release` gets the held log ids of each key; the
+    latest one wins, since it reflects the current state.
+    """
+
+    def __init__(
+        self,
+        window: float,
+        release: Callable[[List[List[int]]], None],
+        max_pending: int = 10000
+    ):
+        self.window = window
+        self.release = release
+        self.max_pending = max_pending
+        self.stats = {"offered": 0, "merged": 0, "released": 0}
+
+        self._pending: Dict[CoalesceKey, Tuple[float, List[int]]] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    def offer(self, notification: dict, log_id: int) -> bool:
+        """
+        Hold a notification, already logged as `log_id`, for coalescing.
+        Safe to call from any thread.
+
+        Returns:
+            False if the coalescer is not running or is full, in which case
+            the caller should send the notification immediately.
+        """
+        if not self.is_running:
+            return False
+
+        key = (
+            notification["notification_type"],
+            notification["recipient"],
+            notification.get("trigger_entity_type"),
+            notification.get("trigger_entity_id"),
+        )
+        with self._lock:
+            existing = self._pending.get(key)
+            if existing is None and len(self._pending) >= self.max_pending:
+                return False
+            if existing is None:
+                self._pending[key] = (time.monotonic(), [log_id])
+            else:
+                existing[1].append(log_id)
+                self.stats["merged"] += 1
+            self.stats["offered"] += 1
+        return True
+
+    async def start(self) -> None:
+        if not self.is_running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and release everything still pending."""
+        if not self.is_running:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self._flush(force=True)
+
+    async def _run(self) -> None:
+        interval = max(0.05, min(1.0, self.window / 4))
+        while True:
+            await asyncio.sleep(interval)
+            await self._flush()
+
+    async def _flush(self, force: bool = False) -> None:
+        cutoff = time.monotonic() - self.window
+        with self._lock:
+            due = [k for k, (first_seen, _) in self._pending.items() if force or first_seen <= cutoff]
+            batch = [self._pending.pop(k)[1] for k in due]
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(self.release, batch)
+            self.stats["released"] += len(batch)
+        except Exception as e:
+            # The rows stay held; the next worker start releases them
+            logger.error("Failed to release %d coalesced notifications: %s", len(batch), e, exc_info=True)
+
+
+# Global instances (None unless enabled in settings)
+_coalescer: Optional[NotificationCoalescer] = None
+_digest: Optional[PeriodicTask] = None
+
+
+def get_coalescer() -> Optional[NotificationCoalescer]:
+    """Get the running coalescer, if coalescing is enabled."""
+    return _coalescer
+
+
+async def start_notification_batching(
+    release: Callable[[List[List[int]]], None],
+    send_digest: Callable[[], None]
+) -> None:
+    """Start the coalescer and HR digest scheduler according to settings."""
+    global _coalescer, _digest
+
+    if settings.notification_coalesce_window_seconds > 0 and _coalescer is None:
+        _coalescer = NotificationCoalescer(settings.notification_coalesce_window_seconds, release)
+        await _coalescer.start()
+        logger.info("Notification coalescing enabled (%ss window)", settings.notification_coalesce_window_seconds)
+
+    if settings.hr_digest_interval_minutes > 0 and _digest is None:
+        _digest = PeriodicTask("hr_digest", settings.hr_digest_interval_minutes * 60, send_digest)
+        await _digest.start()
+        logger.info("HR digest enabled (every %d minutes)", settings.hr_digest_interval_minutes)
+
+
+async def stop_notification_batching() -> None:
+    """Stop the digest scheduler and flush pending coalesced notifications."""
+    global _coalescer, _digest
+
+    if _digest is not None:
+        await _digest.stop()
+        _digest = None
+
+    if _coalescer is not None:
+        coalescer, _coalescer = _coalescer, None
+        await coalescer.stop()
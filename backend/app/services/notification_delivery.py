@@ -0,0 +1,397 @@
+"""
+Notification delivery engine.
+
+Delivers logged notifications through async transports in the background,
+off the request path:
+- Bounded queue drained by a fixed pool of workers (bounded concurrency)
+- Retry with exponential backoff and jitter for transient failures
+- Per-provider circuit breaker so an outage fails fast instead of piling up
+- Delivery results written back to notification_log in batches
+"""
+
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Protocol, Tuple
+
+from app.config import settings
+from app.core.validation import validate_email
+from app.services.notification_transports import (
+    PermanentDeliveryError,
+    SMTPTransport,
+    TwilioSMSTransport,
+)
+
+logger = logging.getLogger(__name__)
+
+PHONE_PATTERN = re.compile(r"^\+[1-9]\d{7,14}$")
+
+# (notification_log id, status, error) tuples passed to the result callback
+DeliveryResult = Tuple[int, str, Optional[str]]
+
+
+class Transport(Protocol):
+    channel: str
+
+    async def send(self, recipient: str, subject: Optional[str], body: str) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+@dataclass
+class DeliveryJob:
+    """A single notification queued for delivery."""
+    log_id: int
+    channel: str
+    recipient: str
+    subject: Optional[str]
+    message: str
+    attempts: int = 0
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker.
+
+    Opens after `failure_threshold` consecutive failures. While open, calls
+    are rejected until `reset_timeout` has elapsed; then a single trial call
+    is let through (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self.retry_after() == 0:
+            return self.HALF_OPEN
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit allows a trial call."""
+        if self._state != self.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def allow(self) -> bool:
+        """Return True if a call may be made now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self.failure_threshold:
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+        self._trial_in_flight = False
+
+
+class DeliveryEngine:
+    """
+    Background delivery engine.
+
+    `submit()` is thread-safe and never blocks: it hands the job to the
+    engine's event loop, so sync endpoints running in the threadpool can
+    enqueue notifications without waiting on any provider.
+    """
+
+    def __init__(
+        self,
+        transports: Dict[str, Transport],
+        on_results: Optional[Callable[[List[DeliveryResult]], None]] = None,
+        concurrency: int = 20,
+        queue_size: int = 10000,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        flush_interval: float = 0.5
+    ):
+        self.transports = transports
+        self.on_results = on_results
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.flush_interval = flush_interval
+        self.breakers = {
+            channel: CircuitBreaker(failure_threshold, reset_timeout)
+            for channel in transports
+        }
+        self.stats = {"sent": 0, "failed": 0, "retried": 0, "dropped": 0}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._results: List[DeliveryResult] = []
+        self._pending_retries: set = set()
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._loop is not None
+
+    def accepts(self, channel: Optional[str]) -> bool:
+        """Return True if a transport is configured for this channel."""
+        return self.is_running and channel in self.transports
+
+    async def start(self) -> None:
+        """Start worker tasks on the running event loop."""
+        if self.is_running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._flusher()))
+        logger.info(
+            "Notification delivery engine started (channels=%s, concurrency=%d)",
+            ", ".join(sorted(self.transports)), self.concurrency
+        )
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Drain queued jobs (up to `timeout` seconds), then shut down."""
+        if not self.is_running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            # Their rows stay "queued" and are requeued by a later start
+            logger.warning("Delivery engine stopped with %d jobs undelivered", self._queue.qsize())
+
+        for handle in self._pending_retries:
+            handle.cancel()
+        self._pending_retries.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._flush()
+
+        for transport in self.transports.values():
+            await transport.close()
+        self._tasks = []
+        self._loop = None
+
+    def submit(self, job: DeliveryJob) -> bool:
+        """
+        Queue a job for delivery. Safe to call from any thread.
+
+        Returns:
+            False if the engine is not running, has no transport for the
+            job's channel, or the queue is full; True otherwise.
+        """
+        loop = self._loop
+        if loop is None or job.channel not in self.transports:
+            return False
+        if self._queue.qsize() >= self.queue_size:
+            self.stats["dropped"] += 1
+            logger.warning("Delivery queue full, dropping notification %s", job.log_id)
+            return False
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is loop:
+            self._enqueue(job)
+        else:
+            loop.call_soon_threadsafe(self._enqueue, job)
+        return True
+
+    def _enqueue(self, job: DeliveryJob) -> None:
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            self._record(job, "failed", "delivery queue full")
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._deliver(job)
+            except Exception as e:
+                logger.error("Unexpected delivery error for %s: %s", job.log_id, e, exc_info=True)
+                self._record(job, "failed", str(e))
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, job: DeliveryJob) -> None:
+        transport = self.transports[job.channel]
+        breaker = self.breakers[job.channel]
+        job.attempts += 1
+
+        try:
+            if not breaker.allow():
+                raise CircuitOpenError(f"{job.channel} circuit is open")
+            await transport.send(job.recipient, job.subject, job.message)
+        except PermanentDeliveryError as e:
+            # The provider answered; a rejected message says nothing about its health
+            breaker.record_success()
+            self._record(job, "failed", str(e))
+            return
+        except CircuitOpenError as e:
+            self._retry_or_fail(job, str(e), min_delay=breaker.retry_after())
+            return
+        except Exception as e:
+            breaker.record_failure()
+            self._retry_or_fail(job, str(e))
+            return
+
+        breaker.record_success()
+        self._record(job, "sent", None)
+
+    def _retry_or_fail(self, job: DeliveryJob, error: str, min_delay: float = 0.0) -> None:
+        if job.attempts >= self.max_attempts:
+            logger.warning("Giving up on notification %s after %d attempts: %s", job.log_id, job.attempts, error)
+            self._record(job, "failed", error)
+            return
+
+        # Full jitter keeps retries from a burst failure from re-arriving in lockstep
+        backoff = min(self.max_delay, self.base_delay * (2 ** (job.attempts - 1)))
+        delay = max(min_delay, random.uniform(0, backoff))
+        self.stats["retried"] += 1
+
+        def requeue():
+            self._pending_retries.discard(handle)
+            self._enqueue(job)
+
+        handle = self._loop.call_later(delay, requeue)
+        self._pending_retries.add(handle)
+
+    def _record(self, job: DeliveryJob, status: str, error: Optional[str]) -> None:
+        self.stats[status] = self.stats.get(status, 0) + 1
+        with self._lock:
+            self._results.append((job.log_id, status, error))
+
+    async def _flusher(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._flush()
+
+    async def _flush(self) -> None:
+        with self._lock:
+            batch, self._results = self._results, []
+        if not batch or self.on_results is None:
+            return
+        try:
+            await asyncio.to_thread(self.on_results, batch)
+        except Exception as e:
+            logger.error("Failed to record %d delivery results: %s", len(batch), e, exc_info=True)
+
+
+def channel_for_recipient(recipient: str) -> Optional[str]:
+    """Pick the delivery channel for a recipient (email address or E.164 phone)."""
+    if validate_email(recipient):
+        return "email"
+    if PHONE_PATTERN.match(recipient or ""):
+        return "sms"
+    return None
+
+
+def build_transports() -> Dict[str, Transport]:
+    """Create transports for every provider configured in settings."""
+    transports: Dict[str, Transport] = {}
+
+    if settings.smtp_host:
+        transports["email"] = SMTPTransport(
+            host=settings.smtp_host,
+            port=settings.smtp_port or 587,
+            username=settings.smtp_user,
+            password=settings.smtp_password,
+            from_email=settings.smtp_from_email,
+            use_tls=settings.smtp_use_tls,
+            pool_size=settings.smtp_pool_size
+        )
+
+    if settings.twilio_account_sid and settings.twilio_auth_token and settings.twilio_phone_number:
+        transports["sms"] = TwilioSMSTransport(
+            account_sid=settings.twilio_account_sid,
+            auth_token=settings.twilio_auth_token,
+            from_number=settings.twilio_phone_number,
+            base_url=settings.twilio_api_base_url,
+            max_connections=settings.notification_concurrency
+        )
+
+    return transports
+
+
+# Global engine instance (None until started; stays None without providers)
+_engine: Optional[DeliveryEngine] = None
+
+
+def get_delivery_engine() -> Optional[DeliveryEngine]:
+    """Get the running delivery engine, if any."""
+    return _engine
+
+
+async def start_delivery_engine(
+    on_results: Optional[Callable[[List[DeliveryResult]], None]] = None
+) -> Optional[DeliveryEngine]:
+    """Build and start the global engine when at least one provider is configured."""
+    global _engine
+    if _engine is not None:
+        return _engine
+
+    transports = build_transports()
+    if not transports:
+        logger.info("No notification providers configured; notifications will only be logged")
+        return None
+
+    _engine = DeliveryEngine(
+        transports,
+        on_results=on_results,
+        concurrency=settings.notification_concurrency,
+        queue_size=settings.notification_queue_size,
+        max_attempts=settings.notification_max_attempts,
+        base_delay=settings.notification_retry_base_delay,
+        max_delay=settings.notification_retry_max_delay,
+        failure_threshold=settings.notification_circuit_failure_threshold,
+        reset_timeout=settings.notification_circuit_reset_seconds
+    )
+    await _engine.start()
+    return _engine
+
+
+async def stop_delivery_engine() -> None:
+    """Drain and stop the global engine."""
+    global _engine
+    if _engine is None:
+        return
+    engine, _engine = _engine, None
+    await engine.stop()
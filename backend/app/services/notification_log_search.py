@@ -0,0 +1,127 @@
+"""
+Notification log queries.
+
+Reads notification_log newest first across the live table and, on SQLite,
+the rolled monthly tables (see notification_retention), so the HR
+notification log API sees one continuous history.
+"""
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.notification import NotificationLog
+from app.services.notification_retention import notification_log_tables
+
+
+def get_notification_logs(
+    db: Session,
+    notification_type: Optional[str] = None,
+    limit: int = 100
+):
+    """
+    Retrieve notification logs.
+    
+    Reads newest first from the live table and, on SQLite, continues into
+    rolled monthly tables only until `limit` rows are found.
+    
+    Args:
+        db: Database session
+        notification_type: Optional filter by type
+        limit: Maximum number of records
+        
+    Returns:
+        List of notification logs
+    """
+    query = db.query(NotificationLog)
+    
+    if notification_type:
+        query = query.filter(NotificationLog.notification_type == notification_type)
+    
+    logs = query.order_by(NotificationLog.created_at.desc()).limit(limit).all()
+    
+    for table in notification_log_tables(db)[1:]:
+        if len(logs) >= limit:
+            break
+        stmt = select(table).order_by(table.c.created_at.desc()).limit(limit - len(logs))
+        if notification_type:
+            stmt = stmt.where(table.c.notification_type == notification_type)
+        logs.extend(NotificationLog(**row._mapping) for row in db.execute(stmt))
+    
+    return logs
+
+
+def search_notification_logs(
+    db: Session,
+    notification_type: Optional[str] = None,
+    recipient: Optional[str] = None,
+    trigger_entity_type: Optional[str] = None,
+    trigger_entity_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> Tuple[List[NotificationLog], Optional[str]]:
+    """
+    Search notification logs with keyset pagination over (created_at, id).
+    
+    Each filter combination is served by one of the composite indexes
+    (notification_type | recipient | trigger entity, created_at), read
+    newest first from the cursor position.
+    
+    Args:
+        db: Database session
+        notification_type: Optional filter by type
+        recipient: Optional filter by recipient (exact match)
+        trigger_entity_type: Optional filter by trigger entity type
+        trigger_entity_id: Optional filter by trigger entity id
+        since: Optional inclusive lower bound on created_at
+        until: Optional exclusive upper bound on created_at
+        cursor: Cursor returned with the previous page
+        limit: Page size
+        
+    Returns:
+        Tuple of (logs, next cursor or None on the last page)
+        
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    after = decode_cursor(cursor) if cursor else None
+    logs: List[NotificationLog] = []
+    
+    # Fetch one extra row to learn whether another page exists
+    wanted = limit + 1
+    for table in notification_log_tables(db, since=since):
+        c = table.c
+        stmt = select(table).order_by(c.created_at.desc(), c.id.desc()).limit(wanted - len(logs))
+        
+        if notification_type:
+            stmt = stmt.where(c.notification_type == notification_type)
+        if recipient:
+            stmt = stmt.where(c.recipient == recipient)
+        if trigger_entity_type:
+            stmt = stmt.where(c.trigger_entity_type == trigger_entity_type)
+        if trigger_entity_id is not None:
+            stmt = stmt.where(c.trigger_entity_id == trigger_entity_id)
+        if since:
+            stmt = stmt.where(c.created_at >= since)
+        if until:
+            stmt = stmt.where(c.created_at < until)
+        if after:
+            after_created_at, after_id = after
+            stmt = stmt.where(or_(
+                c.created_at < after_created_at,
+                and_(c.created_at == after_created_at, c.id < after_id)
+            ))
+        
+        logs.extend(NotificationLog(**row._mapping) for row in db.execute(stmt))
+        if len(logs) >= wanted:
+            break
+    
+    next_cursor = None
+    if len(logs) > limit:
+        logs = logs[:limit]
+        next_cursor = encode_cursor(logs[-1].created_at, logs[-1].id)
+    
+    return logs, next_cursor
@@ -0,0 +1,322 @@
+"""
+Notification log partitioning and retention.
+
+notification_log is split into monthly partitions on created_at:
+- PostgreSQL: declarative range partitions (notification_log_pYYYY_MM) of the
+  partitioned parent created by the migration; upcoming months are created
+  ahead of time.
+- SQLite: rolling tables. The live notification_log table holds the current
+  month; older months are moved to notification_log_pYYYY_MM tables.
+
+Partitions that fall entirely outside the retention window are compacted
+into gzip-compressed JSON Lines archives and dropped, so inserts and the
+newest-first query path only ever touch a small, recent working set.
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Index, MetaData, Table, delete, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.periodic import PeriodicTask, job_lock
+from app.database import engine
+from app.models.notification import NotificationLog
+
+logger = logging.getLogger(__name__)
+
+LIVE_TABLE = NotificationLog.__table__
+PARTITION_PATTERN = re.compile(r"^notification_log_p(\d{4})_(\d{2})$")
+MONTHS_AHEAD = 2
+BATCH_SIZE = 5000
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(value: datetime) -> datetime:
+    return (month_start(value) + timedelta(days=32)).replace(day=1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"notification_log_p{month:%Y_%m}"
+
+
+def is_partitioned(conn: Connection) -> bool:
+    """Return True if notification_log is a PostgreSQL partitioned table."""
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = 'notification_log'"
+    )).scalar())
+
+
+def list_partitions(conn: Connection) -> List[Tuple[str, datetime]]:
+    """Return (table name, month) for every monthly partition, oldest first."""
+    if conn.dialect.name == "postgresql":
+        names = conn.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'notification_log'"
+        )).scalars()
+    else:
+        names = inspect(conn).get_table_names()
+
+    partitions = []
+    for name in names:
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            partitions.append((name, datetime(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def partition_table(name: str) -> Table:
+    """Build a Table for a partition with the live table's columns."""
+    table = LIVE_TABLE.to_metadata(MetaData(), name=name)
+    # Index names are global on SQLite; give each rolled table its own copies
+    table.indexes.clear()
+    for index in LIVE_TABLE.indexes:
+        if index.name == "ix_notification_log_id":
+            continue
+        Index(
+            index.name.replace("notification_log", name, 1),
+            *[table.c[column.name] for column in index.columns]
+        )
+    return table
+
+
+def notification_log_tables(db: Session, since: Optional[datetime] = None) -> List[Table]:
+    """
+    Tables holding notification rows, newest first.
+
+    On PostgreSQL the partitioned parent covers every partition (and prunes
+    them itself), so this is just notification_log. On SQLite the rolled
+    tables follow the live one; those ending before `since` are skipped.
+    """
+    conn = db.connection()
+    if conn.dialect.name == "postgresql":
+        return [LIVE_TABLE]
+    return [LIVE_TABLE] + [
+        partition_table(name)
+        for name, month in reversed(list_partitions(conn))
+        if since is None or next_month(month) > since
+    ]
+
+
+def create_upcoming_partitions(conn: Connection, now: datetime) -> None:
+    """Create PostgreSQL partitions for the current month and MONTHS_AHEAD ahead."""
+    month = month_start(now)
+    for _ in range(MONTHS_AHEAD + 1):
+        end = next_month(month)
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF notification_log "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+        ))
+        month = end
+
+
+def roll_sqlite_partitions(conn: Connection, now: datetime) -> int:
+    """
+    Move rows from previous months out of the live SQLite table.
+
+    Returns:
+        Number of rows moved
+    """
+    current = month_start(now)
+    moved = 0
+
+    oldest = conn.execute(select(func.min(LIVE_TABLE.c.created_at))).scalar()
+    while oldest is not None and oldest < current:
+        month = month_start(oldest)
+        end = next_month(month)
+        table = partition_table(partition_name(month))
+        table.create(conn, checkfirst=True)
+
+        in_month = (LIVE_TABLE.c.created_at >= month) & (LIVE_TABLE.c.created_at < end)
+        conn.execute(table.insert().from_select(
+            [c.name for c in LIVE_TABLE.columns],
+            select(LIVE_TABLE).where(in_month)
+        ))
+        moved += conn.execute(delete(LIVE_TABLE).where(in_month)).rowcount
+
+        oldest = conn.execute(select(func.min(LIVE_TABLE.c.created_at))).scalar()
+
+    return moved
+
+
+def _archive_path(archive_dir: Path, month: datetime) -> Path:
+    return archive_dir / f"{partition_name(month)}.jsonl.gz"
+
+
+def _write_rows(handle, rows) -> int:
+    count = 0
+    for row in rows:
+        handle.write(json.dumps(dict(row._mapping), default=str) + "\n")
+        count += 1
+    return count
+
+
+def compact_partition(conn: Connection, name: str, month: datetime, archive_dir: Path) -> int:
+    """
+    Archive one partition to `<name>.jsonl.gz` and drop it.
+
+    The archive is written to a temporary file and moved into place (or
+    appended to an existing archive for the month) before the partition is
+    dropped, so a failure never loses rows.
+
+    Returns:
+        Number of archived rows
+    """
+    table = partition_table(name)
+    path = _archive_path(archive_dir, month)
+    tmp_path = path.with_suffix(".tmp")
+
+    rows = conn.execution_options(stream_results=True, yield_per=1000).execute(
+        select(table).order_by(table.c.created_at, table.c.id)
+    )
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as handle:
+        count = _write_rows(handle, rows)
+    if path.exists():
+        with open(path, "ab") as archive, open(tmp_path, "rb") as part:
+            shutil.copyfileobj(part, archive)
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, path)
+
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(f"ALTER TABLE notification_log DETACH PARTITION {name}"))
+    conn.execute(text(f"DROP TABLE {name}"))
+    return count
+
+
+def compact_expired_rows(db_engine: Engine, cutoff: datetime, archive_dir: Path) -> int:
+    """
+    Archive and delete rows older than `cutoff` still in notification_log.
+
+    Covers an unpartitioned table (migration not applied), the PostgreSQL
+    default partition, and retention windows shorter than a month. Works in
+    short batches so each transaction holds its locks only briefly.
+
+    Returns:
+        Number of archived rows
+    """
+    total = 0
+    while True:
+        with db_engine.begin() as conn:
+            rows = conn.execute(
+                select(LIVE_TABLE)
+                .where(LIVE_TABLE.c.created_at < cutoff)
+                .order_by(LIVE_TABLE.c.created_at, LIVE_TABLE.c.id)
+                .limit(BATCH_SIZE)
+            ).all()
+            if not rows:
+                return total
+
+            by_month = {}
+            for row in rows:
+                by_month.setdefault(month_start(row.created_at), []).append(row)
+            for month, month_rows in by_month.items():
+                # Appending adds a gzip member; readers see one continuous stream
+                with gzip.open(_archive_path(archive_dir, month), "at", encoding="utf-8") as handle:
+                    _write_rows(handle, month_rows)
+
+            conn.execute(delete(LIVE_TABLE).where(LIVE_TABLE.c.id.in_([row.id for row in rows])))
+            total += len(rows)
+
+
+def run_notification_maintenance(
+    db_engine: Optional[Engine] = None,
+    now: Optional[datetime] = None
+) -> dict:
+    """
+    Create/roll partitions and compact those past the retention window.
+
+    Safe to run from several workers: the job lock lets only one of them
+    do the work.
+
+    Returns:
+        Summary counts for logging
+    """
+    db_engine = db_engine or engine
+    now = now or datetime.utcnow()
+    summary = {"rolled": 0, "compacted_partitions": 0, "archived_rows": 0}
+
+    with job_lock(db_engine, "notification_maintenance") as acquired:
+        if not acquired:
+            return summary
+
+        with db_engine.begin() as conn:
+            if is_partitioned(conn):
+                create_upcoming_partitions(conn, now)
+            elif conn.dialect.name == "sqlite":
+                summary["rolled"] = roll_sqlite_partitions(conn, now)
+
+        if retention_enabled():
+            cutoff = now - timedelta(days=settings.notification_retention_days)
+            archive_dir = Path(settings.notification_archive_dir)
+            archive_dir.mkdir(parents=True, exist_ok=True)
+
+            with db_engine.connect() as conn:
+                partitions = list_partitions(conn)
+            for name, month in partitions:
+                if next_month(month) <= cutoff:
+                    with db_engine.begin() as conn:
+                        summary["archived_rows"] += compact_partition(conn, name, month, archive_dir)
+                    summary["compacted_partitions"] += 1
+
+            summary["archived_rows"] += compact_expired_rows(db_engine, cutoff, archive_dir)
+
+    if any(summary.values()):
+        logger.info("Notification log maintenance: %s", summary)
+    return summary
+
+
+def retention_enabled() -> bool:
+    """
+    Whether expired rows are archived and dropped.
+
+    Needs both a retention period and an explicit archive directory, since
+    archived rows exist nowhere else.
+    """
+    return settings.notification_retention_days > 0 and bool(settings.notification_archive_dir)
+
+
+# Global maintenance job (None unless enabled in settings)
+_maintenance: Optional[PeriodicTask] = None
+
+
+async def start_notification_maintenance() -> None:
+    """Schedule partition maintenance and compaction according to settings."""
+    global _maintenance
+    if settings.notification_retention_days > 0 and not settings.notification_archive_dir:
+        logger.warning(
+            "NOTIFICATION_RETENTION_DAYS is set without NOTIFICATION_ARCHIVE_DIR; "
+            "notification logs are kept in the database"
+        )
+    if settings.notification_maintenance_interval_minutes > 0 and _maintenance is None:
+        _maintenance = PeriodicTask(
+            "notification_maintenance",
+            settings.notification_maintenance_interval_minutes * 60,
+            run_notification_maintenance
+        )
+        await _maintenance.start()
+
+
+async def stop_notification_maintenance() -> None:
+    global _maintenance
+    if _maintenance is not None:
+        await _maintenance.stop()
+        _maintenance = None
@@ -1,21 +1,33 @@
 """
-Notification service (STUB implementation).
+Notification service.
 
-Logs notifications without sending them.
-No real Twilio/email API calls at this stage.
+Logs every notification to notification_log and hands it to the background
+delivery engine when a provider (SMTP/Twilio) is configured for the recipient.
 """
 
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.periodic import job_lock
+from app.database import SessionLocal
 from app.models.notification import NotificationLog
+from app.models.request import Request
+from app.services.notification_coalescing import get_coalescer
+from app.services.notification_delivery import (
+    DeliveryJob,
+    channel_for_recipient,
+    get_delivery_engine,
+)
 
 
 class NotificationService:
     """
     Notification service abstraction.
     
-    This is a STUB implementation that only logs notifications.
-    Real API integration (Twilio, SendGrid, etc.) will be added later.
+    Notifications are always logged. Delivery happens asynchronously in the
+    delivery engine; without configured providers they are only logged.
     """
     
     def __init__(self, db: Session):
@@ -29,9 +41,13 @@ class NotificationService:
         subject: Optional[str] = None,
         trigger_entity_type: Optional[str] = None,
         trigger_entity_id: Optional[int] = None
-    ) -> NotificationLog:
+    ) -> Optional[NotificationLog]:
         """
-        Log a notification (stub - doesn't actually send).
+        Log a notification and queue it for delivery.
+        
+        When coalescing is enabled the notification is logged as "held"
+        for the coalescing window first, and a later notification for the
+        same recipient and entity supersedes it (status "merged").
         
         Args:
             notification_type: Type of notification
@@ -44,22 +60,71 @@ class NotificationService:
         Returns:
             NotificationLog record
         """
-        log = NotificationLog(
-            notification_type=notification_type,
-            recipient=recipient,
-            subject=subject,
-            message=message,
-            trigger_entity_type=trigger_entity_type,
-            trigger_entity_id=trigger_entity_id,
-            status="logged"  # Would be "sent" in real implementation
-        )
+        notification = {
+            "notification_type": notification_type,
+            "recipient": recipient,
+            "subject": subject,
+            "message": message,
+            "trigger_entity_type": trigger_entity_type,
+            "trigger_entity_id": trigger_entity_id,
+        }
         
+        coalescer = get_coalescer()
+        if coalescer is None or not coalescer.is_running:
+            return self._write_logs([notification])[0]
+        
+        # Persisted before holding, so a stop or crash mid-window loses nothing
+        log = NotificationLog(**notification, status="held")
         self.db.add(log)
         self.db.commit()
-        self.db.refresh(log)
-        
+        if not coalescer.offer(notification, log.id):
+            self._queue_logs([log])
         return log
     
+    def _write_logs(self, notifications: List[dict]) -> List[NotificationLog]:
+        """
+        Insert notification_log rows in one commit and queue them for delivery.
+        
+        Args:
+            notifications: Dicts of NotificationLog column values
+            
+        Returns:
+            Created NotificationLog records
+        """
+        logs = [NotificationLog(**notification) for notification in notifications]
+        self.db.add_all(logs)
+        self._queue_logs(logs)
+        return logs
+    
+    def _queue_logs(self, logs: List[NotificationLog]) -> None:
+        """Commit logs as queued (or just logged without a provider) and submit them for delivery."""
+        engine = get_delivery_engine()
+        
+        channels = []
+        for log in logs:
+            channel = channel_for_recipient(log.recipient)
+            deliverable = engine is not None and engine.accepts(channel)
+            channels.append(channel if deliverable else None)
+            log.status = "queued" if deliverable else "logged"
+        
+        self.db.commit()
+        
+        # Hand off to the engine; never waits on the provider
+        rejected = False
+        for log, channel in zip(logs, channels):
+            if channel and not engine.submit(DeliveryJob(
+                log_id=log.id,
+                channel=channel,
+                recipient=log.recipient,
+                subject=log.subject,
+                message=log.message
+            )):
+                log.status = "failed"
+                rejected = True
+        
+        if rejected:
+            self.db.commit()
+    
     def notify_request_created(
         self,
         request_id: int,
@@ -70,9 +135,9 @@ class NotificationService:
         """
         Notify when a new request is created.
         
-        In a real implementation, this would:
-        - Send email to employee confirming submission
-        - Notify HR staff of new request
+        Sends the employee a confirmation. HR gets a per-request message
+        unless digest mode is enabled, in which case new requests are
+        reported in the periodic HR digest instead.
         """
         # Employee notification
         employee_message = f"""
@@ -96,7 +161,10 @@ UAE HR Portal Team
             trigger_entity_id=request_id
         )
         
-        # HR notification (stub)
+        # HR notification (covered by the periodic digest in digest mode)
+        if settings.hr_digest_interval_minutes > 0:
+            return
+        
         hr_message = f"""
 New request submitted:
 
@@ -109,7 +177,7 @@ Review the request in the HR queue.
         
         self._log_notification(
             notification_type="request_created",
-            recipient="hr.team@company.ae",
+            recipient=settings.hr_notification_email,
             subject=f"New Request - {request_reference}",
             message=hr_message,
             trigger_entity_type="request",
@@ -128,7 +196,8 @@ Review the request in the HR queue.
         """
         Notify when request status changes.
         
-        In a real implementation, this would send SMS/email to employee.
+        Sends SMS/email to the employee. With coalescing enabled, rapid
+        successive transitions produce a single message with the latest status.
         """
         status_messages = {
             "reviewing": "Your request is now under review.",
@@ -159,31 +228,79 @@ New Status: {status_message}
             trigger_entity_type="request",
             trigger_entity_id=request_id
         )
-    
-def get_notification_service(db: Session) -> NotificationService:
-    """Get notification service instance."""
-    return NotificationService(db)
 
 
-def get_notification_logs(
-    db: Session,
-    notification_type: Optional[str] = None,
-    limit: int = 100
-):
+def send_hr_digest(db: Session, now: Optional[datetime] = None) -> Optional[NotificationLog]:
     """
-    Retrieve notification logs.
+    Send one HR digest covering requests submitted since the previous digest.
+    
+    The previous digest's log row is the watermark, so no extra state is
+    stored and workers that wake up just after another one sent the digest
+    find nothing new and skip.
     
     Args:
         db: Database session
-        notification_type: Optional filter by type
-        limit: Maximum number of records
+        now: Current time (defaults to utcnow)
         
     Returns:
-        List of notification logs
+        The digest NotificationLog, or None if there was nothing to report
     """
-    query = db.query(NotificationLog)
-    
-    if notification_type:
-        query = query.filter(NotificationLog.notification_type == notification_type)
+    now = now or datetime.utcnow()
     
-    return query.order_by(NotificationLog.created_at.desc()).limit(limit).all()
+    # Only one worker builds the digest at a time
+    with job_lock(db.get_bind(), "hr_digest") as acquired:
+        if not acquired:
+            return None
+        
+        since = db.query(func.max(NotificationLog.created_at)).filter(
+            NotificationLog.notification_type == "hr_digest"
+        ).scalar()
+        if since is None:
+            since = now - timedelta(minutes=settings.hr_digest_interval_minutes)
+        
+        new_requests = (
+            db.query(Request)
+            .filter(Request.created_at > since, Request.created_at <= now)
+            .order_by(Request.created_at)
+            .all()
+        )
+        if not new_requests:
+            db.rollback()
+            return None
+        
+        lines = [
+            f"- {r.reference}: {r.title} (submitted by {r.submitted_by})"
+            for r in new_requests
+        ]
+        message = (
+            f"{len(new_requests)} new request(s) submitted since {since:%Y-%m-%d %H:%M} UTC:\n\n"
+            + "\n".join(lines)
+            + "\n\nReview the requests in the HR queue."
+        )
+        
+        log = NotificationService(db)._write_logs([{
+            "notification_type": "hr_digest",
+            "recipient": settings.hr_notification_email,
+            "subject": f"HR Digest - {len(new_requests)} new request(s)",
+            "message": message,
+            "trigger_entity_type": None,
+            "trigger_entity_id": None,
+            # Exact watermark: the next digest starts where this query ended
+            "created_at": now,
+        }])[0]
+        
+        return log
+
+
+def run_hr_digest() -> None:
+    """Send the HR digest using a fresh session (scheduler entry point)."""
+    db = SessionLocal()
+    try:
+        send_hr_digest(db)
+    finally:
+        db.close()
+
+
+def get_notification_service(db: Session) -> NotificationService:
+    """Get notification service instance."""
+    return NotificationService(db)
@@ -0,0 +1,159 @@
+"""
+Notification status bookkeeping.
+
+Moves notification_log rows through their statuses outside the request
+path: delivery outcomes reported by the engine, coalesced notifications
+released when their window closes, and rows a stopped worker left held
+or queued.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import List
+from sqlalchemy import update
+from app.config import settings
+from app.database import SessionLocal
+from app.models.notification import NotificationLog
+from app.services.notification_delivery import DeliveryResult, get_delivery_engine
+from app.services.notification_service import NotificationService
+
+logger = logging.getLogger(__name__)
+
+
+def record_delivery_results(results: List[DeliveryResult]) -> None:
+    """
+    Persist delivery outcomes reported by the delivery engine.
+    
+    Called from a worker thread with batches of (log id, status, error);
+    applies them in a single bulk UPDATE. Failure reasons are kept in
+    status_detail for support.
+    """
+    for log_id, status, error in results:
+        if status == "failed":
+            logger.warning("Notification %s failed: %s", log_id, error)
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(NotificationLog),
+            [
+                {"id": log_id, "status": status, "status_detail": error[:500] if error else None}
+                for log_id, status, error in results
+            ]
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def release_held_notifications(groups: List[List[int]]) -> None:
+    """
+    Send held notifications whose coalescing window has closed.
+    
+    Called from a worker thread with the held log ids of each coalescing
+    key. The newest row of a key is queued for delivery and the others are
+    marked merged. Rows are claimed with a conditional UPDATE, so each one
+    is released once even if another worker recovers it at the same time.
+    """
+    latest = [max(ids) for ids in groups]
+    superseded = [log_id for ids in groups for log_id in ids if log_id != max(ids)]
+    db = SessionLocal()
+    try:
+        held = NotificationLog.status == "held"
+        if superseded:
+            db.execute(
+                update(NotificationLog)
+                .where(NotificationLog.id.in_(superseded), held)
+                .values(status="merged")
+                .execution_options(synchronize_session=False)
+            )
+        claimed = db.execute(
+            update(NotificationLog)
+            .where(NotificationLog.id.in_(latest), held)
+            .values(status="logged")
+            .returning(NotificationLog.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        logs = db.query(NotificationLog).filter(NotificationLog.id.in_(claimed)).all() if claimed else []
+        NotificationService(db)._queue_logs(logs)
+    finally:
+        db.close()
+
+
+def recover_held_notifications() -> int:
+    """
+    Release notifications held by a worker that stopped or crashed mid-window.
+    
+    Only rows held for longer than the coalescing window are taken, so a
+    running worker's pending notifications are left to it.
+    
+    Returns:
+        Number of notifications sent
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.notification_coalesce_window_seconds)
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(
+                NotificationLog.id,
+                NotificationLog.notification_type,
+                NotificationLog.recipient,
+                NotificationLog.trigger_entity_type,
+                NotificationLog.trigger_entity_id
+            )
+            .filter(NotificationLog.status == "held", NotificationLog.created_at < cutoff)
+            .all()
+        )
+    finally:
+        db.close()
+    
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row[1:]), []).append(row.id)
+    if groups:
+        release_held_notifications(list(groups.values()))
+        logger.info("Released %d held notifications left by a stopped worker", len(groups))
+    return len(groups)
+
+
+def requeue_stale_notifications() -> int:
+    """
+    Resubmit notifications a stopped or crashed worker left queued.
+    
+    The delivery queue lives in memory, so rows still "queued" after
+    `notification_requeue_after_seconds` were lost with their worker.
+    Each row is claimed once, by marking it in status_detail with a
+    conditional UPDATE, so workers starting together never both send it.
+    
+    Returns:
+        Number of notifications resubmitted
+    """
+    engine = get_delivery_engine()
+    if engine is None:
+        return 0
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.notification_requeue_after_seconds)
+    db = SessionLocal()
+    try:
+        stale = (
+            db.query(NotificationLog.id)
+            .filter(
+                NotificationLog.status == "queued",
+                NotificationLog.status_detail.is_(None),
+                NotificationLog.created_at < cutoff
+            )
+            .order_by(NotificationLog.id)
+            .limit(engine.queue_size // 2)
+        )
+        claimed = db.execute(
+            update(NotificationLog)
+            .where(NotificationLog.id.in_(stale.scalar_subquery()), NotificationLog.status_detail.is_(None))
+            .values(status_detail="Requeued after a worker restart")
+            .returning(NotificationLog.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        logs = db.query(NotificationLog).filter(NotificationLog.id.in_(claimed)).all() if claimed else []
+        NotificationService(db)._queue_logs(logs)
+    finally:
+        db.close()
+    if logs:
+        logger.info("Requeued %d notifications left by a stopped worker", len(logs))
+    return len(logs)
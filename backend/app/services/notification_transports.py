@@ -0,0 +1,219 @@
+"""
+Notification transports.
+
+Async provider clients used by the delivery engine:
+- SMTPTransport: pooled smtplib sessions, used from worker threads
+- TwilioSMSTransport: Twilio REST API over a keep-alive HTTP client
+"""
+
+import asyncio
+import logging
+import smtplib
+import ssl
+import threading
+import time
+from email.message import EmailMessage
+from typing import List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryError(Exception):
+    """Base class for delivery failures."""
+
+
+class TransientDeliveryError(DeliveryError):
+    """Failure that may succeed on retry (network errors, 4xx SMTP, HTTP 429/5xx)."""
+
+
+class PermanentDeliveryError(DeliveryError):
+    """Failure that will not succeed on retry (rejected recipient, bad request)."""
+
+
+def _delivery_error(error: Exception) -> DeliveryError:
+    """Map an smtplib/socket failure to a transient or permanent delivery error."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        # One recipient per message: use its reply
+        code, text = next(iter(error.recipients.values()))
+        error = smtplib.SMTPResponseException(code, text)
+    if isinstance(error, smtplib.SMTPResponseException):
+        text = error.smtp_error.decode("utf-8", "replace") if isinstance(error.smtp_error, bytes) else error.smtp_error
+        message = f"SMTP {error.smtp_code} {text}"
+        if 400 <= error.smtp_code < 500:
+            return TransientDeliveryError(message)
+        return PermanentDeliveryError(message)
+    if isinstance(error, smtplib.SMTPNotSupportedError):
+        return PermanentDeliveryError(f"SMTP server does not support a required extension: {error}")
+    return TransientDeliveryError(f"SMTP failed: {error}")
+
+
+class SMTPTransport:
+    """
+    Email transport backed by a pool of reusable smtplib sessions.
+
+    smtplib is blocking, so each session is used in a worker thread.
+    Sessions are kept open between sends and recycled after `max_idle`
+    seconds, so steady traffic pays the TCP/TLS/AUTH handshake once per
+    pooled connection rather than once per message.
+    """
+
+    channel = "email"
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 587,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        from_email: Optional[str] = None,
+        use_tls: bool = True,
+        pool_size: int = 4,
+        max_idle: float = 120.0,
+        timeout: float = 30.0
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.from_email = from_email or username
+        self.use_tls = use_tls
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(pool_size)
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []
+        self._idle_lock = threading.Lock()
+
+    async def send(self, recipient: str, subject: Optional[str], body: str) -> None:
+        message = EmailMessage()
+        message["From"] = self.from_email
+        message["To"] = recipient
+        message["Subject"] = subject or ""
+        message.set_content(body)
+
+        async with self._slots:
+            await asyncio.to_thread(self._send, message)
+
+    async def close(self) -> None:
+        with self._idle_lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            await asyncio.to_thread(self._quit, connection)
+
+    def _send(self, message: EmailMessage) -> None:
+        """Send over a pooled session (runs in a worker thread)."""
+        connection = self._acquire()
+        try:
+            connection.send_message(message)
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+            # smtplib reset the session, so it can be reused
+            self._release(connection)
+            raise _delivery_error(e) from e
+        except (smtplib.SMTPException, OSError) as e:
+            self._quit(connection)
+            raise _delivery_error(e) from e
+        self._release(connection)
+
+    def _acquire(self) -> smtplib.SMTP:
+        now = time.monotonic()
+        while True:
+            with self._idle_lock:
+                if not self._idle:
+                    break
+                connection, last_used = self._idle.pop()
+            if now - last_used < self.max_idle:
+                return connection
+            self._quit(connection)
+        try:
+            return self._connect()
+        except (smtplib.SMTPException, OSError) as e:
+            raise _delivery_error(e) from e
+
+    def _release(self, connection: smtplib.SMTP) -> None:
+        with self._idle_lock:
+            self._idle.append((connection, time.monotonic()))
+
+    def _connect(self) -> smtplib.SMTP:
+        """Open a session, negotiate TLS and authenticate."""
+        context = ssl.create_default_context()
+        if self.use_tls and self.port == 465:
+            connection = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout, context=context)
+        else:
+            connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls and self.port != 465:
+                connection.ehlo()
+                if not connection.has_extn("starttls"):
+                    # Never fall back to sending credentials and mail in clear text
+                    raise PermanentDeliveryError(
+                        f"SMTP server {self.host}:{self.port} does not offer STARTTLS"
+                    )
+                connection.starttls(context=context)
+            if self.username and self.password:
+                connection.login(self.username, self.password)
+        except BaseException:
+            self._quit(connection)
+            raise
+        return connection
+
+    @staticmethod
+    def _quit(connection: smtplib.SMTP) -> None:
+        """Send QUIT (best effort) and close the socket."""
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+
+
+class TwilioSMSTransport:
+    """
+    SMS transport using the Twilio Messages API.
+
+    A single httpx.AsyncClient is shared by all sends, keeping TLS
+    connections to the API alive between requests.
+    """
+
+    channel = "sms"
+
+    def __init__(
+        self,
+        account_sid: str,
+        auth_token: str,
+        from_number: str,
+        base_url: str = "https://api.twilio.com",
+        max_connections: int = 20,
+        timeout: float = 15.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.account_sid = account_sid
+        self.from_number = from_number
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            auth=(account_sid, auth_token),
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            transport=transport
+        )
+
+    async def send(self, recipient: str, subject: Optional[str], body: str) -> None:
+        try:
+            response = await self._client.post(
+                f"/2010-04-01/Accounts/{self.account_sid}/Messages.json",
+                data={"To": recipient, "From": self.from_number, "Body": body}
+            )
+        except httpx.HTTPError as e:
+            raise TransientDeliveryError(f"SMS request failed: {e}") from e
+
+        if response.status_code == 429 or response.status_code >= 500:
+            raise TransientDeliveryError(f"SMS provider returned {response.status_code}")
+        if response.status_code >= 400:
+            raise PermanentDeliveryError(
+                f"SMS provider rejected message ({response.status_code}): {response.text[:200]}"
+            )
+
+    async def close(self) -> None:
+        await self._client.aclose()
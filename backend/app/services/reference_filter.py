@@ -0,0 +1,128 @@
+"""
+In-memory membership filter for request references.
+
+References are REF-YYYY-NNN with NNN in 001-999, so the set of existing
+references fits in an exact 1000-bit bitmap per year (125 bytes). Public
+tracking consults it first and answers definite misses without a database
+query, which absorbs reference enumeration sweeps.
+
+The filter is rebuilt at startup, updated by this worker's creates and by
+request_created events from other workers. Numbers just above the highest
+known one for a year are always checked in the database, since another
+worker's newest requests may not have arrived yet.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.request import ArchivedRequest, Request
+from app.services.request_events import RequestEventBus
+
+logger = logging.getLogger(__name__)
+
+_REFERENCE = re.compile(r"^REF-(\d{4})-(\d{3})$")
+
+# Numbers this far above the highest known one may exist on another worker
+FRONTIER_MARGIN = 20
+
+
+class ReferenceFilter:
+    """Exact per-year bitmap of existing reference numbers."""
+
+    def __init__(self, frontier_margin: int = FRONTIER_MARGIN):
+        self.frontier_margin = frontier_margin
+        self.stats = {"checked": 0, "rejected": 0}
+        self._bitmaps: Dict[int, bytearray] = {}
+        self._highest: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._ready = False
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready
+
+    def add(self, reference: str) -> None:
+        """Record an existing reference."""
+        match = _REFERENCE.match(reference)
+        if not match:
+            return
+        year, number = int(match.group(1)), int(match.group(2))
+        with self._lock:
+            bitmap = self._bitmaps.setdefault(year, bytearray(125))
+            bitmap[number >> 3] |= 1 << (number & 7)
+            if number > self._highest.get(year, 0):
+                self._highest[year] = number
+
+    def might_exist(self, reference: str) -> bool:
+        """
+        False only if the reference definitely does not exist.
+
+        Before the filter is loaded every reference might exist.
+        """
+        if not self._ready:
+            return True
+        match = _REFERENCE.match(reference)
+        if not match:
+            return True
+        year, number = int(match.group(1)), int(match.group(2))
+        self.stats["checked"] += 1
+
+        bitmap = self._bitmaps.get(year)
+        if bitmap is not None and bitmap[number >> 3] & (1 << (number & 7)):
+            return True
+        # New references are issued above the highest one (current year, or
+        # the previous one around new year)
+        if year >= datetime.utcnow().year - 1 and number <= self._highest.get(year, 0) + self.frontier_margin:
+            return True
+        self.stats["rejected"] += 1
+        return False
+
+    def rebuild(self, db: Optional[Session] = None) -> int:
+        """
+        Load every live and archived reference (blocking).
+
+        Only adds, so creates racing with the load are never lost.
+
+        Returns:
+            Number of references loaded
+        """
+        own_session = db is None
+        db = db or SessionLocal()
+        loaded = 0
+        try:
+            for model in (Request, ArchivedRequest):
+                for (reference,) in db.query(model.reference).yield_per(5000):
+                    self.add(reference)
+                    loaded += 1
+        finally:
+            if own_session:
+                db.close()
+        self._ready = True
+        return loaded
+
+    def on_event(self, message: dict) -> None:
+        """Request event bus listener: learn references created by other workers."""
+        if message["event"] == "request_created":
+            self.add(message["data"]["reference"])
+
+
+reference_filter = ReferenceFilter()
+
+
+async def start_reference_filter(bus: Optional[RequestEventBus] = None) -> None:
+    """Load the filter and keep it current from the request event bus."""
+    if bus is not None:
+        bus.add_listener(reference_filter.on_event)
+    try:
+        loaded = await asyncio.to_thread(reference_filter.rebuild)
+        logger.info("Reference filter loaded with %d references", loaded)
+    except Exception as e:
+        # Without the filter every lookup simply goes to the database
+        logger.error("Failed to load reference filter: %s", e, exc_info=True)
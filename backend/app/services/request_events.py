@@ -0,0 +1,354 @@
+"""
+Request change feed.
+
+Request writes add a RequestEvent row in their own transaction. Each worker
+runs one RequestEventBus that fans those events out to in-process
+subscribers (SSE streams, long-poll tracking waiters):
+
+- Events written by this worker are delivered as soon as they commit.
+- Events from other workers are picked up from the request_events table,
+  woken by PostgreSQL LISTEN/NOTIFY or, on SQLite, by a short poll.
+
+Either way a single query per wake-up serves every subscriber, so idle
+subscribers cost no database work.
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, func, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import engine
+from app.models.request import Request, RequestEvent
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL NOTIFY channel announcing new request_events rows
+REQUEST_EVENTS_CHANNEL = "request_events"
+
+# Ids below the highest seen that are re-read on each poll, since concurrent
+# PostgreSQL transactions can commit ids out of order
+ID_LOOKBACK = 100
+
+# Most events replayed for a Last-Event-ID resume before asking for a refetch
+MAX_REPLAY = 1000
+
+EventMessage = Dict[str, object]
+
+
+def record_request_event(
+    db: Session,
+    event_type: str,
+    request: Request,
+    **extra
+) -> EventMessage:
+    """
+    Add a change event in the caller's transaction.
+
+    On PostgreSQL the NOTIFY is transactional too, so other workers are only
+    woken once the change commits. Call `announce` after committing.
+    """
+    db.flush()  # Fill in request defaults (updated_at) for the payload
+    payload = {
+        "reference": request.reference,
+        "status": request.status.value,
+        "updated_at": request.updated_at.isoformat() if request.updated_at else None,
+        **extra,
+    }
+    event = RequestEvent(
+        event_type=event_type,
+        reference=request.reference,
+        payload=json.dumps(payload),
+        created_at=datetime.utcnow()
+    )
+    db.add(event)
+    db.flush()
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(
+            text("SELECT pg_notify(:channel, :id)"),
+            {"channel": REQUEST_EVENTS_CHANNEL, "id": str(event.id)}
+        )
+    return {"id": event.id, "event": event_type, "data": payload}
+
+
+def to_message(event: RequestEvent) -> EventMessage:
+    return {"id": event.id, "event": event.event_type, "data": json.loads(event.payload)}
+
+
+def announce(message: EventMessage) -> None:
+    """Deliver a committed event to this worker's subscribers right away."""
+    bus = _bus
+    if bus is not None:
+        bus.publish_threadsafe(message)
+
+
+def fetch_events(db_engine: Engine, after_id: int, limit: int = MAX_REPLAY) -> List[EventMessage]:
+    """Read events with id > after_id, oldest first."""
+    with Session(db_engine) as db:
+        rows = (
+            db.query(RequestEvent)
+            .filter(RequestEvent.id > after_id)
+            .order_by(RequestEvent.id)
+            .limit(limit)
+            .all()
+        )
+        return [to_message(row) for row in rows]
+
+
+def prune_events(db_engine: Engine, now: Optional[datetime] = None) -> int:
+    """Delete events past the retention period."""
+    cutoff = (now or datetime.utcnow()) - timedelta(hours=settings.request_events_retention_hours)
+    with db_engine.begin() as conn:
+        result = conn.execute(delete(RequestEvent).where(RequestEvent.created_at < cutoff))
+    return result.rowcount
+
+
+class RequestEventBus:
+    """
+    Per-worker fan-out of request events.
+
+    Subscribers get a bounded asyncio.Queue; one that falls too far behind
+    receives None and is dropped (an SSE client then reconnects and resumes
+    with Last-Event-ID). Listeners are plain callbacks run on the event loop.
+    """
+
+    def __init__(
+        self,
+        db_engine: Engine,
+        poll_interval: float = 1.0,
+        queue_size: int = 1000
+    ):
+        self.db_engine = db_engine
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._listeners: List[Callable[[EventMessage], None]] = []
+        self._seen: Set[int] = set()
+        self._seen_order: deque = deque()
+        self._last_id = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._listen_thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def add_listener(self, callback: Callable[[EventMessage], None]) -> None:
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[EventMessage], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def publish_threadsafe(self, message: EventMessage) -> None:
+        """Dispatch a message from any thread (no-op when not running)."""
+        if self._loop is not None and self.is_running:
+            self._loop.call_soon_threadsafe(self._dispatch, message)
+
+    def replay(self, after_id: int) -> Tuple[List[EventMessage], bool]:
+        """
+        Events after `after_id` for a resuming client (blocking).
+
+        Returns:
+            (messages, complete); complete is False when events were pruned
+            or too many were missed, and the client should refetch state.
+        """
+        messages = fetch_events(self.db_engine, after_id, MAX_REPLAY + 1)
+        with Session(self.db_engine) as db:
+            oldest = db.query(func.min(RequestEvent.id)).scalar()
+        complete = len(messages) <= MAX_REPLAY and (oldest is None or oldest <= after_id + 1)
+        return messages[:MAX_REPLAY], complete
+
+    async def start(self) -> None:
+        if self.is_running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping.clear()
+        self._last_id = await asyncio.to_thread(self._max_id)
+
+        if self.db_engine.dialect.name == "postgresql":
+            self._listen_thread = threading.Thread(
+                target=self._listen, name="request-events-listen", daemon=True
+            )
+            self._listen_thread.start()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self.is_running:
+            return
+        self._stopping.set()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        for queue in list(self._subscribers):
+            self._close(queue)
+
+    def _max_id(self) -> int:
+        with Session(self.db_engine) as db:
+            return db.query(func.max(RequestEvent.id)).scalar() or 0
+
+    def _close(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    def _dispatch(self, message: EventMessage) -> None:
+        event_id = message["id"]
+        if event_id in self._seen:
+            return
+        self._seen.add(event_id)
+        self._seen_order.append(event_id)
+        while len(self._seen_order) > 10 * ID_LOOKBACK:
+            self._seen.discard(self._seen_order.popleft())
+        self._last_id = max(self._last_id, event_id)
+
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning("Dropping request event subscriber that fell behind")
+                self._close(queue)
+        for callback in list(self._listeners):
+            try:
+                callback(message)
+            except Exception as e:
+                logger.error("Request event listener failed: %s", e, exc_info=True)
+
+    async def _run(self) -> None:
+        # With LISTEN/NOTIFY the poll is only a safety net
+        interval = 30.0 if self._listen_thread else self.poll_interval
+        last_prune = 0.0
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                floor = max(0, self._last_id - ID_LOOKBACK)
+                for message in await asyncio.to_thread(fetch_events, self.db_engine, floor):
+                    self._dispatch(message)
+
+                now = self._loop.time()
+                if now - last_prune > 3600:
+                    last_prune = now
+                    await asyncio.to_thread(prune_events, self.db_engine)
+            except Exception as e:
+                logger.error("Failed to read request events: %s", e, exc_info=True)
+
+    def _listen(self) -> None:
+        """LISTEN on a dedicated connection and wake the bus on each NOTIFY."""
+        while not self._stopping.is_set():
+            raw = None
+            try:
+                raw = self.db_engine.raw_connection()
+                conn = raw.driver_connection
+                conn.autocommit = True
+                conn.cursor().execute(f"LISTEN {REQUEST_EVENTS_CHANNEL}")
+                while not self._stopping.is_set():
+                    if select.select([conn], [], [], 5)[0]:
+                        conn.poll()
+                        if conn.notifies:
+                            conn.notifies.clear()
+                            self._loop.call_soon_threadsafe(self._wakeup.set)
+            except Exception as e:
+                logger.warning("Request event listener disconnected, retrying: %s", e)
+                self._stopping.wait(5)
+            finally:
+                if raw is not None:
+                    # Never hand a LISTENing connection back to the pool
+                    raw.invalidate()
+
+
+def format_sse(message: EventMessage) -> str:
+    """Encode a message as a Server-Sent Events frame."""
+    return f"id: {message['id']}\nevent: {message['event']}\ndata: {json.dumps(message['data'])}\n\n"
+
+
+async def stream_events(
+    bus: RequestEventBus,
+    last_event_id: Optional[int] = None,
+    heartbeat: float = 15.0
+) -> AsyncIterator[str]:
+    """
+    SSE frames for one client: missed events (if resuming), then live ones.
+
+    Sends a comment line every `heartbeat` seconds so proxies keep the
+    connection open. Ends when the bus drops the subscriber.
+    """
+    queue = bus.subscribe()
+    try:
+        yield f"retry: {int(heartbeat * 1000)}\n\n"
+
+        replayed = 0
+        if last_event_id is not None:
+            messages, complete = await asyncio.to_thread(bus.replay, last_event_id)
+            if not complete:
+                yield "event: reset\ndata: {}\n\n"
+            for message in messages:
+                yield format_sse(message)
+            replayed = messages[-1]["id"] if messages else last_event_id
+
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if message is None:
+                return
+            if message["id"] <= replayed:
+                continue
+            yield format_sse(message)
+    finally:
+        bus.unsubscribe(queue)
+
+
+# Global bus for this worker
+_bus: Optional[RequestEventBus] = None
+
+
+def get_event_bus() -> Optional[RequestEventBus]:
+    """Get the running event bus, if started."""
+    return _bus
+
+
+async def start_request_events(db_engine: Optional[Engine] = None) -> RequestEventBus:
+    """Start this worker's event bus."""
+    global _bus
+    if _bus is None:
+        bus = RequestEventBus(db_engine or engine, settings.request_events_poll_seconds)
+        await bus.start()
+        _bus = bus
+    return _bus
+
+
+async def stop_request_events() -> None:
+    global _bus
+    if _bus is not None:
+        bus, _bus = _bus, None
+        await bus.stop()
@@ -4,12 +4,17 @@ Request service layer.
 Business logic for request management.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models.request import Request, RequestStatus
-from app.schemas.request import RequestCreate, RequestUpdate
+from sqlalchemy import case, func, insert, update
+from app.config import settings
+from app.models.request import ArchivedRequest, Request, RequestPriority, RequestStatus
+from app.schemas.request import RequestCreate, RequestResponse, RequestUpdate
 from app.services.notification_service import get_notification_service
+from app.services import analytics_service, idempotency_service, request_events, timeseries_service
+from app.services.reference_filter import reference_filter
+from app.services.result_cache import result_cache
 
 
 def generate_reference(db: Session) -> str:
@@ -24,10 +29,11 @@ def generate_reference(db: Session) -> str:
     """
     year = datetime.utcnow().year
     
-    # Get the count of requests for this year
-    count = db.query(func.count(Request.id)).filter(
-        Request.reference.like(f"REF-{year}-%")
-    ).scalar()
+    # Get the count of requests for this year (live and archived)
+    count = sum(
+        db.query(func.count(model.id)).filter(model.reference.like(f"REF-{year}-%")).scalar() or 0
+        for model in (Request, ArchivedRequest)
+    )
     
     # Generate next sequential number
     next_num = (count or 0) + 1
@@ -35,13 +41,49 @@ def generate_reference(db: Session) -> str:
     return f"REF-{year}-{next_num:03d}"
 
 
-def create_request(db: Session, request_data: RequestCreate) -> Request:
+class VersionConflict(Exception):
+    """The request was changed since the version the client read."""
+
+    def __init__(self, reference: str, current_version: int):
+        super().__init__(f"Request {reference} is at version {current_version}")
+        self.current_version = current_version
+
+
+class ConcurrentUpdate(Exception):
+    """An update without a version kept missing a request others were changing."""
+
+    def __init__(self, reference: str):
+        super().__init__(f"Request {reference} is being changed by someone else")
+
+
+def due_at_for(status: RequestStatus, entered_at: datetime) -> Optional[datetime]:
+    """SLA deadline for a status entered at `entered_at` (None without an SLA)."""
+    hours = settings.sla_hours_map.get(status.value)
+    return entered_at + timedelta(hours=hours) if hours is not None else None
+
+
+def _returning_request(row) -> Request:
+    """Detached Request built from an INSERT/UPDATE ... RETURNING row (no refresh query)."""
+    return Request(**row._mapping)
+
+
+def create_request(
+    db: Session,
+    request_data: RequestCreate,
+    idempotency_key: Optional[str] = None
+) -> Request:
     """
     Create a new request.
     
+    The row is written with INSERT ... RETURNING, so the stored values come
+    back without a refresh query.
+    
     Args:
         db: Database session
         request_data: Request creation data
+        idempotency_key: Key held by the caller; its response is stored in
+            the same transaction as the request, so a failure after the
+            commit can never lead a retry to create a duplicate
         
     Returns:
         Created request object
@@ -50,20 +92,42 @@ def create_request(db: Session, request_data: RequestCreate) -> Request:
     reference = generate_reference(db)
     
     # Create request
-    db_request = Request(
-        reference=reference,
-        title=request_data.title,
-        description=request_data.description,
-        submitted_by=request_data.submitted_by,
-        status=RequestStatus.SUBMITTED,
-        submitted_at=datetime.utcnow()
-    )
+    now = datetime.utcnow()
+    row = db.execute(
+        insert(Request)
+        .values(
+            reference=reference,
+            title=request_data.title,
+            description=request_data.description,
+            submitted_by=request_data.submitted_by,
+            status=RequestStatus.SUBMITTED,
+            submitted_at=now,
+            status_changed_at=now,
+            priority=RequestPriority.NORMAL,
+            due_at=due_at_for(RequestStatus.SUBMITTED, now),
+            created_at=now,
+            updated_at=now,
+            version=1
+        )
+        .returning(*Request.__table__.columns)
+    ).one()
+    db_request = _returning_request(row)
     
-    db.add(db_request)
+    timeseries_service.record_metric_event(db, "submitted", now)
+    event_message = request_events.record_request_event(
+        db, "request_created", db_request,
+        title=db_request.title,
+        submitted_by=db_request.submitted_by
+    )
+    if idempotency_key:
+        body = RequestResponse.model_validate(db_request).model_dump(mode="json")
+        idempotency_service.record_response(db, idempotency_key, 201, body)
     db.commit()
-    db.refresh(db_request)
+    result_cache.bump()
+    request_events.announce(event_message)
+    reference_filter.add(db_request.reference)
     
-    # Trigger notification (stub - just logs)
+    # Trigger notification (logged, delivered in the background)
     notification_service = get_notification_service(db)
     notification_service.notify_request_created(
         request_id=db_request.id,
@@ -75,70 +139,170 @@ def create_request(db: Session, request_data: RequestCreate) -> Request:
     return db_request
 
 
+def _status_update_statement(
+    reference: str,
+    update_data: RequestUpdate,
+    now: datetime,
+    expected_version: Optional[int] = None
+):
+    """
+    Build the single UPDATE ... RETURNING for a status/notes change.
+    
+    SET expressions see the row as it was, so a status change copies the
+    outgoing status and its start time into previous_status(_changed_at),
+    which RETURNING hands back with the new values.
+    """
+    values = {"updated_at": now, "version": Request.version + 1}
+    
+    if update_data.status:
+        # Validate status
+        try:
+            new_status = RequestStatus(update_data.status)
+        except ValueError:
+            raise ValueError(f"Invalid status: {update_data.status}")
+        
+        changed = Request.status != new_status
+        values.update(
+            status=new_status,
+            previous_status=case((changed, Request.status), else_=Request.previous_status),
+            previous_status_changed_at=case(
+                (changed, Request.status_changed_at), else_=Request.previous_status_changed_at
+            ),
+            status_changed_at=case((changed, now), else_=Request.status_changed_at),
+            due_at=case((changed, due_at_for(new_status, now)), else_=Request.due_at)
+        )
+        
+        # Set reviewed_at when status changes
+        if update_data.reviewed_by:
+            values["reviewed_at"] = now
+    
+    if update_data.priority is not None:
+        values["priority"] = RequestPriority[update_data.priority.upper()]
+    
+    if update_data.public_notes is not None:
+        values["public_notes"] = update_data.public_notes
+    
+    if update_data.internal_notes is not None:
+        values["internal_notes"] = update_data.internal_notes
+    
+    if update_data.reviewed_by:
+        values["reviewed_by"] = update_data.reviewed_by
+    
+    statement = (
+        update(Request)
+        .where(Request.reference == reference)
+        # Rows predating aging rollups are backfilled first (see below)
+        .where(Request.status_changed_at.isnot(None))
+    )
+    if expected_version is not None:
+        # Version check and bump in one statement: no row lock needed
+        statement = statement.where(Request.version == expected_version)
+    return (
+        statement
+        .values(**values)
+        .returning(*Request.__table__.columns)
+        .execution_options(synchronize_session=False)
+    )
+
+
 def update_request_status(
     db: Session,
     reference: str,
-    update_data: RequestUpdate
+    update_data: RequestUpdate,
+    expected_version: Optional[int] = None
 ) -> Request:
     """
     Update request status and related fields.
     
+    The change is one UPDATE ... RETURNING statement that also captures the
+    previous status, so there is no SELECT before it or refresh after it.
+    With expected_version the same statement only matches that version, so
+    concurrent edits cannot overwrite each other.
+    
     Args:
         db: Database session
         reference: Request reference (e.g., REF-2026-001)
         update_data: Update data
+        expected_version: Version the client last read, if it sent one
         
     Returns:
         Updated request object
         
     Raises:
         ValueError: If request not found
+        VersionConflict: If the request is no longer at expected_version
+        ConcurrentUpdate: If the update without expected_version still
+            missed after a retry
     """
-    # Find request
-    db_request = db.query(Request).filter(Request.reference == reference).first()
+    now = datetime.utcnow()
+    statement = _status_update_statement(reference, update_data, now, expected_version)
     
-    if not db_request:
-        raise ValueError(f"Request {reference} not found")
+    row = db.execute(statement).first()
+    for attempt in range(2):
+        if row is not None:
+            break
+        if attempt:
+            # Changed or archived by someone else since the lookup: retry once
+            db.rollback()
+        # Only misses pay for a lookup: not found, stale version or legacy row
+        current = db.query(Request).filter(Request.reference == reference).first()
+        if current is None:
+            raise ValueError(f"Request {reference} not found")
+        if expected_version is not None and current.version != expected_version:
+            raise VersionConflict(reference, current.version)
+        analytics_service.backfill_request_history(db, current)
+        db.flush()
+        row = db.execute(statement).first()
+    if row is None:
+        db.rollback()
+        current = db.query(Request).filter(Request.reference == reference).first()
+        if current is None:
+            raise ValueError(f"Request {reference} not found")
+        if expected_version is not None:
+            raise VersionConflict(reference, current.version)
+        raise ConcurrentUpdate(reference)
+    db_request = _returning_request(row)
     
-    old_status = db_request.status.value if db_request.status else None
+    status_changed = update_data.status is not None and db_request.status_changed_at == now
+    new_status = db_request.status.value
+    old_status = db_request.previous_status.value if status_changed else new_status
     
-    # Update fields
-    if update_data.status:
-        # Validate status
-        try:
-            new_status = RequestStatus(update_data.status)
-            db_request.status = new_status
-            
-            # Set reviewed_at when status changes
-            if update_data.reviewed_by:
-                db_request.reviewed_by = update_data.reviewed_by
-                db_request.reviewed_at = datetime.utcnow()
-        except ValueError:
-            raise ValueError(f"Invalid status: {update_data.status}")
-    
-    if update_data.public_notes is not None:
-        db_request.public_notes = update_data.public_notes
-    
-    if update_data.internal_notes is not None:
-        db_request.internal_notes = update_data.internal_notes
-    
-    if update_data.reviewed_by:
-        db_request.reviewed_by = update_data.reviewed_by
+    if status_changed:
+        # Aging rollup commits together with the status change
+        analytics_service.record_status_stint(
+            db,
+            old_status,
+            db_request.previous_status_changed_at,
+            now,
+            db_request.reviewed_by
+        )
+        if (
+            new_status in analytics_service.TERMINAL_STATUSES
+            and old_status not in analytics_service.TERMINAL_STATUSES
+        ):
+            timeseries_service.record_metric_event(db, "resolved", now)
     
-    db_request.updated_at = datetime.utcnow()
+    event_message = request_events.record_request_event(
+        db,
+        "status_changed" if status_changed else "request_updated",
+        db_request,
+        old_status=old_status,
+        reviewed_by=db_request.reviewed_by
+    )
     
     db.commit()
-    db.refresh(db_request)
+    result_cache.bump()
+    request_events.announce(event_message)
     
-    # Trigger notification if status changed (stub - just logs)
-    if update_data.status and old_status != update_data.status:
+    # Trigger notification if status changed (delivered in the background)
+    if status_changed:
         notification_service = get_notification_service(db)
         notification_service.notify_status_updated(
             request_id=db_request.id,
             request_reference=db_request.reference,
             submitted_by=db_request.submitted_by,
             old_status=old_status,
-            new_status=update_data.status,
+            new_status=new_status,
             public_notes=update_data.public_notes
         )
     
@@ -0,0 +1,107 @@
+"""
+HR delta sync.
+
+Lets HR clients fetch only the requests created, updated or removed since
+their last sync, using a cursor over (updated_at, id) for live requests and
+(deleted_at, id) for removal markers.
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_
+from app.config import settings
+from app.core.pagination import decode_sync_cursor, encode_sync_cursor
+from app.models.request import Request, RequestTombstone
+
+# Delta sync cursors never pass this far behind "now", so a write whose
+# transaction commits after a later one has already been synced is still
+# picked up (clients apply changes idempotently).
+CHANGE_CURSOR_SETTLE_SECONDS = 5
+
+
+def record_tombstone(db: Session, request: Request) -> None:
+    """Record a request's removal from the live table (in the caller's transaction)."""
+    db.add(RequestTombstone(
+        request_id=request.id,
+        reference=request.reference,
+        deleted_at=datetime.utcnow()
+    ))
+
+
+class ResyncRequired(Exception):
+    """The removals since a delta sync cursor have been pruned."""
+
+
+def get_request_changes(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Tuple[List[Request], List[RequestTombstone], str, bool]:
+    """
+    Requests created or updated after a change cursor, plus removals.
+    
+    Walks the (updated_at, id) index, so a sync costs the number of changes
+    rather than the size of the queue. Without a cursor the whole live table
+    is returned in pages, and no removals (the client has nothing to remove).
+    Changes and removals are paged separately, each up to `limit`.
+    
+    Args:
+        db: Database session
+        cursor: next_cursor from the previous sync
+        limit: Maximum number of changed requests, and of removals
+        
+    Returns:
+        (changed requests, tombstones, next_cursor, has_more)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+        ResyncRequired: If the cursor predates the tombstone retention
+    """
+    now = datetime.utcnow()
+    settled = now - timedelta(seconds=CHANGE_CURSOR_SETTLE_SECONDS)
+    if cursor:
+        since_key, deleted_key = decode_sync_cursor(cursor)
+        retention_days = settings.request_tombstone_retention_days
+        if retention_days > 0 and deleted_key[0] < now - timedelta(days=retention_days):
+            raise ResyncRequired()
+    else:
+        # Requests removed before the initial sync are simply not returned
+        since_key, deleted_key = (datetime.min, 0), (settled, 0)
+    
+    rows = (
+        db.query(Request)
+        .filter(or_(
+            Request.updated_at > since_key[0],
+            and_(Request.updated_at == since_key[0], Request.id > since_key[1])
+        ))
+        .order_by(Request.updated_at, Request.id)
+        .limit(limit + 1)
+        .all()
+    )
+    tombstones = (
+        db.query(RequestTombstone)
+        .filter(or_(
+            RequestTombstone.deleted_at > deleted_key[0],
+            and_(RequestTombstone.deleted_at == deleted_key[0], RequestTombstone.id > deleted_key[1])
+        ))
+        .order_by(RequestTombstone.deleted_at, RequestTombstone.id)
+        .limit(limit + 1)
+        .all()
+    )
+    # A removal is final and its request no longer listed, so the two
+    # streams need not advance together
+    has_more = len(rows) > limit or len(tombstones) > limit
+    
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_key = (rows[-1].updated_at, rows[-1].id)
+    else:
+        next_key = max(since_key, (settled, 0))
+    if len(tombstones) > limit:
+        tombstones = tombstones[:limit]
+        next_deleted_key = (tombstones[-1].deleted_at, tombstones[-1].id)
+    else:
+        next_deleted_key = max(deleted_key, (settled, 0))
+    
+    return rows, tombstones, encode_sync_cursor(next_key, next_deleted_key), has_more
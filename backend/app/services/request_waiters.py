@@ -0,0 +1,82 @@
+"""
+Long-poll waiters for public request tracking.
+
+A tracking request with `wait` registers a future for its reference and
+sleeps on it; the request event bus resolves it when any worker changes
+that request, so waiting costs no thread or query.
+"""
+
+import asyncio
+from typing import Dict, Optional, Set
+
+from app.services.request_events import EventMessage, RequestEventBus
+
+
+class ReferenceWaiters:
+    """
+    Long-poll waiters keyed by request reference.
+
+    Each waiter is a future on the event loop, resolved by the bus when an
+    event for its reference arrives; waiting uses no thread or query.
+    """
+
+    def __init__(self):
+        self._waiters: Dict[str, Set[asyncio.Future]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def register(self, reference: str) -> asyncio.Future:
+        """Register interest in a reference before checking its current state."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(reference, set()).add(future)
+        return future
+
+    def discard(self, reference: str, future: asyncio.Future) -> None:
+        waiters = self._waiters.get(reference)
+        if waiters is not None:
+            waiters.discard(future)
+            if not waiters:
+                del self._waiters[reference]
+
+    async def wait(self, reference: str, future: asyncio.Future, timeout: float) -> bool:
+        """Wait for a change to `reference`; returns False on timeout."""
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.discard(reference, future)
+
+    def notify(self, message: EventMessage) -> None:
+        """Bus listener: wake everyone waiting on the event's reference."""
+        for future in self._waiters.pop(message["data"]["reference"], ()):
+            if not future.done():
+                future.set_result(message)
+
+
+# Global waiter registry for this worker (None until started)
+_waiters: Optional[ReferenceWaiters] = None
+
+
+def get_waiters() -> Optional[ReferenceWaiters]:
+    """Get the long-poll waiter registry, if started."""
+    return _waiters
+
+
+async def start_request_waiters(bus: RequestEventBus) -> None:
+    """Wake long-poll waiters from this and every other worker's writes."""
+    global _waiters
+    if _waiters is None:
+        waiters = ReferenceWaiters()
+        bus.add_listener(waiters.notify)
+        _waiters = waiters
+
+
+async def stop_request_waiters(bus: Optional[RequestEventBus] = None) -> None:
+    global _waiters
+    if _waiters is not None:
+        if bus is not None:
+            bus.remove_listener(_waiters.notify)
+        _waiters = None
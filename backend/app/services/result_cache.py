@@ -0,0 +1,112 @@
+"""
+Versioned result cache for HR read endpoints.
+
+Responses are cached as serialized bytes under (endpoint parameters, data
+version). The data version is a counter bumped by every request write in
+this worker and by request events from other workers, so a cached entry
+is valid exactly until the next write, with no TTL. Entries of older
+versions are simply never hit again and age out of the LRU, which is
+bounded by total size.
+
+Only primary-backed reads are cached: a replica may still miss a write
+whose version bump has already happened. Clients that just wrote bypass
+the cache (see has_recent_write), since their write may have gone through
+a worker whose event has not reached this one yet.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.services.request_events import RequestEventBus
+
+
+class VersionedCache:
+    """Byte-bounded LRU of serialized results tagged with a data version."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.version = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._entries: "OrderedDict[Hashable, Tuple[int, bytes, str]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._enabled = False
+
+    def enabled_for(self, db: Session) -> bool:
+        """Whether reads through this session may be cached."""
+        return self._enabled and self.max_bytes > 0 and not db.info.get("replica")
+
+    def bump(self) -> None:
+        """Invalidate every cached result (call after a write commits)."""
+        with self._lock:
+            self.version += 1
+
+    def get(self, key: Hashable, version: int) -> Optional[Tuple[bytes, str]]:
+        """Cached (body, media_type) for key at version, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1], entry[2]
+
+    def put(self, key: Hashable, version: int, body: bytes, media_type: str) -> None:
+        """
+        Store a result computed from data at `version`.
+
+        Read the version before computing: a write that lands meanwhile
+        bumps it, and the stored entry is then never served.
+        """
+        if len(body) > self.max_bytes // 4:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[1])
+            self._entries[key] = (version, body, media_type)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, (_, evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries), "bytes": self._bytes, "version": self.version}
+
+    def on_event(self, message: dict) -> None:
+        """Request event bus listener: writes by any worker invalidate the cache."""
+        self.bump()
+
+    def start(self) -> None:
+        self._enabled = True
+
+    def stop(self) -> None:
+        self._enabled = False
+        self.clear()
+
+
+result_cache = VersionedCache(settings.result_cache_max_bytes)
+
+
+async def start_result_cache(bus: RequestEventBus) -> None:
+    """Enable the cache, invalidated by this and every other worker's writes."""
+    bus.add_listener(result_cache.on_event)
+    result_cache.start()
+
+
+async def stop_result_cache(bus: Optional[RequestEventBus] = None) -> None:
+    if bus is not None:
+        bus.remove_listener(result_cache.on_event)
+    result_cache.stop()
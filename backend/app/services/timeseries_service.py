@@ -0,0 +1,203 @@
+"""
+Time-series metrics.
+
+Counts request submissions and resolutions in hourly and daily buckets
+from the request write paths, so trend charts read a few hundred rows
+instead of scanning requests. Hourly buckets are pruned after
+`metrics_hourly_retention_days`; daily buckets are kept.
+"""
+
+import itertools
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.periodic import PeriodicTask, job_lock
+from app.database import SessionLocal
+from app.models.analytics import RequestMetricBucket
+from app.models.request import ArchivedRequest, Request
+from app.services.analytics_service import TERMINAL_STATUSES, upsert_increment
+
+TIMESERIES_METRICS = ("submitted", "resolved")
+
+# Longest range served per granularity (bounds the response to a few hundred points)
+TIMESERIES_MAX_RANGE = {
+    "hour": timedelta(days=31),
+    "day": timedelta(days=3660),
+}
+
+
+def truncate_to_bucket(value: datetime, granularity: str) -> datetime:
+    """Start of the hour/day bucket containing `value`."""
+    value = value.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        value = value.replace(hour=0)
+    return value
+
+
+def record_metric_event(db: Session, metric: str, at: datetime) -> None:
+    """
+    Count one event in its hourly and daily buckets.
+
+    Runs in the caller's transaction so the buckets commit with the write.
+    """
+    for granularity in TIMESERIES_MAX_RANGE:
+        upsert_increment(
+            db,
+            RequestMetricBucket,
+            keys={
+                "granularity": granularity,
+                "metric": metric,
+                "bucket_start": truncate_to_bucket(at, granularity),
+            },
+            increments={"count": 1}
+        )
+
+
+def prune_hourly_buckets(db: Session, now: Optional[datetime] = None) -> int:
+    """
+    Downsample: drop hourly buckets older than the retention period.
+
+    Daily buckets for the same period are already maintained on write.
+
+    Returns:
+        Number of deleted buckets
+    """
+    if settings.metrics_hourly_retention_days <= 0:
+        return 0
+    now = now or datetime.utcnow()
+    cutoff = truncate_to_bucket(now - timedelta(days=settings.metrics_hourly_retention_days), "day")
+    result = db.execute(
+        delete(RequestMetricBucket)
+        .where(RequestMetricBucket.granularity == "hour")
+        .where(RequestMetricBucket.bucket_start < cutoff)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def run_metric_pruning() -> int:
+    """Prune hourly buckets in a fresh session (periodic job entry point)."""
+    db = SessionLocal()
+    try:
+        with job_lock(db.get_bind(), "metric_pruning") as acquired:
+            return prune_hourly_buckets(db) if acquired else 0
+    finally:
+        db.close()
+
+
+# Global pruning job
+_pruning: Optional[PeriodicTask] = None
+
+
+async def start_metric_pruning() -> None:
+    """Schedule daily pruning of hourly time-series buckets."""
+    global _pruning
+    if settings.metrics_hourly_retention_days > 0 and _pruning is None:
+        _pruning = PeriodicTask("metric_pruning", 24 * 3600, run_metric_pruning)
+        await _pruning.start()
+
+
+async def stop_metric_pruning() -> None:
+    global _pruning
+    if _pruning is not None:
+        await _pruning.stop()
+        _pruning = None
+
+
+def rebuild_metric_buckets(db: Session, batch_size: int = 5000) -> int:
+    """
+    Recompute all time-series buckets from live and archived requests.
+
+    Resolution time is taken as status_changed_at (falling back to
+    reviewed_at) for requests in a terminal status. Hourly buckets are only
+    rebuilt within the hourly retention period.
+
+    Returns:
+        Number of requests scanned
+    """
+    hourly_cutoff = datetime.utcnow() - timedelta(days=settings.metrics_hourly_retention_days)
+    counts: Counter = Counter()
+    scanned = 0
+
+    rows = itertools.chain.from_iterable(
+        db.query(
+            model.created_at, model.status, model.status_changed_at, model.reviewed_at
+        ).yield_per(batch_size)
+        for model in (Request, ArchivedRequest)
+    )
+    for created_at, status, status_changed_at, reviewed_at in rows:
+        scanned += 1
+        events = [("submitted", created_at)]
+        resolved_at = status_changed_at or reviewed_at
+        if status.value in TERMINAL_STATUSES and resolved_at:
+            events.append(("resolved", resolved_at))
+        for metric, at in events:
+            counts[("day", metric, truncate_to_bucket(at, "day"))] += 1
+            if at >= hourly_cutoff:
+                counts[("hour", metric, truncate_to_bucket(at, "hour"))] += 1
+
+    db.execute(delete(RequestMetricBucket))
+    db.bulk_insert_mappings(RequestMetricBucket, [
+        {"granularity": granularity, "metric": metric, "bucket_start": start, "count": count}
+        for (granularity, metric, start), count in counts.items()
+    ])
+    db.commit()
+    return scanned
+
+
+def get_timeseries(
+    db: Session,
+    start: datetime,
+    end: datetime,
+    granularity: str = "day"
+) -> Dict[str, List[dict]]:
+    """
+    Submission and resolution counts per bucket in [start, end).
+
+    Reads at most a few hundred pre-aggregated buckets; empty buckets are
+    filled with zero so charts get a dense series.
+
+    Raises:
+        ValueError: If the granularity is unknown or the range too long
+    """
+    # Buckets are stored as naive UTC
+    start, end = (
+        value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+        for value in (start, end)
+    )
+    if granularity not in TIMESERIES_MAX_RANGE:
+        raise ValueError(f"Granularity must be one of: {', '.join(TIMESERIES_MAX_RANGE)}")
+    if end <= start:
+        raise ValueError("'to' must be after 'from'")
+    if end - start > TIMESERIES_MAX_RANGE[granularity]:
+        raise ValueError(
+            f"Range too long for {granularity} granularity "
+            f"(maximum {TIMESERIES_MAX_RANGE[granularity].days} days)"
+        )
+
+    first = truncate_to_bucket(start, granularity)
+    rows = (
+        db.query(RequestMetricBucket.metric, RequestMetricBucket.bucket_start, RequestMetricBucket.count)
+        .filter(RequestMetricBucket.granularity == granularity)
+        .filter(RequestMetricBucket.bucket_start >= first)
+        .filter(RequestMetricBucket.bucket_start < end)
+        .all()
+    )
+    counts = {(metric, bucket_start): count for metric, bucket_start, count in rows}
+
+    step = timedelta(hours=1) if granularity == "hour" else timedelta(days=1)
+    starts = []
+    current = first
+    while current < end:
+        starts.append(current)
+        current += step
+
+    return {
+        metric: [{"bucket_start": s, "count": counts.get((metric, s), 0)} for s in starts]
+        for metric in TIMESERIES_METRICS
+    }
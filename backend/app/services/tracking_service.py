@@ -4,11 +4,20 @@ Request tracking service.
 Public tracking functionality for employees (no authentication required).
 """
 
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
-from app.models.request import Request
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.singleflight import SingleFlight, bind_key
+from app.models.request import ArchivedRequest, Request
+from app.services import archive_service
+from app.services.result_cache import result_cache
 from app.schemas.tracking import RequestTrackingResponse, TimelineEvent
 
 
+# Identical concurrent lookups share one computation
+_flights = SingleFlight("tracking")
+
 # Friendly status labels
 STATUS_LABELS = {
     "submitted": "Submitted - Awaiting Review",
@@ -36,18 +45,42 @@ def get_request_tracking(db: Session, reference: str) -> RequestTrackingResponse
         db: Database session
         reference: Request reference (e.g., REF-2026-001)
         
+    Identical concurrent lookups (e.g. several pollers of one reference)
+    share one query.
+    
     Returns:
         Sanitized tracking response (no internal HR notes)
         
     Raises:
         ValueError: If request not found
     """
+    return _flights.do((bind_key(db), result_cache.version, "tracking", reference), lambda: _load_tracking(db, reference))
+
+
+def _load_tracking(db: Session, reference: str) -> RequestTrackingResponse:
     # Get request
     request = db.query(Request).filter(Request.reference == reference).first()
+    if not request:
+        # Closed requests move to the archive after a while
+        request = archive_service.get_archived_request(db, reference)
     
     if not request:
         raise ValueError(f"Request {reference} not found")
     
+    return build_tracking_response(request)
+
+
+def build_tracking_response(request: Request, include_description: bool = True) -> RequestTrackingResponse:
+    """
+    Build the employee-safe tracking projection of a request.
+    
+    Args:
+        request: Live or archived request
+        include_description: False leaves out the free-text description
+        
+    Returns:
+        Sanitized tracking response (no internal HR notes)
+    """
     # Build timeline
     timeline = []
     
@@ -74,7 +107,7 @@ def get_request_tracking(db: Session, reference: str) -> RequestTrackingResponse
     return RequestTrackingResponse(
         reference=request.reference,
         title=request.title,
-        description=request.description,
+        description=request.description if include_description else None,
         current_status=status_value,
         submitted_at=request.submitted_at,
         timeline=timeline,
@@ -82,3 +115,97 @@ def get_request_tracking(db: Session, reference: str) -> RequestTrackingResponse
         status_label=STATUS_LABELS.get(status_value, status_value),
         next_steps=NEXT_STEPS.get(status_value)
     )
+
+
+def owns_request(db: Session, submitted_by: str, reference: str) -> bool:
+    """
+    Whether a (live or archived) request with this reference was submitted by the employee.
+    
+    Knowing one of their references is the employee's proof of ownership
+    for listing their requests.
+    """
+    for model in (Request, ArchivedRequest):
+        found = (
+            db.query(model.id)
+            .filter(model.reference == reference, model.submitted_by == submitted_by)
+            .first()
+        )
+        if found is not None:
+            return True
+    return False
+
+
+def get_requests_by_employee(
+    db: Session,
+    submitted_by: str,
+    cursor: Optional[str] = None,
+    limit: int = 20
+) -> Tuple[List[RequestTrackingResponse], Optional[str]]:
+    """
+    List an employee's requests, newest first, with keyset pagination.
+    
+    Reads the (submitted_by, created_at) index of the live and archive
+    tables and merges the two pages. Descriptions are left out of the list;
+    tracking by reference returns them.
+    
+    Args:
+        db: Database session
+        submitted_by: Employee identifier
+        cursor: next_cursor from the previous page
+        limit: Page size
+        
+    Returns:
+        (tracking responses, next_cursor or None on the last page)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    rows = []
+    for model in (Request, ArchivedRequest):
+        query = db.query(model).filter(model.submitted_by == submitted_by)
+        if cursor:
+            created_at, row_id = decode_cursor(cursor)
+            query = query.filter(or_(
+                model.created_at < created_at,
+                and_(model.created_at == created_at, model.id < row_id)
+            ))
+        rows.extend(query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all())
+    
+    rows.sort(key=lambda row: (row.created_at, row.id), reverse=True)
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1].created_at, page[-1].id) if len(rows) > limit else None
+    return [build_tracking_response(row, include_description=False) for row in page], next_cursor
+
+
+def get_request_tracking_batch(
+    db: Session,
+    references: List[str]
+) -> Dict[str, Optional[RequestTrackingResponse]]:
+    """
+    Tracking information for several references at once.
+    
+    One IN (...) query on the live table, plus one on the archive for
+    references not found live.
+    
+    Args:
+        db: Database session
+        references: Validated request references
+        
+    Returns:
+        {reference: tracking response, or None if not found} (shared
+        between identical concurrent calls: do not modify)
+    """
+    key = (bind_key(db), result_cache.version, "tracking_batch", tuple(references))
+    return _flights.do(key, lambda: _load_tracking_batch(db, references))
+
+
+def _load_tracking_batch(db: Session, references: List[str]) -> Dict[str, Optional[RequestTrackingResponse]]:
+    results: Dict[str, Optional[RequestTrackingResponse]] = dict.fromkeys(references)
+    missing = list(results)
+    for model in (Request, ArchivedRequest):
+        if not missing:
+            break
+        for row in db.query(model).filter(model.reference.in_(missing)):
+            results[row.reference] = build_tracking_response(row)
+        missing = [reference for reference in missing if results[reference] is None]
+    return results
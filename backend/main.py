@@ -4,13 +4,37 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from app.database import engine, Base
+from app.database import engine, Base, mark_recent_write
 from app.config import settings
-from app.routers import requests, hr
+from app.routers import requests, hr, hr_stats
 from app.core.security_middleware import SecurityHeadersMiddleware
+from app.core.periodic import PeriodicTask
+from app.core.singleflight import single_flight_metrics
+from app.services.notification_delivery import start_delivery_engine, stop_delivery_engine
+from app.services.notification_coalescing import start_notification_batching, stop_notification_batching
+from app.services.notification_retention import start_notification_maintenance, stop_notification_maintenance
+from app.services.timeseries_service import start_metric_pruning, stop_metric_pruning
+from app.services.request_events import get_event_bus, start_request_events, stop_request_events
+from app.services.reference_filter import reference_filter, start_reference_filter
+from app.services.request_waiters import start_request_waiters, stop_request_waiters
+from app.services.result_cache import result_cache, start_result_cache, stop_result_cache
+from app.services.archive_service import start_request_archival, stop_request_archival
+from app.services.idempotency_service import start_idempotency_cleanup, stop_idempotency_cleanup
+from app.services.notification_service import run_hr_digest
+from app.services.notification_status import (
+    record_delivery_results,
+    recover_held_notifications,
+    release_held_notifications,
+    requeue_stale_notifications,
+)
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Import models to ensure they're registered with Base
-from app.models import request, notification
+from app.models import request, notification, analytics, idempotency
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -45,7 +69,8 @@ app.add_middleware(
     allow_origins=settings.cors_origins_list,  # Specific origins only
     allow_credentials=True,
     allow_methods=["GET", "POST", "PATCH", "DELETE", "OPTIONS"],  # Explicit methods
-    allow_headers=["Content-Type", "Authorization", "X-HR-API-Key"],  # Explicit headers
+    allow_headers=["Content-Type", "Authorization", "X-HR-API-Key", "Idempotency-Key", "If-Match"],  # Explicit headers
+    expose_headers=["ETag"],
     max_age=600,  # Cache preflight requests for 10 minutes
 )
 
@@ -58,6 +83,7 @@ app.add_middleware(TrustedHostMiddleware, allowed_hosts=trusted_hosts)
 # Include routers
 app.include_router(requests.router)
 app.include_router(hr.router)
+app.include_router(hr_stats.router)
 
 
 @app.middleware("http")
@@ -76,6 +102,23 @@ async def enforce_request_size_limit(request: Request, call_next):
     return await call_next(request)
 
 
+# POST endpoints that only read (not counted as writes for read-your-writes)
+READ_ONLY_POST_PATHS = {"/requests/track"}
+
+
+@app.middleware("http")
+async def track_recent_writes(request: Request, call_next):
+    """Route the client's reads to the primary for a short while after a successful write."""
+    response = await call_next(request)
+    if (
+        request.method in ("POST", "PATCH", "PUT", "DELETE")
+        and request.url.path not in READ_ONLY_POST_PATHS
+        and response.status_code < 400
+    ):
+        mark_recent_write(request, response)
+    return response
+
+
 @app.on_event("startup")
 async def validate_configuration():
     """
@@ -94,6 +137,13 @@ async def validate_configuration():
             "Set HR_API_KEY environment variable for production use."
         )
     
+    # Without a shared key, only the writing worker honours read-your-writes cookies
+    if not settings.secret_key and settings.read_your_writes_seconds > 0:
+        logger.warning(
+            "⚠️  SECRET_KEY is not configured! Read-your-writes cookies are signed with a "
+            "per-worker key. Set SECRET_KEY so every worker accepts them."
+        )
+    
     # Warn if using SQLite in non-debug mode
     if not settings.debug and "sqlite" in settings.database_url.lower():
         logger.warning(
@@ -115,6 +165,74 @@ async def validate_configuration():
     logger.info(f"✅ Debug mode: {settings.debug}")
 
 
+@app.on_event("startup")
+async def start_notification_delivery():
+    """Start the background notification delivery engine (if providers are configured)."""
+    await start_delivery_engine(on_results=record_delivery_results)
+    await start_notification_batching(
+        release=release_held_notifications,
+        send_digest=run_hr_digest
+    )
+    # Notifications a previous worker was still holding or delivering when it stopped
+    await asyncio.to_thread(recover_held_notifications)
+    await asyncio.to_thread(requeue_stale_notifications)
+    await start_notification_maintenance()
+
+
+@app.on_event("shutdown")
+async def stop_notification_delivery():
+    """Flush coalesced notifications and drain the delivery queue before the worker exits."""
+    await stop_notification_maintenance()
+    await stop_notification_batching()
+    await stop_delivery_engine()
+
+
+def log_read_metrics():
+    """Log this worker's read path counters (counts only, no request data)."""
+    logger.info(
+        "Read path metrics: tracking_filter=%s single_flight=%s result_cache=%s",
+        dict(reference_filter.stats), single_flight_metrics(), result_cache.metrics()
+    )
+
+
+read_metrics_task = PeriodicTask("read path metrics", 300, log_read_metrics)
+
+
+@app.on_event("startup")
+async def start_request_feed():
+    """Start this worker's request change feed, tracking waiters and filter, and the HR result cache."""
+    bus = await start_request_events()
+    await start_request_waiters(bus)
+    await start_result_cache(bus)
+    await start_reference_filter(bus)
+    await read_metrics_task.start()
+
+
+@app.on_event("shutdown")
+async def stop_request_feed():
+    """Close open event streams and drop cached HR results."""
+    await read_metrics_task.stop()
+    log_read_metrics()
+    await stop_result_cache(get_event_bus())
+    await stop_request_waiters(get_event_bus())
+    await stop_request_events()
+
+
+@app.on_event("startup")
+async def start_maintenance_jobs():
+    """Schedule periodic pruning and archival jobs."""
+    await start_metric_pruning()
+    await start_request_archival()
+    await start_idempotency_cleanup()
+
+
+@app.on_event("shutdown")
+async def stop_maintenance_jobs():
+    await stop_idempotency_cleanup()
+    await stop_request_archival()
+    await stop_metric_pruning()
+
+
 @app.get("/health")
 def health_check():
     """Health check endpoint for Azure App Service."""
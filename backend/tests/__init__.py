@@ -4,5 +4,18 @@ Tests for the HR Portal backend.
 Test structure:
 - test_security.py: Security features and headers
 - test_api.py: API endpoint functionality
+- test_delta_sync.py: HR delta sync of changed and removed requests
+- test_idempotency.py: Idempotency-Key replay on request creation
 - test_validation.py: Input validation and sanitization
+- test_notification_delivery.py: Notification transports and delivery engine
+- test_notification_coalescing.py: Notification coalescing and HR digest
+- test_notification_retention.py: notification_log partitioning and retention
+- test_database_routing.py: Read replica routing and read-your-writes
+- test_analytics.py: Analytics rollups and HR statistics endpoints
+- test_request_events.py: Request change feed and HR event stream
+- test_request_archive.py: Archival of closed requests
+- test_reference_filter.py: Tracking reference filter
+- test_hr_queue.py: HR queue filters, sorts and their index usage
+- test_singleflight.py: Coalescing of identical concurrent reads
+- test_result_cache.py: Versioned cache of HR queue pages and stats
 """
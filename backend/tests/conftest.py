@@ -8,7 +8,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.database import Base, get_db
+from app.database import Base, get_db, get_read_db
 
 # Import main after pytest is loaded (sys.modules check will detect pytest)
 from main import app
@@ -47,6 +47,7 @@ def client(db_session):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     
     with TestClient(app) as test_client:
         yield test_client
@@ -0,0 +1,221 @@
+"""Tests for analytics rollups and HR statistics endpoints."""
+
+from datetime import datetime, timedelta
+
+from app.models.request import Request, RequestStatus
+from app.services import analytics_service, timeseries_service
+
+
+def test_duration_buckets_are_within_ten_percent():
+    """Bucket midpoints approximate durations closely across the range."""
+    for seconds in (90, 3600, 26 * 3600, 30 * 86400):
+        midpoint = analytics_service.bucket_midpoint(analytics_service.duration_bucket(seconds))
+        assert abs(midpoint - seconds) / seconds < 0.1
+
+
+def test_aging_stats_from_status_transitions(client, hr_api_key):
+    """Status changes feed the aging rollup behind /hr/stats/aging."""
+    headers = {"X-HR-API-Key": hr_api_key}
+    for i in range(3):
+        reference = client.post("/requests", json={
+            "title": f"Aging Request {i}",
+            "submitted_by": f"aging{i}@company.ae"
+        }).json()["reference"]
+        client.patch(
+            f"/requests/{reference}/status",
+            json={"status": "reviewing", "reviewed_by": "hr.anna"},
+            headers=headers
+        )
+
+    response = client.get("/hr/stats/aging", headers=headers)
+    assert response.status_code == 200
+    submitted = response.json()["statuses"]["submitted"]
+    assert submitted["count"] == 3
+    assert submitted["sla_breaches"] == 0
+    assert submitted["p50_hours"] < 1
+
+    response = client.get("/hr/stats/aging?reviewer=someone.else", headers=headers)
+    assert response.json()["statuses"] == {}
+
+
+def test_backfill_aging_rollups(db_session):
+    """Backfill reconstructs pre-rollup history once and flags SLA breaches."""
+    submitted_at = datetime(2026, 3, 1, 9, 0)
+    db_session.add(Request(
+        reference="REF-2026-500",
+        title="Legacy Request",
+        submitted_by="legacy@company.ae",
+        status=RequestStatus.APPROVED,
+        submitted_at=submitted_at,
+        reviewed_by="hr.omar",
+        reviewed_at=submitted_at + timedelta(hours=30)
+    ))
+    db_session.commit()
+
+    assert analytics_service.backfill_aging_rollups(db_session) == 1
+    assert analytics_service.backfill_aging_rollups(db_session) == 0
+
+    stats = analytics_service.get_aging_stats(db_session, reviewer="hr.omar")
+    assert stats["submitted"]["count"] == 1
+    assert stats["submitted"]["sla_breaches"] == 1  # Default submitted SLA is 24h
+    assert 27 < stats["submitted"]["p50_hours"] < 33
+
+
+def test_status_update_of_legacy_request(db_session):
+    """A pre-rollup request is backfilled, then its stint recorded by the update."""
+    from app.schemas.request import RequestUpdate
+    from app.services import request_service
+
+    submitted_at = datetime.utcnow() - timedelta(hours=30)
+    db_session.add(Request(
+        reference="REF-2026-501",
+        title="Legacy Open Request",
+        submitted_by="legacy@company.ae",
+        status=RequestStatus.SUBMITTED,
+        submitted_at=submitted_at
+    ))
+    db_session.commit()
+
+    updated = request_service.update_request_status(
+        db_session, "REF-2026-501", RequestUpdate(status="approved", reviewed_by="hr.omar")
+    )
+    assert updated.status == RequestStatus.APPROVED
+    assert updated.previous_status == RequestStatus.SUBMITTED
+    assert updated.previous_status_changed_at == submitted_at
+
+    stats = analytics_service.get_aging_stats(db_session, reviewer="hr.omar")
+    assert stats["submitted"]["count"] == 1
+    assert stats["submitted"]["sla_breaches"] == 1
+
+
+def test_status_update_of_legacy_request_changed_concurrently(db_session, monkeypatch):
+    """A legacy request changed while being backfilled is a conflict, not a server error."""
+    import pytest
+    from sqlalchemy import update
+    from app.schemas.request import RequestUpdate
+    from app.services import request_service
+
+    db_session.add(Request(
+        reference="REF-2026-502",
+        title="Contended Legacy Request",
+        submitted_by="legacy@company.ae",
+        status=RequestStatus.SUBMITTED,
+        submitted_at=datetime.utcnow() - timedelta(hours=30)
+    ))
+    db_session.commit()
+
+    backfill = analytics_service.backfill_request_history
+
+    def backfill_then_concurrent_edit(db, request):
+        backfill(db, request)
+        db.execute(update(Request).where(Request.id == request.id).values(version=Request.version + 1))
+
+    monkeypatch.setattr(analytics_service, "backfill_request_history", backfill_then_concurrent_edit)
+    with pytest.raises(request_service.VersionConflict):
+        request_service.update_request_status(
+            db_session, "REF-2026-502", RequestUpdate(status="approved"), expected_version=1
+        )
+    assert db_session.query(Request).filter(Request.reference == "REF-2026-502").one().status == RequestStatus.SUBMITTED
+
+
+def test_unversioned_status_update_retries_after_concurrent_change(db_session, monkeypatch):
+    """Without a client version, a miss after backfilling is retried, not a conflict."""
+    from app.schemas.request import RequestUpdate
+    from app.services import request_service
+
+    db_session.add(Request(
+        reference="REF-2026-503",
+        title="Retried Legacy Request",
+        submitted_by="legacy@company.ae",
+        status=RequestStatus.SUBMITTED,
+        submitted_at=datetime.utcnow() - timedelta(hours=30)
+    ))
+    db_session.commit()
+
+    backfill = analytics_service.backfill_request_history
+    calls = []
+
+    def backfill_lost_on_first_attempt(db, request):
+        calls.append(request.reference)
+        if len(calls) > 1:
+            backfill(db, request)
+
+    monkeypatch.setattr(analytics_service, "backfill_request_history", backfill_lost_on_first_attempt)
+    updated = request_service.update_request_status(
+        db_session, "REF-2026-503", RequestUpdate(status="approved")
+    )
+    assert updated.status == RequestStatus.APPROVED
+    assert len(calls) == 2
+
+
+def test_timeseries_counts_submissions_and_resolutions(client, hr_api_key):
+    """Writes feed hourly/daily buckets behind /hr/stats/timeseries."""
+    headers = {"X-HR-API-Key": hr_api_key}
+    references = [
+        client.post("/requests", json={
+            "title": f"Series Request {i}",
+            "submitted_by": f"series{i}@company.ae"
+        }).json()["reference"]
+        for i in range(3)
+    ]
+    for new_status in ("reviewing", "rejected", "completed"):  # Only one resolution
+        client.patch(f"/requests/{references[0]}/status", json={"status": new_status}, headers=headers)
+
+    now = datetime.utcnow()
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    response = client.get("/hr/stats/timeseries", headers=headers, params={
+        "from": (day_start - timedelta(days=2)).isoformat(),
+        "to": (day_start + timedelta(days=1)).isoformat(),
+        "granularity": "day"
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert [point["count"] for point in data["submitted"]] == [0, 0, 3]
+    assert [point["count"] for point in data["resolved"]] == [0, 0, 1]
+
+    hour_start = now.replace(minute=0, second=0, microsecond=0)
+    response = client.get("/hr/stats/timeseries", headers=headers, params={
+        "from": (hour_start - timedelta(hours=5)).isoformat(),
+        "to": (hour_start + timedelta(hours=1)).isoformat(),
+        "granularity": "hour"
+    })
+    assert len(response.json()["submitted"]) == 6
+    # The writes may straddle an hour boundary
+    assert sum(point["count"] for point in response.json()["submitted"][-2:]) == 3
+
+
+def test_timeseries_rejects_oversized_hourly_range(client, hr_api_key):
+    """Hourly series are limited to 31 days."""
+    response = client.get(
+        "/hr/stats/timeseries",
+        headers={"X-HR-API-Key": hr_api_key},
+        params={"from": "2026-01-01T00:00:00", "to": "2026-03-01T00:00:00", "granularity": "hour"}
+    )
+    assert response.status_code == 400
+
+
+def test_prune_and_rebuild_metric_buckets(db_session):
+    """Hourly buckets past retention are pruned; rebuild restores buckets from requests."""
+    old = datetime.utcnow() - timedelta(days=90)
+    timeseries_service.record_metric_event(db_session, "submitted", old)
+    db_session.commit()
+
+    assert timeseries_service.prune_hourly_buckets(db_session) == 1
+    series = timeseries_service.get_timeseries(db_session, old - timedelta(days=1), old + timedelta(days=1))
+    assert sum(point["count"] for point in series["submitted"]) == 1
+
+    db_session.add(Request(
+        reference="REF-2026-501",
+        title="Rebuilt Request",
+        submitted_by="rebuild@company.ae",
+        status=RequestStatus.COMPLETED,
+        created_at=old,
+        submitted_at=old,
+        reviewed_at=old + timedelta(days=2)
+    ))
+    db_session.commit()
+
+    assert timeseries_service.rebuild_metric_buckets(db_session) == 1
+    series = timeseries_service.get_timeseries(db_session, old - timedelta(days=1), old + timedelta(days=5))
+    assert [point["count"] for point in series["submitted"]][1] == 1
+    assert [point["count"] for point in series["resolved"]][3] == 1
@@ -58,6 +58,47 @@ def test_update_request_status(client, hr_api_key):
     assert updated_data["public_notes"] == "Your request is under review"
 
 
+def test_update_request_status_version_check(client, hr_api_key):
+    """A change based on a stale version is rejected with 412."""
+    headers = {"X-HR-API-Key": hr_api_key}
+    created = client.post("/requests", json={
+        "title": "Salary Certificate",
+        "submitted_by": "sara@company.ae"
+    }).json()
+    assert created["version"] == 1
+    reference = created["reference"]
+
+    first = client.patch(
+        f"/requests/{reference}/status",
+        json={"status": "reviewing", "reviewed_by": "hr.anna"},
+        headers={**headers, "If-Match": '"1"'}
+    )
+    assert first.status_code == 200
+    assert first.json()["version"] == 2
+    assert first.headers["ETag"] == '"2"'
+
+    # A second editor still holding version 1 must not overwrite the change
+    stale = client.patch(
+        f"/requests/{reference}/status",
+        json={"status": "rejected", "reviewed_by": "hr.omar", "expected_version": 1},
+        headers=headers
+    )
+    assert stale.status_code == 412
+    assert stale.headers["ETag"] == '"2"'
+    assert client.get(f"/requests/{reference}").json()["current_status"] == "reviewing"
+
+    bad = client.patch(
+        f"/requests/{reference}/status",
+        json={"status": "approved"},
+        headers={**headers, "If-Match": "latest"}
+    )
+    assert bad.status_code == 400
+
+    # Unconditional updates still apply and bump the version
+    response = client.patch(f"/requests/{reference}/status", json={"status": "approved"}, headers=headers)
+    assert response.json()["version"] == 3
+
+
 def test_hr_queue_endpoint(client, hr_api_key):
     """Test HR queue endpoint returns all requests."""
     # Create multiple requests
@@ -136,6 +177,41 @@ def test_pagination_in_hr_queue(client, hr_api_key):
     assert response.status_code == 200
 
 
+def test_hr_queue_sort_by_priority_and_due(client, hr_api_key):
+    """Triage sorts list open requests by priority or SLA deadline."""
+    headers = {"X-HR-API-Key": hr_api_key}
+    references = [
+        client.post("/requests", json={"title": f"Triage {i}", "submitted_by": f"t{i}@company.ae"}).json()["reference"]
+        for i in range(4)
+    ]
+    client.patch(f"/requests/{references[0]}/status", json={"priority": "urgent"}, headers=headers)
+    # Reviewing has a 72h SLA, so this one is due last
+    client.patch(f"/requests/{references[1]}/status", json={"status": "reviewing"}, headers=headers)
+    client.patch(f"/requests/{references[2]}/status", json={"status": "completed"}, headers=headers)
+    
+    response = client.get("/hr/requests?sort=priority", headers=headers)
+    assert response.status_code == 200
+    items = response.json()
+    assert [item["reference"] for item in items] == [references[0], references[3], references[1]]
+    assert items[0]["priority"] == "urgent"
+    assert items[0]["due_at"] is not None
+    
+    items = client.get("/hr/requests?sort=due", headers=headers).json()
+    assert [item["reference"] for item in items] == [references[0], references[3], references[1]]
+    
+    items = client.get("/hr/requests?sort=created", headers=headers).json()
+    assert items[0]["reference"] == references[3]
+    assert len(items) == 4
+    
+    response = client.get("/hr/requests?sort=oldest", headers=headers)
+    assert response.status_code == 400
+    
+    # Closed requests are never in the triage order
+    for sort in ("priority", "due"):
+        response = client.get(f"/hr/requests?sort={sort}&status=completed", headers=headers)
+        assert response.status_code == 400
+
+
 def test_status_filter_in_hr_queue(client, hr_api_key):
     """Test status filtering in HR queue."""
     # Create a request and update its status
@@ -167,3 +243,114 @@ def test_status_filter_in_hr_queue(client, hr_api_key):
     # All returned requests should be approved
     for req in requests:
         assert req["status"] == "approved"
+
+
+def test_notification_log_endpoint_filters_and_paginates(client, hr_api_key):
+    """Test HR notification log search with filters and keyset pagination."""
+    references = []
+    for i in range(3):
+        response = client.post("/requests", json={
+            "title": f"Notify Request {i}",
+            "submitted_by": f"notify{i}@company.ae"
+        })
+        references.append(response.json())
+    
+    headers = {"X-HR-API-Key": hr_api_key}
+    
+    # Requires the API key
+    assert client.get("/hr/notifications").status_code == 401
+    
+    # Filter by recipient
+    response = client.get("/hr/notifications?recipient=notify1@company.ae", headers=headers)
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == 1
+    assert items[0]["trigger_entity_id"] == references[1]["id"]
+    
+    # Filter by trigger entity
+    response = client.get(
+        f"/hr/notifications?trigger_entity_type=request&trigger_entity_id={references[2]['id']}",
+        headers=headers
+    )
+    assert {item["recipient"] for item in response.json()["items"]} == {
+        "notify2@company.ae", "hr.team@company.ae"
+    }
+    
+    # Walk all pages with a page size of 2
+    seen = []
+    cursor = None
+    while True:
+        url = "/hr/notifications?notification_type=request_created&limit=2"
+        if cursor:
+            url += f"&cursor={cursor}"
+        page = client.get(url, headers=headers).json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == 6
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_notification_log_endpoint_rejects_bad_cursor(client, hr_api_key):
+    """Test that a malformed cursor is a client error."""
+    response = client.get(
+        "/hr/notifications?cursor=not-a-cursor",
+        headers={"X-HR-API-Key": hr_api_key}
+    )
+    assert response.status_code == 400
+
+
+def test_list_my_requests(client, db_session):
+    """Test listing an employee's requests with keyset pagination."""
+    from sqlalchemy import text
+    
+    mine = [
+        client.post("/requests", json={
+            "title": f"Mine {i}", "description": "Private details", "submitted_by": "me@company.ae"
+        }).json()["reference"]
+        for i in range(3)
+    ]
+    theirs = client.post("/requests", json={"title": "Theirs", "submitted_by": "other@company.ae"}).json()["reference"]
+    
+    url = f"/requests/mine?submitted_by=me@company.ae&reference={mine[0]}&limit=2"
+    page = client.get(url).json()
+    assert [item["title"] for item in page["items"]] == ["Mine 2", "Mine 1"]
+    assert "internal_notes" not in page["items"][0]
+    assert page["items"][0]["description"] is None
+    page = client.get(f"{url}&cursor={page['next_cursor']}").json()
+    assert [item["title"] for item in page["items"]] == ["Mine 0"]
+    assert page["next_cursor"] is None
+    
+    # An email alone, or with someone else's reference, lists nothing
+    assert client.get("/requests/mine?submitted_by=me@company.ae").status_code == 422
+    assert client.get(f"/requests/mine?submitted_by=me@company.ae&reference={theirs}").status_code == 404
+    assert client.get("/requests/mine?submitted_by=me@company.ae&reference=REF-2020-999").status_code == 404
+    
+    # Served by the composite index rather than a table scan
+    plan = db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT * FROM requests WHERE submitted_by = 'me@company.ae' "
+        "ORDER BY created_at DESC, id DESC"
+    )).fetchall()
+    assert any("ix_requests_submitted_by_created" in row[-1] for row in plan)
+
+
+def test_batch_tracking(client):
+    """Test tracking several references in one call."""
+    references = [
+        client.post("/requests", json={"title": f"Batch {i}", "submitted_by": "batch@company.ae"}).json()["reference"]
+        for i in range(2)
+    ]
+    
+    response = client.post("/requests/track", json={"references": references + ["REF-2020-999"]})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["results"][references[0]]["title"] == "Batch 0"
+    assert data["results"][references[1]]["current_status"] == "submitted"
+    assert data["results"]["REF-2020-999"] is None
+    assert data["not_found"] == ["REF-2020-999"]
+    
+    response = client.post("/requests/track", json={"references": ["not-a-ref"]})
+    assert response.status_code == 400
+    response = client.post("/requests/track", json={"references": [references[0]] * 51})
+    assert response.status_code == 422
@@ -0,0 +1,74 @@
+"""Tests for read replica routing and read-your-writes."""
+
+import time
+
+from fastapi import Request, Response
+
+import app.database as database
+from app.config import settings
+
+
+def _request(client_host="10.0.0.1", cookies=None):
+    headers = []
+    if cookies:
+        headers.append((b"cookie", "; ".join(f"{k}={v}" for k, v in cookies.items()).encode()))
+    return Request({"type": "http", "headers": headers, "client": (client_host, 1234)})
+
+
+def _read_session(request):
+    dependency = database.get_read_db(request)
+    db = next(dependency)
+    url = str(db.get_bind().url)
+    dependency.close()
+    return url
+
+
+def test_replica_set_fails_over_to_healthy_replica():
+    """An unreachable replica is skipped in favour of a healthy one."""
+    replicas = database.ReplicaSet(["sqlite:////nonexistent-dir/replica.db", "sqlite://"], retry_after=60)
+
+    for _ in range(3):
+        db = replicas.session()
+        assert str(db.get_bind().url) == "sqlite://"
+        db.close()
+
+
+def test_replica_set_returns_none_when_all_down():
+    """With every replica down the caller falls back to the primary."""
+    replicas = database.ReplicaSet(["sqlite:////nonexistent-dir/replica.db"])
+    assert replicas.session() is None
+
+
+def test_reads_use_primary_after_client_write(monkeypatch):
+    """Reads go to a replica, except within the read-your-writes window."""
+    monkeypatch.setattr(database, "replicas", database.ReplicaSet(["sqlite://"]))
+    monkeypatch.setattr(settings, "read_your_writes_seconds", 5)
+
+    assert _read_session(_request()) == "sqlite://"
+
+    response = Response()
+    database.mark_recent_write(_request(), response)
+    assert database.READ_YOUR_WRITES_COOKIE in response.headers["set-cookie"]
+
+    # The cookie pins the client on any worker, whatever its address
+    cookie = response.headers["set-cookie"].split(";")[0].split("=")[1]
+    assert _read_session(_request("10.0.0.2", {database.READ_YOUR_WRITES_COOKIE: cookie})) == database.DATABASE_URL
+
+    # Other clients behind the same proxy keep reading from the replica
+    assert _read_session(_request()) == "sqlite://"
+
+
+def test_read_your_writes_cookie_cannot_be_forged(monkeypatch):
+    """Unsigned, tampered or far-future cookies are ignored."""
+    monkeypatch.setattr(database, "replicas", database.ReplicaSet(["sqlite://"]))
+    monkeypatch.setattr(settings, "read_your_writes_seconds", 5)
+
+    far_future = int(time.time()) + 3600
+    forged = [
+        str(int(time.time()) + 5),
+        f"{far_future}.{'0' * 64}",
+        # Validly signed, but beyond the window
+        f"{far_future}.{database._sign_expiry(far_future)}",
+    ]
+    for cookie in forged:
+        assert _read_session(_request(cookies={database.READ_YOUR_WRITES_COOKIE: cookie})) == "sqlite://"
@@ -0,0 +1,86 @@
+"""Tests for HR delta sync."""
+
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.core.pagination import encode_cursor, encode_sync_cursor
+from app.models.request import Request, RequestTombstone
+from app.services import request_sync_service
+
+
+def test_request_delta_sync(client, hr_api_key, db_session, monkeypatch):
+    """Test delta sync returns only changes and removals after the cursor."""
+    monkeypatch.setattr(request_sync_service, "CHANGE_CURSOR_SETTLE_SECONDS", 0)
+    
+    headers = {"X-HR-API-Key": hr_api_key}
+    references = [
+        client.post("/requests", json={
+            "title": f"Sync Request {i}",
+            "submitted_by": f"sync{i}@company.ae"
+        }).json()["reference"]
+        for i in range(3)
+    ]
+    
+    # Initial sync in pages of 2
+    page = client.get("/hr/requests/changes?limit=2", headers=headers).json()
+    assert [item["reference"] for item in page["changes"]] == references[:2]
+    assert page["has_more"] is True
+    page = client.get(f"/hr/requests/changes?since={page['next_cursor']}", headers=headers).json()
+    assert [item["reference"] for item in page["changes"]] == references[2:]
+    assert page["has_more"] is False
+    cursor = page["next_cursor"]
+    
+    # Only the updated request and the removed one come back
+    client.patch(f"/requests/{references[1]}/status", json={"status": "reviewing"}, headers=headers)
+    removed = db_session.query(Request).filter(Request.reference == references[0]).one()
+    request_sync_service.record_tombstone(db_session, removed)
+    db_session.commit()
+    
+    page = client.get(f"/hr/requests/changes?since={cursor}", headers=headers).json()
+    assert [item["reference"] for item in page["changes"]] == [references[1]]
+    assert page["changes"][0]["status"] == "reviewing"
+    assert [item["reference"] for item in page["deleted"]] == [references[0]]
+    
+    response = client.get("/hr/requests/changes?since=bogus", headers=headers)
+    assert response.status_code == 400
+
+
+def test_request_delta_sync_bounds_removals(client, hr_api_key, db_session, monkeypatch):
+    """Removals are skipped on the initial sync, paged by limit, and expire into a resync."""
+    monkeypatch.setattr(request_sync_service, "CHANGE_CURSOR_SETTLE_SECONDS", 0)
+    
+    headers = {"X-HR-API-Key": hr_api_key}
+    client.post("/requests", json={"title": "Live Request", "submitted_by": "live@company.ae"})
+    old = datetime.utcnow() - timedelta(days=2)
+    db_session.add_all([
+        RequestTombstone(request_id=100 + i, reference=f"REF-2025-{i + 1:03d}", deleted_at=old)
+        for i in range(30)
+    ])
+    db_session.commit()
+    
+    page = client.get("/hr/requests/changes?limit=1", headers=headers).json()
+    assert len(page["changes"]) == 1
+    assert page["deleted"] == []
+    
+    # A sync from before the removals pages through them
+    cursor = encode_sync_cursor((datetime.utcnow(), 0), (old - timedelta(hours=1), 0))
+    seen = []
+    for _ in range(3):
+        page = client.get(f"/hr/requests/changes?since={cursor}&limit=20", headers=headers).json()
+        seen += [item["reference"] for item in page["deleted"]]
+        assert len(page["deleted"]) <= 20
+        cursor = page["next_cursor"]
+        if not page["has_more"]:
+            break
+    assert len(seen) == 30 and len(set(seen)) == 30
+    
+    # Removals older than the retention may be gone: the client must resync
+    monkeypatch.setattr(settings, "request_tombstone_retention_days", 1)
+    stale = encode_sync_cursor((old, 0), (old, 0))
+    page = client.get(f"/hr/requests/changes?since={stale}", headers=headers).json()
+    assert page["resync"] is True
+    assert page["changes"] == [] and page["next_cursor"] is None
+    
+    # Cursors from other listings are rejected, not reinterpreted
+    response = client.get(f"/hr/requests/changes?since={encode_cursor(old, 1)}", headers=headers)
+    assert response.status_code == 400
@@ -0,0 +1,277 @@
+"""Tests for HR queue filtering, sorting and their index usage."""
+
+from datetime import datetime, timedelta
+from itertools import combinations
+
+from sqlalchemy import text
+
+from app.models.request import Request
+from app.schemas.hr import HRRequestFilter
+from app.services import hr_service
+
+# Planner statistics for a grown requests table: rows, and distinct values
+# per column (anything not listed is close to unique)
+STATS_ROWS = 100000
+STATS_DISTINCT = {"status": 5, "priority": 4, "submitted_by": 5000, "reviewed_by": 50}
+
+
+def load_planner_stats(db):
+    """
+    Give SQLite's planner statistics of a large table.
+
+    Without them an empty test table makes every index look alike; with
+    them SQLite weighs selectivity much like PostgreSQL does in production.
+    """
+    db.execute(text("ANALYZE"))
+    db.execute(text("DELETE FROM sqlite_stat1"))
+    db.execute(
+        text("INSERT INTO sqlite_stat1 VALUES ('requests', NULL, :stat)"),
+        {"stat": str(STATS_ROWS)}
+    )
+    for index in Request.__table__.indexes:
+        # Partial triage indexes cover the open requests only
+        rows = STATS_ROWS * 3 // 5 if index.dialect_options["sqlite"]["where"] is not None else STATS_ROWS
+        stat, distinct = [rows], 1
+        for expression in index.expressions:
+            column = str(expression).split()[0].split(".")[-1]
+            distinct = min(rows, distinct * STATS_DISTINCT.get(column, rows))
+            stat.append(max(1, rows // distinct))
+        db.execute(
+            text("INSERT INTO sqlite_stat1 VALUES ('requests', :index, :stat)"),
+            {"index": index.name, "stat": " ".join(map(str, stat))}
+        )
+    db.commit()
+    # Reload the statistics
+    db.execute(text("ANALYZE sqlite_master"))
+
+
+def query_plan(db, filters):
+    statement = hr_service.build_hr_queue_query(db, filters).limit(filters.limit).statement
+    sql = statement.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    return [row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()]
+
+
+def test_every_filter_combination_uses_an_index(db_session):
+    """No filter combination or sort falls back to a table scan."""
+    load_planner_stats(db_session)
+    now = datetime(2026, 6, 1)
+    filters = {
+        "status": {"status": "reviewing"},
+        "submitted_by": {"submitted_by": "employee@company.ae"},
+        "reviewed_by": {"reviewed_by": "hr.anna"},
+        "submitted": {"submitted_from": now - timedelta(days=7), "submitted_to": now},
+        "updated": {"updated_from": now - timedelta(days=1), "updated_to": now},
+    }
+
+    for sort in hr_service.HR_QUEUE_SORTS:
+        for size in range(len(filters) + 1):
+            for names in combinations(filters, size):
+                params = {key: value for name in names for key, value in filters[name].items()}
+                plan = query_plan(db_session, HRRequestFilter(sort=sort, **params))
+                described = f"sort={sort} filters={names}: {plan}"
+
+                # Either an index search narrows the rows, or the page is read
+                # in order off an index and stops at the limit; SQLite may
+                # still order NULL due dates within a priority
+                access = plan[0]
+                assert access.startswith("SEARCH requests USING") or (
+                    access.startswith("SCAN requests USING INDEX")
+                    and "USE TEMP B-TREE FOR ORDER BY" not in plan
+                ), described
+
+
+def test_triage_sorts_read_partial_indexes(db_session):
+    """Unfiltered triage pages come straight off the partial indexes."""
+    load_planner_stats(db_session)
+    for sort, index in (("priority", "ix_requests_open_priority"), ("due", "ix_requests_open_due")):
+        plan = query_plan(db_session, HRRequestFilter(sort=sort))
+        assert plan[0] == f"SCAN requests USING INDEX {index}"
+
+
+def test_hr_queue_combined_filters(client, hr_api_key):
+    """Filters combine and ranges are validated."""
+    headers = {"X-HR-API-Key": hr_api_key}
+    references = [
+        client.post("/requests", json={
+            "title": f"Filtered {i}",
+            "submitted_by": "alice@company.ae" if i < 2 else "bob@company.ae"
+        }).json()["reference"]
+        for i in range(3)
+    ]
+    client.patch(
+        f"/requests/{references[0]}/status",
+        json={"status": "reviewing", "reviewed_by": "hr.anna"},
+        headers=headers
+    )
+    client.patch(
+        f"/requests/{references[2]}/status",
+        json={"status": "reviewing", "reviewed_by": "hr.anna"},
+        headers=headers
+    )
+
+    response = client.get(
+        "/hr/requests?submitted_by=alice@company.ae&reviewed_by=hr.anna&status=reviewing",
+        headers=headers
+    )
+    assert response.status_code == 200
+    assert [item["reference"] for item in response.json()] == [references[0]]
+
+    since = (datetime.utcnow() - timedelta(hours=1)).isoformat()
+    items = client.get(f"/hr/requests?submitted_by=alice@company.ae&updated_from={since}", headers=headers).json()
+    assert [item["reference"] for item in items] == [references[1], references[0]]
+
+    items = client.get(f"/hr/requests?submitted_to={since}", headers=headers).json()
+    assert items == []
+
+    response = client.get(
+        f"/hr/requests?submitted_from={since}&submitted_to={since}",
+        headers=headers
+    )
+    assert response.status_code == 400
+
+
+def test_hr_queue_facets(client, hr_api_key):
+    """Facet counts follow the active filters and cover more than the page."""
+    headers = {"X-HR-API-Key": hr_api_key}
+    references = [
+        client.post("/requests", json={"title": f"Faceted {i}", "submitted_by": "carol@company.ae"}).json()["reference"]
+        for i in range(4)
+    ]
+    client.post("/requests", json={"title": "Someone else", "submitted_by": "dave@company.ae"})
+    for reference, reviewer in zip(references[:3], ("hr.anna", "hr.anna", "hr.omar")):
+        client.patch(
+            f"/requests/{reference}/status",
+            json={"status": "reviewing", "reviewed_by": reviewer},
+            headers=headers
+        )
+
+    response = client.get(
+        "/hr/requests?submitted_by=carol@company.ae&facets=status,reviewed_by&limit=1",
+        headers=headers
+    )
+    assert response.status_code == 200
+    page = response.json()
+    assert len(page["items"]) == 1
+    statuses = {facet["value"]: facet["count"] for facet in page["facets"]["status"]}
+    assert statuses == {"submitted": 1, "reviewing": 3, "approved": 0, "completed": 0, "rejected": 0}
+    assert page["facets"]["reviewed_by"] == [
+        {"value": "hr.anna", "count": 2},
+        {"value": "hr.omar", "count": 1},
+        {"value": None, "count": 1},
+    ]
+
+    # Without facets the queue stays a plain list
+    assert isinstance(client.get("/hr/requests", headers=headers).json(), list)
+
+    response = client.get("/hr/requests?facets=title", headers=headers)
+    assert response.status_code == 400
+
+
+def test_hr_queue_sparse_fields(client, hr_api_key, db_session):
+    """A fieldset limits both the selected columns and the returned keys."""
+    from sqlalchemy import event
+
+    headers = {"X-HR-API-Key": hr_api_key}
+    client.post("/requests", json={
+        "title": "Sparse",
+        "description": "A long description the list view does not need",
+        "submitted_by": "erin@company.ae"
+    })
+
+    statements = []
+    engine = db_session.get_bind()
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/hr/requests?fields=title,status,priority,created_at", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    item = response.json()[0]
+    assert set(item) == {"id", "reference", "title", "status", "priority", "created_at"}
+    assert item["status"] == "submitted"
+    assert item["priority"] == "normal"
+    queue_query = next(statement for statement in statements if "FROM requests" in statement)
+    assert "description" not in queue_query and "internal_notes" not in queue_query
+
+    page = client.get("/hr/requests?fields=title&facets=status", headers=headers).json()
+    assert set(page["items"][0]) == {"id", "reference", "title"}
+    assert page["facets"]["status"][0] == {"value": "submitted", "count": 1}
+
+    response = client.get("/hr/requests?fields=title,password", headers=headers)
+    assert response.status_code == 400
+
+
+def test_hr_queue_msgpack_negotiation(client, hr_api_key):
+    """Accept: application/msgpack returns columnar MessagePack lists and stats."""
+    import msgpack
+
+    headers = {"X-HR-API-Key": hr_api_key}
+    reference = client.post("/requests", json={"title": "Packed", "submitted_by": "finn@company.ae"}).json()["reference"]
+
+    response = client.get("/hr/requests", headers={**headers, "Accept": "application/msgpack"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
+    page = msgpack.unpackb(response.content, timestamp=3)
+    assert page["columns"][:2] == ["id", "reference"]
+    row = dict(zip(page["columns"], page["rows"][0]))
+    assert row["reference"] == reference
+    assert row["status"] == "submitted"
+    assert row["created_at"].tzinfo is not None
+
+    response = client.get(
+        "/hr/requests?fields=title&facets=status",
+        headers={**headers, "Accept": "application/msgpack"}
+    )
+    page = msgpack.unpackb(response.content)
+    assert page["items"] == {"columns": ["id", "reference", "title"], "rows": [[1, reference, "Packed"]]}
+    assert page["facets"]["status"][0] == {"value": "submitted", "count": 1}
+
+    response = client.get("/hr/stats", headers={**headers, "Accept": "application/msgpack"})
+    assert msgpack.unpackb(response.content)["status_counts"]["submitted"] == 1
+
+    # JSON stays the default, and wins when preferred
+    for accept in ("*/*", "application/json, application/msgpack;q=0.5"):
+        response = client.get("/hr/stats", headers={**headers, "Accept": accept})
+        assert response.headers["content-type"] == "application/json"
+
+    # Every representation of a negotiated URL varies on Accept, cached or not
+    for url in ("/hr/requests", "/hr/requests?fields=title", "/hr/requests?offset=1", "/hr/dashboard", "/hr/stats"):
+        for _ in range(2):
+            response = client.get(url, headers=headers)
+            assert response.headers["content-type"] == "application/json"
+            assert response.headers["vary"] == "Accept", url
+
+
+def test_hr_dashboard(client, hr_api_key, db_session):
+    """One call returns every status tab's first page and the counts."""
+    from sqlalchemy import event
+
+    headers = {"X-HR-API-Key": hr_api_key}
+    references = [
+        client.post("/requests", json={"title": f"Dash {i}", "submitted_by": f"d{i}@company.ae"}).json()["reference"]
+        for i in range(4)
+    ]
+    client.patch(f"/requests/{references[0]}/status", json={"status": "approved"}, headers=headers)
+
+    statements = []
+    engine = db_session.get_bind()
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/hr/dashboard?limit=2", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    dashboard = response.json()
+    assert [item["reference"] for item in dashboard["tabs"]["submitted"]] == [references[3], references[2]]
+    assert [item["reference"] for item in dashboard["tabs"]["approved"]] == [references[0]]
+    assert dashboard["tabs"]["rejected"] == []
+    assert dashboard["status_counts"]["submitted"] == 3
+    assert dashboard["total"] == 4
+    # All tabs in one statement, counts in one grouped query per table
+    assert len(statements) == 3
+
+    assert client.get("/hr/dashboard").status_code == 401
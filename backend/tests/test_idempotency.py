@@ -0,0 +1,72 @@
+"""Tests for Idempotency-Key handling on POST /requests."""
+
+from datetime import datetime
+
+from app.config import settings
+from app.models.idempotency import IdempotencyKey
+from app.models.request import Request
+from app.schemas.request import RequestCreate
+from app.services import idempotency_service
+from app.services.notification_service import NotificationService
+
+
+def test_idempotency_key_replays_first_response(client, db_session):
+    """Test that retries with the same Idempotency-Key do not create duplicates."""
+    
+    request_data = {"title": "Retried Request", "submitted_by": "mobile@company.ae"}
+    headers = {"Idempotency-Key": "retry-key-1"}
+    
+    first = client.post("/requests", json=request_data, headers=headers)
+    retry = client.post("/requests", json=request_data, headers=headers)
+    
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert db_session.query(Request).count() == 1
+    
+    # Reusing the key for a different request is rejected
+    response = client.post("/requests", json={**request_data, "title": "Other"}, headers=headers)
+    assert response.status_code == 422
+
+
+def test_idempotency_key_survives_failure_after_commit(client, db_session, monkeypatch):
+    """Test that a failure after the request is committed does not let a retry duplicate it."""
+    
+    def fail(*args, **kwargs):
+        raise RuntimeError("notification backend down")
+    
+    monkeypatch.setattr(NotificationService, "notify_request_created", fail)
+    request_data = {"title": "Half Failed Request", "submitted_by": "mobile@company.ae"}
+    headers = {"Idempotency-Key": "after-commit-key"}
+    
+    first = client.post("/requests", json=request_data, headers=headers)
+    assert first.status_code == 500
+    
+    retry = client.post("/requests", json=request_data, headers=headers)
+    assert retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert db_session.query(Request).count() == 1
+
+
+def test_idempotency_key_in_flight_duplicate(client, db_session, monkeypatch):
+    """Test that a duplicate waits for an in-flight request and takes over an abandoned one."""
+    
+    request_data = {"title": "Concurrent Request", "submitted_by": "mobile@company.ae"}
+    db_session.add(IdempotencyKey(
+        key="in-flight-key",
+        fingerprint=idempotency_service.fingerprint(
+            "POST", "/requests", RequestCreate(**request_data).model_dump_json().encode()
+        ),
+        created_at=datetime.utcnow(),
+        locked_at=datetime.utcnow()
+    ))
+    db_session.commit()
+    
+    monkeypatch.setattr(settings, "idempotency_wait_seconds", 0.2)
+    response = client.post("/requests", json=request_data, headers={"Idempotency-Key": "in-flight-key"})
+    assert response.status_code == 409
+    
+    # Once the holder's lock times out, the next attempt performs the write
+    monkeypatch.setattr(settings, "idempotency_lock_timeout_seconds", 0)
+    response = client.post("/requests", json=request_data, headers={"Idempotency-Key": "in-flight-key"})
+    assert response.status_code == 201
@@ -0,0 +1,122 @@
+"""Tests for notification coalescing and the HR digest."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.notification import NotificationLog
+from app.models.request import Request, RequestStatus
+from app.services import notification_coalescing, notification_status
+from app.services.notification_coalescing import NotificationCoalescer
+from app.services.notification_service import NotificationService, send_hr_digest
+from app.services.notification_status import recover_held_notifications, release_held_notifications
+
+
+def _status_notification(status):
+    return {
+        "notification_type": "status_updated",
+        "recipient": "john.doe@company.ae",
+        "subject": "Request Update - REF-2026-001",
+        "message": f"New Status: {status}",
+        "trigger_entity_type": "request",
+        "trigger_entity_id": 1,
+    }
+
+
+def _held_statuses(db_session):
+    logs = db_session.query(NotificationLog).order_by(NotificationLog.id).all()
+    return [(log.trigger_entity_id, log.message, log.status) for log in logs]
+
+
+def test_coalescer_merges_updates_for_same_entity(db_session, monkeypatch):
+    """Rapid transitions for one request are held in the log and sent once, with the latest status."""
+    monkeypatch.setattr(notification_status, "SessionLocal", lambda: Session(db_session.get_bind()))
+    service = NotificationService(db_session)
+
+    async def run():
+        coalescer = NotificationCoalescer(0.1, release_held_notifications)
+        monkeypatch.setattr(notification_coalescing, "_coalescer", coalescer)
+        await coalescer.start()
+        for status in ("reviewing", "approved", "completed"):
+            assert service._log_notification(**_status_notification(status)).status == "held"
+        service._log_notification(**dict(_status_notification("reviewing"), trigger_entity_id=2))
+        # Already durable while the window is open
+        assert {status for _, _, status in _held_statuses(db_session)} == {"held"}
+        await asyncio.sleep(0.3)
+        await coalescer.stop()
+        return coalescer
+
+    coalescer = asyncio.run(run())
+
+    db_session.expire_all()
+    assert _held_statuses(db_session) == [
+        (1, "New Status: reviewing", "merged"),
+        (1, "New Status: approved", "merged"),
+        (1, "New Status: completed", "logged"),
+        (2, "New Status: reviewing", "logged"),
+    ]
+    assert coalescer.stats["merged"] == 2
+
+
+def test_coalescer_not_running_declines():
+    """Without a running coalescer, callers send immediately."""
+    coalescer = NotificationCoalescer(60, lambda batch: None)
+    assert coalescer.offer(_status_notification("reviewing"), 1) is False
+
+
+def test_notifications_held_by_a_stopped_worker_are_recovered(db_session, monkeypatch):
+    """Held rows older than the window are released on the next start."""
+    monkeypatch.setattr(notification_status, "SessionLocal", lambda: Session(db_session.get_bind()))
+    monkeypatch.setattr(settings, "notification_coalesce_window_seconds", 60)
+    old = datetime.utcnow() - timedelta(minutes=5)
+    db_session.add_all([
+        NotificationLog(**_status_notification(status), status="held", created_at=old)
+        for status in ("reviewing", "approved")
+    ] + [
+        # Still inside a running worker's window
+        NotificationLog(**dict(_status_notification("reviewing"), trigger_entity_id=2), status="held")
+    ])
+    db_session.commit()
+
+    assert recover_held_notifications() == 1
+    db_session.expire_all()
+    assert [status for _, _, status in _held_statuses(db_session)] == ["merged", "logged", "held"]
+    assert recover_held_notifications() == 0
+
+
+def test_hr_digest_replaces_per_request_email(client, db_session, monkeypatch):
+    """In digest mode new requests are reported once in a digest, not per request."""
+    monkeypatch.setattr(settings, "hr_digest_interval_minutes", 30)
+
+    for i in range(3):
+        response = client.post("/requests", json={
+            "title": f"Digest Request {i}",
+            "submitted_by": f"user{i}@company.ae"
+        })
+        assert response.status_code == 201
+
+    hr_logs = db_session.query(NotificationLog).filter(
+        NotificationLog.recipient == settings.hr_notification_email
+    ).all()
+    assert hr_logs == []
+
+    digest = send_hr_digest(db_session, now=datetime.utcnow() + timedelta(seconds=1))
+    assert digest.notification_type == "hr_digest"
+    assert "3 new request(s)" in digest.message
+
+    # Nothing new since the previous digest
+    assert send_hr_digest(db_session, now=datetime.utcnow() + timedelta(seconds=2)) is None
+
+    db_session.add(Request(
+        reference="REF-2026-900",
+        title="Late Request",
+        submitted_by="late@company.ae",
+        status=RequestStatus.SUBMITTED,
+        created_at=datetime.utcnow() + timedelta(seconds=3)
+    ))
+    db_session.commit()
+    digest = send_hr_digest(db_session, now=datetime.utcnow() + timedelta(seconds=4))
+    assert "REF-2026-900" in digest.message
+    assert "Digest Request" not in digest.message
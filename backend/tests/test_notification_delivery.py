@@ -0,0 +1,285 @@
+"""Tests for the notification delivery engine and transports."""
+
+import asyncio
+import socket
+
+import httpx
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.services.notification_delivery import (
+    CircuitBreaker,
+    DeliveryEngine,
+    DeliveryJob,
+    channel_for_recipient,
+)
+from app.services.notification_transports import (
+    PermanentDeliveryError,
+    SMTPTransport,
+    TransientDeliveryError,
+    TwilioSMSTransport,
+)
+
+
+class RecordingHandler:
+    """aiosmtpd handler that records messages and counts sessions."""
+
+    def __init__(self):
+        self.messages = []
+        self.connections = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        session.host_name = hostname
+        self.connections += 1
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("bounce"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((envelope.mail_from, envelope.rcpt_tos, envelope.content))
+        return "250 Message accepted"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    try:
+        yield handler, controller.port
+    finally:
+        controller.stop()
+
+
+def test_smtp_transport_reuses_pooled_connection(smtp_server):
+    """Several sends should share a single pooled SMTP session."""
+    handler, port = smtp_server
+
+    async def run():
+        transport = SMTPTransport("127.0.0.1", port, from_email="noreply@company.ae", use_tls=False, pool_size=1)
+        for i in range(3):
+            await transport.send(f"user{i}@company.ae", "Subject", "Body\n.leading dot")
+        await transport.close()
+
+    asyncio.run(run())
+
+    assert len(handler.messages) == 3
+    assert handler.connections == 1
+    assert b".leading dot" in handler.messages[0][2]
+
+
+def test_smtp_transport_rejected_recipient_is_permanent(smtp_server):
+    """A 5xx RCPT reply fails permanently and leaves the session usable."""
+    handler, port = smtp_server
+
+    async def run():
+        transport = SMTPTransport("127.0.0.1", port, from_email="noreply@company.ae", use_tls=False, pool_size=1)
+        with pytest.raises(PermanentDeliveryError):
+            await transport.send("bounce@company.ae", "Subject", "Body")
+        await transport.send("ok@company.ae", "Subject", "Body")
+        await transport.close()
+
+    asyncio.run(run())
+
+    assert [m[1] for m in handler.messages] == [["ok@company.ae"]]
+    assert handler.connections == 1
+
+
+def test_smtp_transport_refuses_credentials_without_tls(smtp_server):
+    """With TLS requested, a server that does not offer STARTTLS never sees AUTH."""
+    handler, port = smtp_server
+
+    async def run():
+        transport = SMTPTransport(
+            "127.0.0.1", port, username="noreply@company.ae", password="test-password", use_tls=True
+        )
+        with pytest.raises(PermanentDeliveryError, match="STARTTLS"):
+            await transport.send("ok@company.ae", "Subject", "Body")
+        await transport.close()
+
+    asyncio.run(run())
+
+    assert handler.messages == []
+
+
+def test_sms_transport_classifies_errors():
+    """HTTP 5xx is transient, other 4xx responses are permanent."""
+    responses = iter([500, 400, 201])
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(next(responses), json={})
+
+    async def run():
+        transport = TwilioSMSTransport("AC123", "token", "+971500000000", transport=httpx.MockTransport(handler))
+        with pytest.raises(TransientDeliveryError):
+            await transport.send("+971501234567", None, "Hello")
+        with pytest.raises(PermanentDeliveryError):
+            await transport.send("+971501234567", None, "Hello")
+        await transport.send("+971501234567", None, "Hello")
+        await transport.close()
+
+    asyncio.run(run())
+
+    assert seen[-1].url.path == "/2010-04-01/Accounts/AC123/Messages.json"
+    assert b"To=%2B971501234567" in seen[-1].content
+
+
+def test_engine_retries_transient_failures():
+    """Transient failures are retried until the provider accepts the message."""
+
+    class FlakyTransport:
+        channel = "email"
+
+        def __init__(self):
+            self.calls = 0
+
+        async def send(self, recipient, subject, body):
+            self.calls += 1
+            if self.calls < 3:
+                raise TransientDeliveryError("try again")
+
+        async def close(self):
+            pass
+
+    transport = FlakyTransport()
+    results = []
+
+    async def run():
+        engine = DeliveryEngine(
+            {"email": transport},
+            on_results=results.extend,
+            concurrency=2,
+            base_delay=0.01,
+            failure_threshold=10
+        )
+        await engine.start()
+        assert engine.submit(DeliveryJob(1, "email", "a@company.ae", "s", "m"))
+        await asyncio.sleep(0.2)
+        await engine.stop()
+
+    asyncio.run(run())
+
+    assert transport.calls == 3
+    assert results == [(1, "sent", None)]
+
+
+def test_failure_reasons_are_persisted(db_session, monkeypatch):
+    """Failed deliveries keep their reason in status_detail."""
+    from sqlalchemy.orm import Session
+
+    from app.models.notification import NotificationLog
+    from app.services import notification_status
+
+    for log_id in (1, 2):
+        db_session.add(NotificationLog(
+            id=log_id, notification_type="request_created", recipient="a@company.ae",
+            message="m", status="queued"
+        ))
+    db_session.commit()
+    monkeypatch.setattr(notification_status, "SessionLocal", lambda: Session(db_session.get_bind()))
+
+    notification_status.record_delivery_results([(1, "sent", None), (2, "failed", "550 mailbox unavailable")])
+
+    db_session.expire_all()
+    logs = db_session.query(NotificationLog).order_by(NotificationLog.id).all()
+    assert [(log.status, log.status_detail) for log in logs] == [
+        ("sent", None),
+        ("failed", "550 mailbox unavailable"),
+    ]
+
+
+def test_engine_skips_unconfigured_channel():
+    """Jobs for a channel without a transport are not accepted."""
+
+    async def run():
+        engine = DeliveryEngine({})
+        await engine.start()
+        accepted = engine.submit(DeliveryJob(1, "sms", "+971501234567", None, "m"))
+        await engine.stop()
+        return accepted
+
+    assert asyncio.run(run()) is False
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    """The breaker opens after repeated failures and allows one trial after the timeout."""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    now[0] = 11
+    assert breaker.allow()
+    assert not breaker.allow()  # Only one trial call while half-open
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_channel_for_recipient():
+    """Recipients are routed by address format."""
+    assert channel_for_recipient("john.doe@company.ae") == "email"
+    assert channel_for_recipient("+971501234567") == "sms"
+    assert channel_for_recipient("EMP-001") is None
+
+
+def test_stale_queued_notifications_are_requeued_once(db_session, monkeypatch):
+    """Rows a stopped worker left queued are delivered by the next start, once."""
+    from datetime import datetime, timedelta
+
+    from sqlalchemy.orm import Session
+
+    from app.models.notification import NotificationLog
+    from app.services import notification_delivery, notification_status
+
+    class RecordingTransport:
+        channel = "email"
+
+        def __init__(self):
+            self.sent = []
+
+        async def send(self, recipient, subject, body):
+            self.sent.append(recipient)
+
+        async def close(self):
+            pass
+
+    old = datetime.utcnow() - timedelta(hours=1)
+    db_session.add_all([
+        NotificationLog(notification_type="status_updated", recipient="lost@company.ae",
+                        message="m", status="queued", created_at=old),
+        # Still in a running worker's queue
+        NotificationLog(notification_type="status_updated", recipient="live@company.ae",
+                        message="m", status="queued"),
+    ])
+    db_session.commit()
+    monkeypatch.setattr(notification_status, "SessionLocal", lambda: Session(db_session.get_bind()))
+    transport = RecordingTransport()
+    results = []
+
+    async def run():
+        engine = DeliveryEngine({"email": transport}, on_results=results.extend, concurrency=1)
+        monkeypatch.setattr(notification_delivery, "_engine", engine)
+        await engine.start()
+        requeued = [await asyncio.to_thread(notification_status.requeue_stale_notifications) for _ in range(2)]
+        await engine.stop()
+        return requeued
+
+    assert asyncio.run(run()) == [1, 0]
+    assert transport.sent == ["lost@company.ae"]
+    assert [status for _, status, _ in results] == ["sent"]
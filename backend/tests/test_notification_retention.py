@@ -0,0 +1,90 @@
+"""Tests for notification_log partitioning and retention."""
+
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import inspect, text
+
+from app.config import settings
+from app.models.notification import NotificationLog
+from app.services.notification_retention import list_partitions, run_notification_maintenance
+from app.services.notification_log_search import get_notification_logs
+
+
+@pytest.fixture(autouse=True)
+def drop_rolled_tables(db_session):
+    """Rolled tables are not part of the ORM metadata; drop them after each test."""
+    yield
+    with db_session.get_bind().begin() as conn:
+        for name, _ in list_partitions(conn):
+            conn.execute(text(f"DROP TABLE {name}"))
+
+
+def _add_logs(db_session, *timestamps):
+    for i, created_at in enumerate(timestamps):
+        db_session.add(NotificationLog(
+            notification_type="status_updated" if i % 2 else "request_created",
+            recipient=f"user{i}@company.ae",
+            message=f"Message {i}",
+            created_at=created_at
+        ))
+    db_session.commit()
+
+
+def test_maintenance_rolls_and_compacts_partitions(db_session, monkeypatch, tmp_path):
+    """Old months move to rolled tables; months past retention are archived and dropped."""
+    monkeypatch.setattr(settings, "notification_retention_days", 60)
+    monkeypatch.setattr(settings, "notification_archive_dir", str(tmp_path))
+    _add_logs(
+        db_session,
+        datetime(2026, 6, 10), datetime(2026, 6, 20),   # Past retention
+        datetime(2026, 9, 5),                           # Rolled, still retained
+        datetime(2026, 10, 1), datetime(2026, 10, 15)   # Current month
+    )
+    bind = db_session.get_bind()
+
+    summary = run_notification_maintenance(db_engine=bind, now=datetime(2026, 10, 19))
+
+    assert summary["rolled"] == 3
+    assert summary["compacted_partitions"] == 1
+    assert summary["archived_rows"] == 2
+
+    tables = inspect(bind).get_table_names()
+    assert "notification_log_p2026_09" in tables
+    assert "notification_log_p2026_06" not in tables
+    assert db_session.query(NotificationLog).count() == 2
+
+    with gzip.open(tmp_path / "notification_log_p2026_06.jsonl.gz", "rt") as handle:
+        archived = [json.loads(line) for line in handle]
+    assert [row["message"] for row in archived] == ["Message 0", "Message 1"]
+
+    # Reads continue into rolled tables, newest first
+    logs = get_notification_logs(db_session, limit=10)
+    assert [log.message for log in logs] == ["Message 4", "Message 3", "Message 2"]
+    logs = get_notification_logs(db_session, notification_type="request_created", limit=10)
+    assert [log.message for log in logs] == ["Message 4", "Message 2"]
+
+
+def test_maintenance_without_retention_keeps_rows(db_session, monkeypatch):
+    """With retention disabled nothing is archived."""
+    monkeypatch.setattr(settings, "notification_retention_days", 0)
+    _add_logs(db_session, datetime(2020, 1, 1))
+
+    summary = run_notification_maintenance(db_engine=db_session.get_bind(), now=datetime(2026, 10, 19))
+
+    assert summary["archived_rows"] == 0
+    assert len(get_notification_logs(db_session)) == 1
+
+
+def test_maintenance_without_archive_dir_keeps_rows(db_session, monkeypatch):
+    """Retention does nothing until an archive directory is configured."""
+    monkeypatch.setattr(settings, "notification_retention_days", 60)
+    monkeypatch.setattr(settings, "notification_archive_dir", None)
+    _add_logs(db_session, datetime(2020, 1, 1))
+
+    summary = run_notification_maintenance(db_engine=db_session.get_bind(), now=datetime(2026, 10, 19))
+
+    assert summary["archived_rows"] == 0
+    assert len(get_notification_logs(db_session)) == 1
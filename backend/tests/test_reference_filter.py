@@ -0,0 +1,38 @@
+"""Tests for the tracking reference filter."""
+
+from datetime import datetime
+
+from app.services import tracking_service
+from app.services.reference_filter import ReferenceFilter
+
+
+def test_filter_is_exact_below_the_frontier():
+    """Known references pass; gaps and other years are rejected; the frontier is checked."""
+    reference_filter = ReferenceFilter(frontier_margin=5)
+    assert reference_filter.might_exist("REF-2019-001")  # Not loaded yet
+
+    for number in (1, 2, 4):
+        reference_filter.add(f"REF-2019-{number:03d}")
+    reference_filter._ready = True
+
+    assert reference_filter.might_exist("REF-2019-002")
+    assert not reference_filter.might_exist("REF-2019-003")
+    assert not reference_filter.might_exist("REF-2019-500")
+    assert not reference_filter.might_exist("REF-2018-001")
+    assert reference_filter.stats["rejected"] == 3
+
+    # Requests for this year may have just been created on another worker
+    year = datetime.utcnow().year
+    assert reference_filter.might_exist(f"REF-{year}-003")
+    reference_filter.on_event({"event": "request_created", "data": {"reference": f"REF-{year}-400"}})
+    assert reference_filter.might_exist(f"REF-{year}-400")
+
+
+def test_tracking_miss_is_answered_without_database(client, monkeypatch):
+    """Enumeration misses get a 404 from the filter alone."""
+    def no_query(*args, **kwargs):
+        raise AssertionError("database should not be queried")
+    monkeypatch.setattr(tracking_service, "get_request_tracking", no_query)
+
+    response = client.get("/requests/REF-2019-777")
+    assert response.status_code == 404
@@ -0,0 +1,91 @@
+"""Tests for archival of closed requests."""
+
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.models.request import ArchivedRequest, Request, RequestTombstone
+from app.services.archive_service import archive_closed_requests, prune_tombstones
+
+
+def test_closed_requests_move_to_archive_and_stay_trackable(client, hr_api_key, db_session, monkeypatch):
+    """Old closed requests leave the live table but remain visible to tracking and stats."""
+    monkeypatch.setattr(settings, "request_archive_after_days", 30)
+    headers = {"X-HR-API-Key": hr_api_key}
+    references = [
+        client.post("/requests", json={
+            "title": f"Archive Request {i}",
+            "submitted_by": f"archive{i}@company.ae"
+        }).json()["reference"]
+        for i in range(4)
+    ]
+    for reference, new_status in zip(references, ("completed", "rejected", "reviewing")):
+        client.patch(f"/requests/{reference}/status", json={"status": new_status}, headers=headers)
+    db_session.query(Request).update({Request.updated_at: datetime.utcnow() - timedelta(days=60)})
+    db_session.commit()
+
+    # Batches of one still archive everything eligible
+    assert archive_closed_requests(db_engine=db_session.get_bind(), batch_size=1) == 2
+
+    live = {row.reference for row in db_session.query(Request)}
+    assert live == set(references[2:])
+    assert db_session.query(ArchivedRequest).count() == 2
+    assert db_session.query(RequestTombstone).count() == 2
+
+    response = client.get(f"/requests/{references[0]}")
+    assert response.status_code == 200
+    assert response.json()["current_status"] == "completed"
+
+    stats = client.get("/hr/stats", headers=headers).json()
+    assert stats["status_counts"]["completed"] == 1
+    assert stats["total"] == 4
+
+    # New references continue after archived ones
+    created = client.post("/requests", json={"title": "After Archive", "submitted_by": "new@company.ae"})
+    assert created.json()["reference"] not in references
+
+
+def test_archival_disabled_by_setting(db_session, monkeypatch):
+    """A zero retention keeps closed requests live."""
+    monkeypatch.setattr(settings, "request_archive_after_days", 0)
+    assert archive_closed_requests(db_engine=db_session.get_bind()) == 0
+
+
+def test_old_tombstones_are_pruned(db_session, monkeypatch):
+    """Tombstones past the delta sync retention are deleted."""
+    monkeypatch.setattr(settings, "request_tombstone_retention_days", 30)
+    now = datetime.utcnow()
+    db_session.add_all([
+        RequestTombstone(request_id=1, reference="REF-2025-001", deleted_at=now - timedelta(days=31)),
+        RequestTombstone(request_id=2, reference="REF-2025-002", deleted_at=now - timedelta(days=1)),
+    ])
+    db_session.commit()
+
+    assert prune_tombstones(db_engine=db_session.get_bind(), now=now) == 1
+    assert [row.reference for row in db_session.query(RequestTombstone)] == ["REF-2025-002"]
+
+
+def test_archival_runs_in_one_worker_at_a_time(monkeypatch, tmp_path):
+    """While another worker holds the archival lock, archival skips the run."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from app.core.periodic import job_lock
+    from app.models.request import RequestStatus
+
+    monkeypatch.setattr(settings, "request_archive_after_days", 30)
+    db_engine = create_engine(f"sqlite:///{tmp_path / 'workers.db'}")
+    Request.metadata.create_all(db_engine)
+    old = datetime.utcnow() - timedelta(days=60)
+    with Session(db_engine) as db:
+        db.add_all([
+            Request(reference=f"REF-2026-90{i}", title="Closed", submitted_by="lock@company.ae",
+                    status=RequestStatus.COMPLETED, updated_at=old)
+            for i in range(2)
+        ])
+        db.commit()
+
+    with job_lock(db_engine, "request_archival") as acquired:
+        assert acquired
+        with job_lock(db_engine, "request_archival") as other:
+            assert not other
+        assert archive_closed_requests(db_engine=db_engine) == 0
+    assert archive_closed_requests(db_engine=db_engine) == 1
@@ -0,0 +1,129 @@
+"""Tests for the request change feed and HR event stream."""
+
+import asyncio
+import threading
+import time
+
+from app.schemas.request import RequestCreate, RequestUpdate
+from app.services import request_service
+from app.services.request_events import RequestEventBus, stream_events
+
+
+def _create(db_session, i=0):
+    return request_service.create_request(db_session, RequestCreate(
+        title=f"Event Request {i}",
+        submitted_by=f"events{i}@company.ae"
+    ))
+
+
+def test_bus_delivers_events_written_by_other_workers(db_session):
+    """Events committed elsewhere reach subscribers through the table poll."""
+    async def scenario():
+        bus = RequestEventBus(db_session.get_bind(), poll_interval=0.05)
+        await bus.start()
+        queue = bus.subscribe()
+        try:
+            # Not announced on this bus, as if written by another worker
+            created = await asyncio.to_thread(_create, db_session)
+            await asyncio.to_thread(
+                request_service.update_request_status,
+                db_session, created.reference, RequestUpdate(status="reviewing")
+            )
+            first = await asyncio.wait_for(queue.get(), 2)
+            second = await asyncio.wait_for(queue.get(), 2)
+            return first, second
+        finally:
+            await bus.stop()
+
+    first, second = asyncio.run(scenario())
+    assert first["event"] == "request_created"
+    assert second["event"] == "status_changed"
+    assert second["data"]["old_status"] == "submitted"
+    assert second["data"]["status"] == "reviewing"
+    assert second["id"] > first["id"]
+
+
+def test_stream_resumes_after_last_event_id(db_session):
+    """A reconnecting client gets the events it missed, then heartbeats."""
+    for i in range(3):
+        _create(db_session, i)
+
+    async def scenario():
+        bus = RequestEventBus(db_session.get_bind(), poll_interval=60)
+        await bus.start()
+        frames = []
+        stream = stream_events(bus, last_event_id=1, heartbeat=0.05)
+        try:
+            async for frame in stream:
+                frames.append(frame)
+                if frame.startswith(":"):
+                    break
+        finally:
+            await stream.aclose()
+            await bus.stop()
+        return frames
+
+    frames = asyncio.run(scenario())
+    assert frames[0].startswith("retry:")
+    assert [f.split("\n")[0] for f in frames[1:3]] == ["id: 2", "id: 3"]
+    assert "event: request_created" in frames[1]
+    assert frames[3] == ": keep-alive\n\n"
+
+
+def test_events_endpoint_rejects_invalid_last_event_id(client, hr_api_key):
+    """Last-Event-ID must be a numeric event id."""
+    response = client.get(
+        "/hr/events",
+        headers={"X-HR-API-Key": hr_api_key, "Last-Event-ID": "abc"}
+    )
+    assert response.status_code == 400
+
+
+def test_tracking_long_poll_returns_on_status_change(client, hr_api_key):
+    """A waiting tracker is answered as soon as HR changes the request."""
+    created = client.post("/requests", json={
+        "title": "Long Poll Request",
+        "submitted_by": "waiting@company.ae"
+    }).json()
+    since = client.get(f"/requests/{created['reference']}").json()["last_updated"]
+
+    result = {}
+    waiter = threading.Thread(target=lambda: result.update(response=client.get(
+        f"/requests/{created['reference']}", params={"wait": 10, "since": since}
+    )))
+    started = time.monotonic()
+    waiter.start()
+    time.sleep(0.2)
+    client.patch(
+        f"/requests/{created['reference']}/status",
+        json={"status": "reviewing"},
+        headers={"X-HR-API-Key": hr_api_key}
+    )
+    waiter.join(5)
+
+    assert time.monotonic() - started < 5
+    assert result["response"].status_code == 200
+    assert result["response"].json()["current_status"] == "reviewing"
+
+
+def test_tracking_long_poll_times_out_with_304(client):
+    """Without a change the long-poll ends with 304 Not Modified."""
+    created = client.post("/requests", json={
+        "title": "Quiet Request",
+        "submitted_by": "quiet@company.ae"
+    }).json()
+    since = client.get(f"/requests/{created['reference']}").json()["last_updated"]
+
+    response = client.get(f"/requests/{created['reference']}", params={"wait": 1, "since": since})
+    assert response.status_code == 304
+
+    # A stale `since` returns the current state immediately
+    response = client.get(
+        f"/requests/{created['reference']}",
+        params={"wait": 10, "since": "2020-01-01T00:00:00"}
+    )
+    assert response.status_code == 200
+
+    # Waiting without `since` is rejected rather than answered immediately
+    response = client.get(f"/requests/{created['reference']}", params={"wait": 10})
+    assert response.status_code == 400
@@ -0,0 +1,128 @@
+"""Tests for the versioned HR result cache."""
+
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app import database
+from app.config import settings
+from app.models.request import Request
+from app.services.result_cache import VersionedCache, result_cache
+
+
+def record_statements(engine):
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", record)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", record)
+
+
+def test_entries_expire_with_the_version_and_evict_by_size():
+    """A bump invalidates everything; the least recently used entries go first."""
+    cache = VersionedCache(max_bytes=400)
+    cache.put("a", cache.version, b"x" * 100, "application/json")
+    assert cache.get("a", cache.version) == (b"x" * 100, "application/json")
+
+    cache.bump()
+    assert cache.get("a", cache.version) is None
+
+    for key in ("a", "b", "c", "d"):
+        cache.put(key, cache.version, b"x" * 100, "application/json")
+    cache.get("a", cache.version)
+    cache.put("e", cache.version, b"x" * 100, "application/json")
+    assert cache.get("b", cache.version) is None
+    assert cache.get("a", cache.version) is not None
+    assert cache.metrics()["bytes"] == 400
+    assert cache.metrics()["evictions"] == 1
+
+    # Results too large to be worth holding are not stored
+    cache.put("big", cache.version, b"x" * 101, "application/json")
+    assert cache.get("big", cache.version) is None
+
+
+def test_repeat_polls_are_served_without_queries(client, hr_api_key, db_session, monkeypatch):
+    """Identical queue, dashboard and stats polls skip the database until a write."""
+    # This client's own writes would otherwise bypass the cache for a while
+    monkeypatch.setattr(settings, "read_your_writes_seconds", 0)
+    headers = {"X-HR-API-Key": hr_api_key}
+    reference = client.post("/requests", json={"title": "Cached", "submitted_by": "gina@company.ae"}).json()["reference"]
+    urls = ("/hr/requests?sort=priority", "/hr/dashboard?limit=5", "/hr/stats")
+    first = {url: client.get(url, headers=headers) for url in urls}
+
+    statements, stop = record_statements(db_session.get_bind())
+    try:
+        repeat = {url: client.get(url, headers=headers) for url in urls}
+    finally:
+        stop()
+    assert statements == []
+    for url in urls[:2]:
+        assert repeat[url].content == first[url].content
+        assert repeat[url].headers["content-type"] == "application/json"
+    assert repeat["/hr/stats"].json()["status_counts"] == first["/hr/stats"].json()["status_counts"]
+    assert result_cache.metrics()["hits"] >= 3
+
+    # Representations are cached separately
+    response = client.get(urls[0], headers={**headers, "Accept": "application/msgpack"})
+    assert response.headers["content-type"] == "application/msgpack"
+    assert response.headers["vary"] == "Accept"
+
+    client.patch(f"/requests/{reference}/status", json={"status": "approved"}, headers=headers)
+    assert client.get(urls[0], headers=headers).json()[0]["status"] == "approved"
+    assert client.get(urls[1], headers=headers).json()["status_counts"]["approved"] == 1
+    assert client.get(urls[2], headers=headers).json()["status_counts"]["approved"] == 1
+
+
+def test_recent_writers_bypass_the_cache(client, hr_api_key, db_session, monkeypatch):
+    """A client that just wrote (on any worker) never gets a cached page."""
+    monkeypatch.setattr(settings, "read_your_writes_seconds", 0)
+    headers = {"X-HR-API-Key": hr_api_key}
+    reference = client.post("/requests", json={"title": "Pinned", "submitted_by": "hana@company.ae"}).json()["reference"]
+    client.get("/hr/requests", headers=headers)
+
+    # Another worker's write whose event has not arrived yet
+    db_session.query(Request).filter(Request.reference == reference).update({Request.title: "Changed elsewhere"})
+    db_session.commit()
+    assert client.get("/hr/requests", headers=headers).json()[0]["title"] == "Pinned"
+
+    monkeypatch.setattr(settings, "read_your_writes_seconds", 5)
+    expires = int(time.time()) + 5
+    client.cookies.set(database.READ_YOUR_WRITES_COOKIE, f"{expires}.{database._sign_expiry(expires)}")
+    assert client.get("/hr/requests", headers=headers).json()[0]["title"] == "Changed elsewhere"
+
+
+def test_archival_invalidates_every_worker(client, hr_api_key, db_session, monkeypatch):
+    """Archived requests are announced as events, which bump every worker's version."""
+    from app.models.request import RequestEvent
+    from app.services.archive_service import archive_closed_requests
+
+    monkeypatch.setattr(settings, "request_archive_after_days", 30)
+    headers = {"X-HR-API-Key": hr_api_key}
+    for i in range(2):
+        reference = client.post("/requests", json={"title": f"Old {i}", "submitted_by": "ivan@company.ae"}).json()["reference"]
+        client.patch(f"/requests/{reference}/status", json={"status": "completed"}, headers=headers)
+    db_session.query(Request).update({Request.updated_at: datetime.utcnow() - timedelta(days=60)})
+    db_session.commit()
+
+    assert archive_closed_requests(db_engine=db_session.get_bind()) == 1
+    archived = db_session.query(RequestEvent).filter(RequestEvent.event_type == "request_archived").count()
+    assert archived == 1
+
+
+def test_other_workers_events_invalidate():
+    """Request events from the bus bump the version."""
+    version = result_cache.version
+    result_cache.on_event({"id": 1, "event": "request_created", "data": {}})
+    assert result_cache.version == version + 1
+
+
+def test_replica_reads_are_not_cached(db_session):
+    """Sessions on a replica may lag behind the version and bypass the cache."""
+    result_cache.start()
+    try:
+        assert result_cache.enabled_for(db_session)
+        db_session.info["replica"] = True
+        assert not result_cache.enabled_for(db_session)
+    finally:
+        db_session.info.pop("replica")
+        result_cache.stop()
@@ -0,0 +1,100 @@
+"""Tests for single-flight coalescing of concurrent reads."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    """Callers arriving while a computation runs get its result."""
+    flight = SingleFlight("test-shared")
+    started = threading.Event()
+    executions = []
+
+    def compute():
+        executions.append(1)
+        started.set()
+        time.sleep(0.2)
+        return {"answer": 42}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        leader = pool.submit(flight.do, "stats", compute)
+        started.wait(1)
+        followers = [pool.submit(flight.do, "stats", compute) for _ in range(7)]
+        results = [leader.result()] + [future.result() for future in followers]
+
+    assert len(executions) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.metrics() == {"calls": 8, "executions": 1, "coalesced": 7, "coalescing_ratio": 0.875}
+
+    # Completed work is not cached, and other keys never share
+    assert flight.do("stats", lambda: "fresh") == "fresh"
+    assert flight.do("queue", lambda: "other") == "other"
+
+
+def test_errors_are_shared_with_waiting_callers():
+    """A failed computation fails every caller that joined it."""
+    flight = SingleFlight("test-errors")
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("Request REF-2026-001 not found")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "tracking", fail)
+        started.wait(1)
+        follower = pool.submit(flight.do, "tracking", fail)
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+
+    assert flight.metrics()["executions"] == 1
+
+
+def test_reads_after_a_write_do_not_join_earlier_computations(db_session, monkeypatch):
+    """A new data version, or a client's recent write, starts a fresh computation."""
+    from app.core.singleflight import bind_key
+    from app.services import hr_service
+    from app.services.result_cache import result_cache
+
+    started, release = threading.Event(), threading.Event()
+    count_by_status = hr_service._count_by_status
+
+    def slow_count(db):
+        started.set()
+        release.wait(2)
+        return {"stale": True}
+
+    monkeypatch.setattr(hr_service, "_count_by_status", slow_count)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        before_write = pool.submit(hr_service.get_request_count_by_status, db_session)
+        started.wait(1)
+        result_cache.bump()
+        monkeypatch.setattr(hr_service, "_count_by_status", count_by_status)
+        assert "stale" not in hr_service.get_request_count_by_status(db_session)
+        release.set()
+        assert before_write.result() == {"stale": True}
+
+    # Sessions of clients that just wrote never share a key
+    assert bind_key(db_session) == str(db_session.get_bind().url)
+    db_session.info["read_your_writes"] = True
+    try:
+        assert bind_key(db_session) != str(db_session.get_bind().url)
+    finally:
+        db_session.info.pop("read_your_writes")
+
+
+def test_single_flight_metrics_stay_out_of_hr_stats(client, hr_api_key):
+    """Coalescing metrics are per-worker operational data, not HR stats."""
+    from app.core.singleflight import single_flight_metrics
+    response = client.get("/hr/stats", headers={"X-HR-API-Key": hr_api_key})
+    assert set(response.json()) == {"status_counts", "total"}
+    metrics = single_flight_metrics()
+    assert {"hr", "tracking"} <= set(metrics)
+    assert metrics["hr"]["calls"] >= 1